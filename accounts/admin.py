@@ -1,8 +1,56 @@
+from django import forms
 from django.contrib import admin
-from . models import CustomUser, RefereeProfile, PlayerProfile, TimekeeperProfile, Sport
+from django.shortcuts import render
+from django.urls import path, reverse
+
+from jobs.runner import save_upload
+from jobs.views import redirect_to_job
+from . models import CustomUser, RefereeProfile, PlayerProfile, TimekeeperProfile, Sport, PushSubscription
+from .jobs import import_players_file
+
+
+class PlayerImportForm(forms.Form):
+    file = forms.FileField(label="CSV- oder XLSX-Datei")
+
+
+@admin.register(CustomUser)
+class CustomUserAdmin(admin.ModelAdmin):
+    change_list_template = "admin/accounts/customuser/change_list.html"
+    search_fields = ("username", "first_name", "last_name", "email", "short_id")
+    list_display = ("username", "first_name", "last_name", "role", "club")
+    list_filter = ("role",)
+
+    def get_urls(self):
+        urls = [
+            path("import/", self.admin_site.admin_view(self.import_view), name="accounts_customuser_import"),
+        ]
+        return urls + super().get_urls()
+
+    def import_view(self, request):
+        """Nimmt die Datei entgegen; importiert wird als Hintergrund-Job (siehe accounts.jobs)."""
+        form = PlayerImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            upload = form.cleaned_data["file"]
+            entry = import_players_file.enqueue(
+                user=request.user, label=f"Spielerimport {upload.name}", file=save_upload(upload), filename=upload.name
+            )
+            return redirect_to_job(entry, reverse("admin:accounts_customuser_changelist"))
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Spieler importieren",
+            "form": form,
+        }
+        return render(request, "admin/accounts/customuser/import_players.html", context)
 
-admin.site.register(CustomUser)
 admin.site.register(RefereeProfile)
 admin.site.register(PlayerProfile)
 admin.site.register(TimekeeperProfile)
-admin.site.register(Sport)
\ No newline at end of file
+admin.site.register(Sport)
+
+
+@admin.register(PushSubscription)
+class PushSubscriptionAdmin(admin.ModelAdmin):
+    list_display = ("user", "user_agent", "created_at")
+    search_fields = ("user__username", "endpoint")
+    raw_id_fields = ("user",)
@@ -0,0 +1,141 @@
+# accounts/expiry.py
+"""
+Ablaufende Spielerpässe, Schiedsrichter- und Zeitnehmer-Lizenzen.
+
+Alle drei Profile haben expires_at; abgefragt wird immer als Bereich auf den
+Indizes (Verein bzw. Verband, expires_at). Listen werden als Tupel über
+.iterator(chunk_size=...) gestreamt - auch ein Verband mit 200k Profilen wird
+nie komplett in den Speicher geladen. Das Dashboard pro Verband (Anzahl pro
+Monat) ist eine Aggregat-Abfrage pro Profilart und liegt DASHBOARD_TTL Sekunden
+im Cache.
+
+Der Verband schließt seine Unterverbände ein (materialisierter Pfad, siehe
+federation.models.HierarchyModel); Spielerpässe hängen über den Verein am Verband.
+"""
+import csv
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from team.exports import Echo
+from .models import PlayerProfile, RefereeProfile, TimekeeperProfile
+
+CHUNK_SIZE = 2000
+DASHBOARD_MONTHS = 12
+DASHBOARD_TTL = 15 * 60
+DEFAULT_DAYS = 60
+
+
+class Kind:
+    def __init__(self, label, model, number_field, federation_lookup):
+        self.label = label
+        self.model = model
+        self.number_field = number_field
+        self.federation_lookup = federation_lookup
+
+
+KINDS = {
+    "player": Kind("Spielerpässe", PlayerProfile, "pass_number", "club__federation"),
+    "referee": Kind("Schiedsrichter-Lizenzen", RefereeProfile, "license_number", "federation"),
+    "timekeeper": Kind("Zeitnehmer-Lizenzen", TimekeeperProfile, "license_number", "federation"),
+}
+
+HEADER = ("Art", "Nummer", "Benutzername", "Vorname", "Nachname", "E-Mail", "Läuft ab")
+
+
+def profiles(kind, federation=None):
+    """Profile einer Art, optional auf einen Verband (inkl. Unterverbände) beschränkt."""
+    kind = KINDS[kind]
+    qs = kind.model.objects.all()
+    if federation is not None:
+        qs = qs.filter(federation.subtree_q(kind.federation_lookup))
+    return qs
+
+
+def expiring(kind, start, end, federation=None):
+    """Profile, die zwischen start und end (einschließlich) ablaufen."""
+    return profiles(kind, federation).filter(expires_at__gte=start, expires_at__lte=end)
+
+
+def iter_expiring(kinds, start, end, federation=None, chunk_size=CHUNK_SIZE):
+    """Exportzeilen (ohne Kopfzeile) für die Profilarten ``kinds``, nach Ablaufdatum sortiert."""
+    for name in kinds:
+        kind = KINDS[name]
+        rows = (
+            expiring(name, start, end, federation)
+            .order_by("expires_at", "id")
+            .values_list(kind.number_field, "user__username", "user__first_name", "user__last_name", "user__email", "expires_at")
+        )
+        for number, username, first, last, email, expires_at in rows.iterator(chunk_size=chunk_size):
+            yield (kind.label, number, username, first, last, email, expires_at.isoformat())
+
+
+def csv_lines(kinds, start, end, federation=None):
+    writer = csv.writer(Echo(), delimiter=";")
+    yield "﻿" + writer.writerow(HEADER)
+    for row in iter_expiring(kinds, start, end, federation):
+        yield writer.writerow(row)
+
+
+def window(days=DEFAULT_DAYS, today=None):
+    today = today or timezone.localdate()
+    return today, today + timedelta(days=days)
+
+
+# ------------------------------------------------------------------
+# dashboard
+# ------------------------------------------------------------------
+def _add_months(day, months):
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def monthly_counts(federation, months=DASHBOARD_MONTHS, today=None):
+    """
+    returns {"months": [date, ...], "rows": [{"kind", "label", "expired", "counts": [...], "total"}]}
+    - eine Aggregat-Abfrage pro Profilart
+    """
+    today = today or timezone.localdate()
+    first = today.replace(day=1)
+    month_list = [_add_months(first, i) for i in range(months)]
+    end = _add_months(first, months)
+
+    rows = []
+    for name, kind in KINDS.items():
+        qs = profiles(name, federation).filter(expires_at__lt=end)
+        per_month = {}
+        expired = 0
+        for row in (
+            qs.annotate(month=TruncMonth("expires_at"))
+            .values("month")
+            .annotate(n=Count("id"))
+            .order_by()
+        ):
+            month = row["month"]
+            if month < first:
+                expired += row["n"]
+            else:
+                per_month[month] = row["n"]
+        counts = [per_month.get(month, 0) for month in month_list]
+        rows.append({
+            "kind": name,
+            "label": kind.label,
+            "expired": expired,
+            "counts": counts,
+            "total": sum(counts),
+        })
+    return {"months": month_list, "rows": rows}
+
+
+def dashboard(federation, today=None):
+    """monthly_counts() aus dem Cache (pro Verband und Tag, DASHBOARD_TTL Sekunden)."""
+    today = today or timezone.localdate()
+    key = f"expiry:dashboard:{federation.pk}:{today.isoformat()}"
+    data = cache.get(key)
+    if data is None:
+        data = monthly_counts(federation, today=today)
+        cache.set(key, data, DASHBOARD_TTL)
+    return data
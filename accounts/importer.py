@@ -0,0 +1,268 @@
+# accounts/importer.py
+"""
+Massenimport von Spielern (CustomUser + PlayerProfile + Teamzugehörigkeit) aus CSV/XLSX.
+
+- Zeilen werden gestreamt (csv.DictReader bzw. openpyxl im read-only-Modus) und in
+  Chunks verarbeitet; pro Chunk ein Commit. Der Speicherbedarf hängt nur von der
+  Chunk-Größe ab, nicht von der Dateigröße.
+- Vereine und Teams werden einmal in Lookup-Maps geladen; Duplikate (Username,
+  Passnummer) werden pro Chunk mit je einer Abfrage geprüft.
+- Passwörter werden in einem Prozess-Pool gehasht (das ist der teure Teil).
+- Fehler werden pro Zeile gemeldet (report-Callback), fehlerhafte Zeilen übersprungen.
+
+Spalten: username, email, first_name, last_name, password, pass_number, issue_date,
+expires_at, club (Slug oder Name), teams (Slugs, mit ";" getrennt).
+"""
+import csv
+import io
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from club.models import Club
+from team.eligibility import PLAYER_ROLE, ineligibility_reason
+from team.models import Team
+from .models import CustomUser, PlayerProfile
+
+CHUNK_SIZE = 500
+REQUIRED = ("username", "pass_number")
+DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y")
+
+
+class ImportResult:
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.failed = 0
+
+    def __str__(self):
+        return f"{self.rows} Zeilen, {self.created} Spieler angelegt, {self.failed} fehlerhaft"
+
+
+# ------------------------------------------------------------------
+# streaming readers
+# ------------------------------------------------------------------
+def _normalize(header):
+    return str(header or "").strip().lower()
+
+
+def iter_csv(fileobj):
+    if isinstance(fileobj.read(0), bytes):
+        fileobj = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    sample = fileobj.readline()
+    dialect = csv.Sniffer().sniff(sample, delimiters=",;\t") if sample else csv.excel
+    header = [_normalize(h) for h in next(csv.reader([sample], dialect))] if sample else []
+    for row in csv.reader(fileobj, dialect):
+        yield dict(zip(header, row))
+
+
+def iter_xlsx(fileobj):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [_normalize(h) for h in next(rows, ())]
+        for row in rows:
+            yield dict(zip(header, row))
+    finally:
+        workbook.close()
+
+
+def iter_rows(fileobj, filename):
+    if filename.lower().endswith((".xlsx", ".xlsm")):
+        return iter_xlsx(fileobj)
+    return iter_csv(fileobj)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+# ------------------------------------------------------------------
+# validation
+# ------------------------------------------------------------------
+def _text(value):
+    return "" if value is None else str(value).strip()
+
+
+def _date(value):
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(str(value).strip(), fmt).date()
+        except ValueError:
+            pass
+    raise ValueError(f"Ungültiges Datum: {value}")
+
+
+class Lookups:
+    """Vereine (Slug und Name) und Teams (Slug) - einmal pro Import geladen."""
+
+    def __init__(self):
+        self.clubs = {}
+        for pk, slug, name in Club.objects.values_list("id", "slug", "name"):
+            self.clubs[slug.lower()] = pk
+            self.clubs.setdefault(name.strip().lower(), pk)
+        self.teams = {slug.lower(): pk for pk, slug in Team.objects.values_list("id", "slug")}
+
+
+def validate_chunk(chunk, lookups, report):
+    """
+    chunk: [(row_no, row_dict)]
+    returns [(row_no, cleaned)] für gültige Zeilen; Fehler gehen an report(row_no, message)
+    """
+    usernames = {_text(row.get("username")) for _, row in chunk}
+    passes = {_text(row.get("pass_number")) for _, row in chunk}
+    taken_users = set(CustomUser.objects.filter(username__in=usernames).values_list("username", flat=True))
+    taken_passes = set(PlayerProfile.objects.filter(pass_number__in=passes).values_list("pass_number", flat=True))
+
+    valid, seen_users, seen_passes = [], set(), set()
+    today = timezone.localdate()
+    for row_no, row in chunk:
+        data = {key: _text(row.get(key)) for key in ("username", "email", "first_name", "last_name", "password", "pass_number", "club")}
+        errors = [f"{key} fehlt" for key in REQUIRED if not data[key]]
+        if data["username"] in taken_users or data["username"] in seen_users:
+            errors.append(f"Username {data['username']} existiert bereits")
+        if data["pass_number"] in taken_passes or data["pass_number"] in seen_passes:
+            errors.append(f"Passnummer {data['pass_number']} existiert bereits")
+
+        for key in ("issue_date", "expires_at"):
+            try:
+                data[key] = _date(row.get(key))
+            except ValueError as exc:
+                errors.append(str(exc))
+
+        data["club_id"] = None
+        if data["club"]:
+            data["club_id"] = lookups.clubs.get(data["club"].lower())
+            if data["club_id"] is None:
+                errors.append(f"Unbekannter Verein: {data['club']}")
+
+        data["team_ids"] = []
+        for slug in filter(None, (s.strip().lower() for s in _text(row.get("teams") or row.get("team")).split(";"))):
+            if slug in lookups.teams:
+                data["team_ids"].append(lookups.teams[slug])
+            else:
+                errors.append(f"Unbekanntes Team: {slug}")
+
+        if data["team_ids"] and not errors:
+            # same rule as TeamForm/admin: no team membership with an expired pass
+            reason = ineligibility_reason(data["username"], PLAYER_ROLE, data["pass_number"], data["expires_at"], today)
+            if reason:
+                errors.append(reason)
+
+        if errors:
+            report(row_no, "; ".join(errors))
+            continue
+        seen_users.add(data["username"])
+        seen_passes.add(data["pass_number"])
+        valid.append((row_no, data))
+    return valid
+
+
+# ------------------------------------------------------------------
+# persistence
+# ------------------------------------------------------------------
+def _init_worker():
+    django.setup()
+
+
+def _hash_passwords(passwords, pool):
+    # unusable passwords are cheap, only real ones go to the pool
+    hashed = [None if pw else make_password(None) for pw in passwords]
+    todo = [(i, pw) for i, pw in enumerate(passwords) if pw]
+    if todo:
+        plain = [pw for _, pw in todo]
+        results = pool.map(make_password, plain, chunksize=max(1, len(plain) // 32)) if pool else map(make_password, plain)
+        for (i, _), value in zip(todo, results):
+            hashed[i] = value
+    return hashed
+
+
+def save_chunk(valid, pool):
+    """Legt User, Profile und Teamzugehörigkeit eines Chunks an (ein Commit)."""
+    hashed = _hash_passwords([data["password"] for _, data in valid], pool)
+    users = [
+        CustomUser(
+            username=data["username"],
+            email=data["email"],
+            first_name=data["first_name"],
+            last_name=data["last_name"],
+            password=password,
+            role=PLAYER_ROLE,
+            club_id=data["club_id"],
+            # bulk_create skips CustomUser.save(), which normally sets short_id
+            short_id=uuid.uuid4().hex[:10],
+        )
+        for (_, data), password in zip(valid, hashed)
+    ]
+    with transaction.atomic():
+        users = CustomUser.objects.bulk_create(users)
+        PlayerProfile.objects.bulk_create([
+            PlayerProfile(
+                user=user,
+                pass_number=data["pass_number"],
+                issue_date=data["issue_date"],
+                expires_at=data["expires_at"],
+                club_id=data["club_id"],
+            )
+            for user, (_, data) in zip(users, valid)
+        ])
+        Team.players.through.objects.bulk_create(
+            [
+                Team.players.through(team_id=team_id, customuser_id=user.pk)
+                for user, (_, data) in zip(users, valid)
+                for team_id in data["team_ids"]
+            ],
+            ignore_conflicts=True,
+        )
+    return len(users)
+
+
+def import_players(fileobj, filename, report, chunk_size=CHUNK_SIZE, workers=None):
+    """
+    Importiert alle Zeilen; report(row_no, message) wird für jede fehlerhafte Zeile
+    aufgerufen (row_no zählt ab 2, Zeile 1 ist die Kopfzeile).
+    workers: Prozesse für das Passwort-Hashing (0 = im aktuellen Prozess)
+    returns ImportResult
+    """
+    result = ImportResult()
+    lookups = Lookups()
+
+    def count_failure(row_no, message):
+        result.failed += 1
+        report(row_no, message)
+
+    workers = os.cpu_count() if workers is None else workers
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) if workers else None
+    try:
+        for chunk in chunked(enumerate(iter_rows(fileobj, filename), start=2), chunk_size):
+            result.rows += len(chunk)
+            valid = validate_chunk(chunk, lookups, count_failure)
+            if not valid:
+                continue
+            try:
+                result.created += save_chunk(valid, pool)
+            except IntegrityError as exc:
+                # e.g. a concurrent import took a username in the meantime
+                for row_no, _ in valid:
+                    count_failure(row_no, f"Nicht gespeichert: {exc}")
+    finally:
+        if pool:
+            pool.shutdown()
+    return result
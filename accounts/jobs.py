@@ -0,0 +1,30 @@
+# accounts/jobs.py
+"""Hintergrund-Jobs des Accounts-Bereichs (siehe jobs.runner)."""
+from jobs.runner import file_storage, job
+from .importer import import_players
+
+# errors kept in the job result and shown on the job page
+IMPORT_ERRORS_SHOWN = 200
+
+
+@job("accounts.import_players")
+def import_players_file(file, filename):
+    """
+    Spielerimport aus einer hochgeladenen Job-Datei (jobs.runner.save_upload).
+    Die Passwörter werden im Job selbst gehasht, ohne Prozess-Pool: der Job kann in
+    einem Thread des Web-Prozesses laufen (LocalBackend), dort wird nicht geforkt.
+    returns {"summary", "failed", "errors": [[zeile, fehler], ...]}
+    """
+    storage = file_storage()
+    errors = []
+
+    def report(row_no, message):
+        if len(errors) < IMPORT_ERRORS_SHOWN:
+            errors.append([row_no, message])
+
+    try:
+        with storage.open(file, "rb") as fileobj:
+            result = import_players(fileobj, filename, report, workers=0)
+    finally:
+        storage.delete(file)
+    return {"summary": str(result), "failed": result.failed, "errors": errors}
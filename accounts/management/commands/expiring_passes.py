@@ -0,0 +1,39 @@
+import csv
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import expiry
+from federation.models import Federation
+
+
+class Command(BaseCommand):
+    help = "Listet Spielerpässe und Lizenzen, die in den nächsten Tagen ablaufen, als CSV (gestreamt)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=expiry.DEFAULT_DAYS, help="Zeitfenster ab heute in Tagen")
+        parser.add_argument("--kind", choices=[*expiry.KINDS, "all"], default="all")
+        parser.add_argument("--federation", help="Slug: nur dieser Verband (inkl. Unterverbände)")
+        parser.add_argument("--output", help="CSV in diese Datei schreiben (Standard: stdout)")
+
+    def handle(self, *args, **options):
+        federation = None
+        if options["federation"]:
+            federation = Federation.objects.filter(slug=options["federation"]).first()
+            if federation is None:
+                raise CommandError(f"Verband {options['federation']} nicht gefunden.")
+        kinds = list(expiry.KINDS) if options["kind"] == "all" else [options["kind"]]
+        start, end = expiry.window(options["days"])
+
+        out = open(options["output"], "w", newline="", encoding="utf-8") if options["output"] else sys.stdout
+        writer = csv.writer(out, delimiter=";")
+        writer.writerow(expiry.HEADER)
+        count = 0
+        try:
+            for row in expiry.iter_expiring(kinds, start, end, federation):
+                writer.writerow(row)
+                count += 1
+        finally:
+            if options["output"]:
+                out.close()
+        self.stderr.write(self.style.SUCCESS(f"{count} Pässe/Lizenzen laufen zwischen {start:%d.%m.%Y} und {end:%d.%m.%Y} ab."))
@@ -0,0 +1,39 @@
+import csv
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.importer import CHUNK_SIZE, import_players
+
+
+class Command(BaseCommand):
+    help = "Importiert Spieler mit Spielerpass (und Teamzugehörigkeit) aus einer CSV- oder XLSX-Datei."
+
+    def add_arguments(self, parser):
+        parser.add_argument("file")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument("--workers", type=int, default=None, help="Prozesse für das Passwort-Hashing (0 = keine)")
+        parser.add_argument("--report", help="Fehlerbericht als CSV in diese Datei schreiben (Standard: stderr)")
+
+    def handle(self, *args, **options):
+        try:
+            fileobj = open(options["file"], "rb")
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        report_file = open(options["report"], "w", newline="", encoding="utf-8") if options["report"] else sys.stderr
+        writer = csv.writer(report_file)
+        writer.writerow(["zeile", "fehler"])
+        try:
+            with fileobj:
+                result = import_players(
+                    fileobj,
+                    options["file"],
+                    lambda row_no, message: writer.writerow([row_no, message]),
+                    chunk_size=options["chunk_size"],
+                    workers=options["workers"],
+                )
+        finally:
+            if options["report"]:
+                report_file.close()
+        self.stdout.write(self.style.SUCCESS(str(result)))
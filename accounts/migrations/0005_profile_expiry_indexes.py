@@ -0,0 +1,39 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_sport_slug'),
+        ('club', '0002_club_sport'),
+        ('federation', '0004_federation_depth_federation_path_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='playerprofile',
+            index=models.Index(fields=['expires_at'], name='player_expires_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playerprofile',
+            index=models.Index(fields=['club', 'expires_at'], name='player_club_expires_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='refereeprofile',
+            index=models.Index(fields=['expires_at'], name='referee_expires_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='refereeprofile',
+            index=models.Index(fields=['federation', 'expires_at'], name='referee_fed_expires_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timekeeperprofile',
+            index=models.Index(fields=['expires_at'], name='timekeeper_expires_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timekeeperprofile',
+            index=models.Index(fields=['federation', 'expires_at'], name='timekeeper_fed_expires_idx'),
+        ),
+    ]
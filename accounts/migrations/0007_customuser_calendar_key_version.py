@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 15:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_pushsubscription'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='calendar_key_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -20,6 +20,8 @@ class CustomUser(AbstractUser):
     # optional association to club/ federation
     club = models.ForeignKey("club.Club", null=True, blank=True, on_delete=models.SET_NULL)
     federation = models.ForeignKey("federation.Federation", null=True, blank=True, on_delete=models.SET_NULL)
+    # part of every calendar feed link (team.calendar); raising it revokes all links of the user
+    calendar_key_version = models.PositiveIntegerField(default=0)
 
     def save(self, *args, **kwargs):
         if not self.short_id:
@@ -40,6 +42,13 @@ class PlayerProfile(models.Model):
 
     club = models.ForeignKey("club.Club", on_delete=models.SET_NULL, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # expiry scans: whole range and per club (see accounts.expiry)
+            models.Index(fields=["expires_at"], name="player_expires_idx"),
+            models.Index(fields=["club", "expires_at"], name="player_club_expires_idx"),
+        ]
+
     def __str__(self):
         return f"Player Pass {self.pass_number} ({self.user.username})"
 
@@ -57,6 +66,13 @@ class RefereeProfile(models.Model):
 
     federation = models.ForeignKey("federation.Federation", on_delete=models.SET_NULL, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # expiry scans: whole range and per federation (see accounts.expiry)
+            models.Index(fields=["expires_at"], name="referee_expires_idx"),
+            models.Index(fields=["federation", "expires_at"], name="referee_fed_expires_idx"),
+        ]
+
     def __str__(self):
         return f"Referee {self.license_number} ({self.user.username})"
 
@@ -74,6 +90,13 @@ class TimekeeperProfile(models.Model):
 
     federation = models.ForeignKey("federation.Federation", on_delete=models.SET_NULL, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # expiry scans: whole range and per federation (see accounts.expiry)
+            models.Index(fields=["expires_at"], name="timekeeper_expires_idx"),
+            models.Index(fields=["federation", "expires_at"], name="timekeeper_fed_expires_idx"),
+        ]
+
     def __str__(self):
         return f"ZS/ZN {self.license_number} ({self.user.username})"
 
@@ -88,3 +111,22 @@ class Sport(models.Model):
 
     def __str__(self):
         return self.name
+
+
+# -----------------------------
+# WEB PUSH SUBSCRIPTIONS (one per browser/device)
+# -----------------------------
+class PushSubscription(models.Model):
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="push_subscriptions")
+    endpoint = models.URLField(max_length=500, unique=True)
+    p256dh = models.CharField(max_length=200)
+    auth = models.CharField(max_length=100)
+    user_agent = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Push {self.user.username} ({self.endpoint[:40]}…)"
+
+    def as_info(self):
+        """subscription_info im Format von pywebpush"""
+        return {"endpoint": self.endpoint, "keys": {"p256dh": self.p256dh, "auth": self.auth}}
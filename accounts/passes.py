@@ -0,0 +1,166 @@
+# accounts/passes.py
+"""
+Passkontrolle beim Einlass/Spielbericht: short_id oder Passnummer -> Spielberechtigung.
+
+Pro Spieler liegt ein Datensatz (Rolle, Pass, Ablauf, Verein, Teams) im Cache
+(read-through, CACHE_TTL Sekunden, Cache "shared" - die Invalidierung muss alle
+Worker erreichen); ein Code-Index verweist von short_id und
+Passnummer auf den Spieler. Viele Codes werden mit get_many/set_many und - für
+die Fehltreffer - einer einzigen Abfrage plus einer Abfrage für die Teams
+aufgelöst. Signale verwerfen die Einträge beim Speichern von User und
+PlayerProfile und bei Kaderänderungen (siehe signals.py).
+"""
+from django.core.cache import caches
+from django.db.models import Q
+from django.utils import timezone
+
+from team.eligibility import ineligibility_reason
+from team.models import Team
+from .models import CustomUser
+
+CACHE_ALIAS = "shared"
+CACHE_TTL = 5 * 60
+MAX_BATCH = 100
+VERIFIER_ROLES = ("timekeeper", "referee", "coach", "club_admin", "federation_admin", "global_admin")
+
+FIELDS = (
+    "id",
+    "username",
+    "first_name",
+    "last_name",
+    "short_id",
+    "role",
+    "player_profile__pass_number",
+    "player_profile__expires_at",
+    "player_profile__club__name",
+)
+
+
+def can_verify(user):
+    return user.is_authenticated and (user.is_staff or user.role in VERIFIER_ROLES)
+
+
+def pass_cache():
+    return caches[CACHE_ALIAS]
+
+
+def user_key(user_id):
+    return f"passes:user:{user_id}"
+
+
+def code_key(code):
+    return f"passes:code:{code}"
+
+
+# ------------------------------------------------------------------
+# read-through cache
+# ------------------------------------------------------------------
+def _fetch(condition):
+    """returns {user_id: record} - eine Abfrage für die Spieler, eine für ihre Teams"""
+    records = {}
+    for row in CustomUser.objects.filter(condition).values_list(*FIELDS):
+        record = dict(zip(("id", "username", "first_name", "last_name", "short_id", "role",
+                           "pass_number", "expires_at", "club"), row))
+        record["team_ids"] = []
+        records[record["id"]] = record
+    if records:
+        for team_id, user_id in Team.players.through.objects.filter(customuser_id__in=records).values_list(
+            "team_id", "customuser_id"
+        ):
+            records[user_id]["team_ids"].append(team_id)
+    return records
+
+
+def _store(records):
+    entries = {}
+    for record in records.values():
+        entries[user_key(record["id"])] = record
+        for code in (record["short_id"], record["pass_number"]):
+            if code:
+                entries[code_key(code)] = record["id"]
+    pass_cache().set_many(entries, CACHE_TTL)
+
+
+def records_for_users(user_ids):
+    """returns {user_id: record}"""
+    user_ids = list(dict.fromkeys(user_ids))
+    cached = pass_cache().get_many([user_key(pk) for pk in user_ids])
+    records = {pk: cached[user_key(pk)] for pk in user_ids if user_key(pk) in cached}
+    missing = [pk for pk in user_ids if pk not in records]
+    if missing:
+        fetched = _fetch(Q(pk__in=missing))
+        _store(fetched)
+        records.update(fetched)
+    return records
+
+
+def records_for_codes(codes):
+    """returns {code: record or None} für short_ids und Passnummern"""
+    codes = list(dict.fromkeys(code.strip() for code in codes if code and code.strip()))
+    index = pass_cache().get_many([code_key(code) for code in codes])
+    user_ids = {code: index[code_key(code)] for code in codes if code_key(code) in index}
+    records = records_for_users(user_ids.values()) if user_ids else {}
+
+    result = {code: records.get(user_ids.get(code)) for code in codes}
+    unresolved = [code for code, record in result.items() if record is None]
+    if unresolved:
+        fetched = _fetch(Q(short_id__in=unresolved) | Q(player_profile__pass_number__in=unresolved))
+        _store(fetched)
+        by_code = {}
+        for record in fetched.values():
+            for code in (record["short_id"], record["pass_number"]):
+                if code:
+                    by_code[code] = record
+        for code in unresolved:
+            result[code] = by_code.get(code)
+    return result
+
+
+def invalidate(user_ids=(), codes=()):
+    pass_cache().delete_many([user_key(pk) for pk in user_ids] + [code_key(code) for code in codes if code])
+
+
+# ------------------------------------------------------------------
+# verification
+# ------------------------------------------------------------------
+def verify(code, record, sides=None, on=None):
+    """
+    record: aus records_for_codes/records_for_users (oder None)
+    sides: {team_id: "home"/"away"} des Spiels - dann muss der Spieler im Kader stehen
+    returns dict für die API
+    """
+    if record is None:
+        return {"code": code, "found": False, "eligible": False, "reasons": ["Unbekannter Pass."]}
+    on = on or timezone.localdate()
+    reasons = []
+    reason = ineligibility_reason(record["username"], record["role"], record["pass_number"], record["expires_at"], on)
+    if reason:
+        reasons.append(reason)
+
+    side = None
+    if sides:
+        side = next((sides[team_id] for team_id in record["team_ids"] if team_id in sides), None)
+        if side is None:
+            reasons.append(f"{record['username']} steht in keinem Kader dieses Spiels.")
+
+    return {
+        "code": code,
+        "found": True,
+        "eligible": not reasons,
+        "reasons": reasons,
+        "user": {
+            "id": record["id"],
+            "username": record["username"],
+            "name": f"{record['first_name']} {record['last_name']}".strip(),
+            "short_id": record["short_id"],
+        },
+        "role": record["role"],
+        "pass_number": record["pass_number"],
+        "expires_at": record["expires_at"],
+        "club": record["club"],
+        "side": side,
+    }
+
+
+def fixture_sides(fixture):
+    return {fixture.home_id: "home", fixture.away_id: "away"} if fixture else None
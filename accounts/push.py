@@ -0,0 +1,131 @@
+# accounts/push.py
+"""
+Web-Push-Versand (VAPID) an PushSubscription.
+
+Nachrichten werden über einen begrenzten Thread-Pool (PUSH_WORKERS) an den
+Transport aus settings.PUSH_TRANSPORT übergeben. Vorübergehende Fehler (Netzwerk,
+429, 5xx) werden bis zu RETRIES-mal mit wachsender Wartezeit wiederholt;
+Abos, die der Push-Dienst als erloschen meldet (404/410), werden gelöscht.
+
+RecordingTransport zeichnet die Sendungen nur auf (Tests, Entwicklung ohne VAPID-Schlüssel).
+"""
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .models import PushSubscription
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRANSPORT = "accounts.push.WebPushTransport"
+RETRIES = 2
+RETRY_DELAY = 0.5
+TTL = 12 * 60 * 60
+
+
+class PushGone(Exception):
+    """Das Abo existiert beim Push-Dienst nicht mehr."""
+
+
+class PushFailed(Exception):
+    """Vorübergehender Fehler - erneut versuchen."""
+
+
+class WebPushTransport:
+    def __init__(self):
+        from pywebpush import webpush, WebPushException
+
+        self.webpush = webpush
+        self.error = WebPushException
+        self.private_key = settings.VAPID_PRIVATE_KEY
+        self.claims = {"sub": f"mailto:{settings.VAPID_CLAIMS_EMAIL}"}
+
+    def send(self, info, data):
+        try:
+            self.webpush(
+                subscription_info=info,
+                data=data,
+                vapid_private_key=self.private_key,
+                vapid_claims=dict(self.claims),
+                ttl=TTL,
+                timeout=10,
+            )
+        except self.error as exc:
+            status = getattr(exc.response, "status_code", None)
+            if status in (404, 410):
+                raise PushGone(info["endpoint"]) from exc
+            if status is not None and status < 500 and status != 429:
+                # permanent rejection (e.g. payload too large) - retrying won't help
+                logger.warning("Web-Push abgelehnt (%s): %s", status, exc)
+                return False
+            raise PushFailed(str(exc)) from exc
+        except OSError as exc:
+            raise PushFailed(str(exc)) from exc
+        return True
+
+
+class RecordingTransport:
+    """
+    Stand-in ohne Netzwerk: sent = [(endpoint, payload dict)].
+    gone: Endpoints, die als erloschen gelten; flaky: {endpoint: n} schlägt n-mal fehl.
+    """
+    sent = []
+    gone = set()
+    flaky = {}
+
+    def send(self, info, data):
+        endpoint = info["endpoint"]
+        if endpoint in self.gone:
+            raise PushGone(endpoint)
+        if self.flaky.get(endpoint):
+            self.flaky[endpoint] -= 1
+            raise PushFailed(endpoint)
+        self.sent.append((endpoint, json.loads(data)))
+        return True
+
+    @classmethod
+    def reset(cls):
+        cls.sent, cls.gone, cls.flaky = [], set(), {}
+
+
+def get_transport():
+    return import_string(getattr(settings, "PUSH_TRANSPORT", DEFAULT_TRANSPORT))()
+
+
+def _deliver(transport, info, data, retry_delay):
+    """returns "sent", "rejected", "gone" oder "failed" """
+    for attempt in range(RETRIES + 1):
+        try:
+            return "sent" if transport.send(info, data) else "rejected"
+        except PushGone:
+            return "gone"
+        except PushFailed as exc:
+            if attempt == RETRIES:
+                logger.warning("Web-Push an %s fehlgeschlagen: %s", info["endpoint"], exc)
+                return "failed"
+            time.sleep(retry_delay * 2 ** attempt)
+
+
+def send_all(messages, transport=None, workers=None, retry_delay=RETRY_DELAY):
+    """
+    messages: [(subscription_id, subscription_info, data)] - data ist der fertige JSON-String
+    returns {"sent", "rejected", "failed", "pruned"}; erloschene Abos werden gelöscht (eine Abfrage)
+    """
+    transport = transport or get_transport()
+    workers = workers or getattr(settings, "PUSH_WORKERS", 8)
+    counts = {"sent": 0, "rejected": 0, "failed": 0, "pruned": 0}
+    gone = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="push") as pool:
+        outcomes = pool.map(lambda m: _deliver(transport, m[1], m[2], retry_delay), messages)
+        for (subscription_id, _, _), outcome in zip(messages, outcomes):
+            if outcome == "gone":
+                gone.append(subscription_id)
+            else:
+                counts[outcome] += 1
+    if gone:
+        counts["pruned"], _ = PushSubscription.objects.filter(pk__in=gone).delete()
+    return counts
@@ -0,0 +1,54 @@
+# accounts/signals.py
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from team.models import Team
+from . import passes
+from .models import CustomUser, PlayerProfile
+
+
+# ------------------------------------------------------------------
+# Passkontrolle: Cache-Einträge verwerfen
+# ------------------------------------------------------------------
+def _invalidate_on_commit(user_ids, codes=()):
+    # after the commit: dropped earlier, a concurrent check could re-cache the old pass
+    user_ids, codes = list(user_ids), list(codes)
+    transaction.on_commit(lambda: passes.invalidate(user_ids, codes))
+
+
+@receiver(post_init, sender=CustomUser)
+@receiver(post_init, sender=PlayerProfile)
+def remember_pass_codes(sender, instance, **kwargs):
+    # old codes, so their index entries can be dropped after a change
+    field = "short_id" if sender is CustomUser else "pass_number"
+    instance._pass_code = None if field in instance.get_deferred_fields() else getattr(instance, field)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_user_pass(sender, instance, **kwargs):
+    _invalidate_on_commit([instance.pk], [instance._pass_code, instance.short_id])
+    instance._pass_code = instance.short_id
+
+
+@receiver(post_save, sender=PlayerProfile)
+@receiver(post_delete, sender=PlayerProfile)
+def invalidate_player_pass(sender, instance, **kwargs):
+    _invalidate_on_commit([instance.user_id], [instance._pass_code, instance.pass_number])
+    instance._pass_code = instance.pass_number
+
+
+@receiver(m2m_changed, sender=Team.players.through)
+def invalidate_roster_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        # pk_set is None for clear(): remember who is affected before the rows are gone
+        if reverse:
+            instance._pass_user_ids = [instance.pk]
+        else:
+            instance._pass_user_ids = list(instance.players.values_list("id", flat=True))
+    elif action == "post_clear":
+        _invalidate_on_commit(getattr(instance, "_pass_user_ids", ()))
+    elif action in ("post_add", "post_remove"):
+        # reverse: user.teams.add(team) -> instance is the user
+        _invalidate_on_commit([instance.pk] if reverse else pk_set)
@@ -1,3 +1,118 @@
-from django.test import TestCase
+import os
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from club.models import Club
+from federation.models import Federation
+from jobs.models import Job
+from . import expiry
+from .models import CustomUser, PlayerProfile, RefereeProfile, TimekeeperProfile
+
+
+@override_settings(JOBS_BACKEND="jobs.backends.SyncBackend")
+class PlayerImportAdminTests(TestCase):
+    def test_import_runs_as_job_without_process_pool(self):
+        admin = CustomUser.objects.create_superuser(username="admin", password="pw")
+        self.client.force_login(admin)
+        upload = SimpleUploadedFile(
+            "spieler.csv",
+            "username;pass_number;first_name\nanna;P-1;Anna\nanna;P-2;Doppelt\n".encode(),
+        )
+        with tempfile.TemporaryDirectory() as root, override_settings(JOBS_FILES_ROOT=root), \
+                mock.patch("accounts.importer.ProcessPoolExecutor") as pool:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    reverse("admin:accounts_customuser_import"), {"file": upload}, HTTP_HOST="localhost"
+                )
+            uploads_left = [name for _, _, names in os.walk(root) for name in names]
+
+        entry = Job.objects.get()
+        self.assertRedirects(response, reverse("job_detail", args=[entry.pk]) + "?next=%2Fadmin%2Faccounts%2Fcustomuser%2F",
+                             fetch_redirect_response=False)
+        pool.assert_not_called()
+        self.assertEqual(uploads_left, [])
+        self.assertEqual(entry.status, Job.DONE)
+        self.assertEqual(entry.result["failed"], 1)
+        self.assertEqual(entry.result["errors"], [[3, "Username anna existiert bereits"]])
+        self.assertEqual(PlayerProfile.objects.get().user.first_name, "Anna")
+
+        response = self.client.get(reverse("job_detail", args=[entry.pk]), HTTP_HOST="localhost")
+        self.assertContains(response, "2 Zeilen, 1 Spieler angelegt, 1 fehlerhaft")
+        self.assertContains(response, "Username anna existiert bereits")
+
+
+class ExpiryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.root = Federation.objects.create(name="DHB", slug="dhb")
+        cls.west = Federation.objects.create(name="West", slug="west", parent=cls.root)
+        cls.nord = Federation.objects.create(name="Nord", slug="nord")
+        cls.club = Club.objects.create(name="TV West", slug="tv-west", federation=cls.west)
+        cls.other_club = Club.objects.create(name="TV Nord", slug="tv-nord", federation=cls.nord)
+
+    def player(self, number, expires_at, club=None):
+        user = CustomUser.objects.create(username=number.lower(), short_id=number.lower())
+        return PlayerProfile.objects.create(
+            user=user, pass_number=number, expires_at=expires_at, club=club or self.club
+        )
+
+    def test_monthly_counts_buckets(self):
+        today = date(2026, 3, 15)
+        self.player("P-1", date(2026, 2, 28))   # last month: expired
+        self.player("P-2", date(2025, 11, 1))   # expired
+        self.player("P-3", date(2026, 3, 1))    # before today, but still the current month
+        self.player("P-4", date(2026, 3, 31))
+        self.player("P-5", date(2027, 2, 28))   # last month of the window
+        self.player("P-6", date(2027, 3, 1))    # outside the window
+        self.player("P-7", None)
+        self.player("P-8", date(2026, 4, 10), club=self.other_club)
+        referee = CustomUser.objects.create(username="sr", short_id="sr")
+        RefereeProfile.objects.create(user=referee, license_number="SR-1", license_level="Basis",
+                                      expires_at=date(2026, 4, 30), federation=self.west)
+
+        data = expiry.monthly_counts(self.root, today=today)
+        self.assertEqual(data["months"][0], date(2026, 3, 1))
+        self.assertEqual(data["months"][-1], date(2027, 2, 1))
+        rows = {row["kind"]: row for row in data["rows"]}
+        self.assertEqual(rows["player"]["expired"], 2)
+        self.assertEqual(rows["player"]["counts"], [2] + [0] * 10 + [1])
+        self.assertEqual(rows["player"]["total"], 3)
+        self.assertEqual(rows["referee"]["counts"][1], 1)
+        self.assertEqual((rows["timekeeper"]["expired"], rows["timekeeper"]["total"]), (0, 0))
+
+        nord = {row["kind"]: row for row in expiry.monthly_counts(self.nord, today=today)["rows"]}
+        self.assertEqual((nord["player"]["total"], nord["referee"]["total"]), (1, 0))
+
+    def test_expiring_passes_command(self):
+        today = timezone.localdate()
+        self.player("P-1", today)
+        self.player("P-2", today + timedelta(days=10))
+        self.player("P-3", today + timedelta(days=11))
+        self.player("P-4", today - timedelta(days=1))
+        self.player("P-5", today + timedelta(days=5), club=self.other_club)
+        keeper = CustomUser.objects.create(username="zn", short_id="zn")
+        TimekeeperProfile.objects.create(user=keeper, license_number="ZN-1", qualification="ZN",
+                                         expires_at=today + timedelta(days=3), federation=self.west)
+
+        def run(*args):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "ablauf.csv")
+                call_command("expiring_passes", "--days", "10", "--output", path, *args, stderr=StringIO())
+                with open(path, encoding="utf-8") as fh:
+                    lines = fh.read().splitlines()
+            self.assertEqual(lines[0], ";".join(expiry.HEADER))
+            return [line.split(";")[1] for line in lines[1:]]
+
+        self.assertEqual(run(), ["P-1", "P-5", "P-2", "ZN-1"])
+        self.assertEqual(run("--federation", "dhb"), ["P-1", "P-2", "ZN-1"])
+        self.assertEqual(run("--federation", "west", "--kind", "timekeeper"), ["ZN-1"])
+        with self.assertRaises(CommandError):
+            run("--federation", "unbekannt")
@@ -2,7 +2,12 @@ from django.shortcuts import render, redirect
 from django.contrib.auth import login, logout
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.conf import settings
+from django.http import HttpResponseBadRequest, JsonResponse
+from django.views.decorators.http import require_http_methods, require_POST
+import json
 from .forms import RegisterForm, LoginForm
+from .models import PushSubscription
 from django.contrib.auth import authenticate
 
 
@@ -46,3 +51,41 @@ def logout_view(request):
     logout(request)
     messages.info(request, "You have been logged out.")
     return redirect("login")
+
+
+# ------------------------------------------------------------------
+# Web Push: browser subscriptions (service worker -> fetch)
+# ------------------------------------------------------------------
+@login_required
+@require_http_methods(["GET", "POST"])
+def push_subscribe(request):
+    """GET: öffentlicher VAPID-Schlüssel; POST: PushSubscription.toJSON() des Browsers speichern."""
+    if request.method == "GET":
+        return JsonResponse({"public_key": settings.VAPID_PUBLIC_KEY})
+    try:
+        data = json.loads(request.body)
+        endpoint, keys = data["endpoint"], data["keys"]
+        p256dh, auth = keys["p256dh"], keys["auth"]
+    except (ValueError, KeyError, TypeError):
+        return HttpResponseBadRequest("Ungültiges Abo.")
+    PushSubscription.objects.update_or_create(
+        endpoint=endpoint,
+        defaults={
+            "user": request.user,
+            "p256dh": p256dh,
+            "auth": auth,
+            "user_agent": request.META.get("HTTP_USER_AGENT", "")[:255],
+        },
+    )
+    return JsonResponse({"ok": True})
+
+
+@login_required
+@require_POST
+def push_unsubscribe(request):
+    try:
+        endpoint = json.loads(request.body)["endpoint"]
+    except (ValueError, KeyError, TypeError):
+        return HttpResponseBadRequest("Ungültiges Abo.")
+    PushSubscription.objects.filter(user=request.user, endpoint=endpoint).delete()
+    return JsonResponse({"ok": True})
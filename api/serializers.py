@@ -0,0 +1,82 @@
+# api/serializers.py
+from rest_framework import serializers
+
+from accounts.models import CustomUser
+from club.models import Club
+from match.models import Fixture
+from team.models import Team, TrainingEvent, Lineup
+
+
+class SparseFieldsMixin:
+    """
+    ``?fields=id,name`` liefert nur diese Felder (sparse fieldsets).
+    Unbekannte Namen werden ignoriert.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        requested = request.query_params.get("fields") if request is not None else None
+        if requested:
+            wanted = {name.strip() for name in requested.split(",") if name.strip()}
+            for name in set(self.fields) - wanted:
+                self.fields.pop(name)
+
+
+class ClubRefSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Club
+        fields = ["id", "name", "slug"]
+
+
+class TeamRefSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Team
+        fields = ["id", "name", "slug"]
+
+
+class PlayerRefSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CustomUser
+        fields = ["id", "username", "first_name", "last_name"]
+
+
+class TeamSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    club = ClubRefSerializer(read_only=True)
+    sport = serializers.CharField(source="sport.name", read_only=True, default=None)
+    age_group = serializers.CharField(source="age_group.name", read_only=True, default=None)
+
+    class Meta:
+        model = Team
+        fields = ["id", "name", "slug", "club", "sport", "age_group", "updated_at"]
+
+
+class TrainingEventSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    team = TeamRefSerializer(read_only=True)
+    series = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    class Meta:
+        model = TrainingEvent
+        fields = ["id", "team", "start", "location", "note", "series", "yes_count", "no_count", "maybe_count", "updated_at"]
+
+
+class LineupSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    team = TeamRefSerializer(read_only=True)
+    players = PlayerRefSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Lineup
+        fields = ["id", "team", "name", "date", "is_public", "players"]
+
+
+class FixtureSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    home = TeamRefSerializer(read_only=True)
+    away = TeamRefSerializer(read_only=True)
+    venue = serializers.CharField(source="venue.name", read_only=True, default=None)
+
+    class Meta:
+        model = Fixture
+        fields = [
+            "id", "slug", "home", "away", "venue", "datetime", "competition", "round",
+            "status", "result_home", "result_away", "updated_at",
+        ]
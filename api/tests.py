@@ -0,0 +1,164 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts import passes
+from accounts.models import CustomUser, PlayerProfile, Sport
+from club.models import Club
+from match.models import Fixture
+from team import rsvp_counts
+from team.models import AgeGroup, Team, Lineup, TrainingEvent, TrainingRSVP
+
+
+class ReadApiQueryTests(TestCase):
+    """Every list endpoint runs a fixed number of queries, whatever the page size."""
+
+    @classmethod
+    def setUpTestData(cls):
+        club = Club.objects.create(name="TV Api", slug="tv-api")
+        sport = Sport.objects.create(name="Handball")
+        age_group = AgeGroup.objects.create(name="Senioren")
+        cls.teams = [
+            Team.objects.create(name=f"Team {i}", club=club, slug=f"team-{i}", sport=sport, age_group=age_group)
+            for i in range(4)
+        ]
+        cls.team = cls.teams[0]
+        cls.player = CustomUser.objects.create_user(username="player", password="pw")
+        others = CustomUser.objects.bulk_create([CustomUser(username=f"p{i}", short_id=f"p{i}") for i in range(5)])
+        cls.team.players.add(cls.player, *others)
+
+        now = timezone.now()
+        events = TrainingEvent.objects.bulk_create(
+            [TrainingEvent(team=cls.team, start=now + timedelta(days=i)) for i in range(30)]
+        )
+        TrainingRSVP.objects.bulk_create(
+            [TrainingRSVP(training=ev, user=u, status="yes") for ev in events for u in others]
+        )
+        rsvp_counts.reconcile()  # bulk_create bypasses the counter signals
+        lineups = Lineup.objects.bulk_create(
+            [Lineup(team=cls.team, name=f"Spiel {i}", date=now + timedelta(days=i)) for i in range(30)]
+        )
+        Lineup.players.through.objects.bulk_create(
+            [Lineup.players.through(lineup=l, customuser=u) for l in lineups for u in others]
+        )
+        Fixture.objects.bulk_create([
+            Fixture(home=cls.teams[i % 4], away=cls.teams[(i + 1) % 4], datetime=now + timedelta(days=i), slug=f"f-{i}")
+            for i in range(30)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.player)
+
+    def assert_list_queries(self, name, queries, expected_count):
+        url = reverse(f"v1:{name}-list")
+        with self.assertNumQueries(queries):
+            response = self.client.get(url, {"page_size": 50})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), expected_count)
+        return response
+
+    def test_teams(self):
+        self.assert_list_queries("team", 1, 4)
+
+    def test_trainings(self):
+        response = self.assert_list_queries("training", 1, 30)
+        self.assertEqual(response.json()["results"][0]["yes_count"], 5)
+
+    def test_lineups(self):
+        self.assert_list_queries("lineup", 2, 30)
+
+    def test_fixtures(self):
+        self.assert_list_queries("fixture", 1, 30)
+
+    def test_sparse_fields_and_etag(self):
+        url = reverse("v1:lineup-list")
+        with self.assertNumQueries(1):  # players are not prefetched when not requested
+            response = self.client.get(url, {"fields": "id,name"})
+        self.assertEqual(set(response.json()["results"][0]), {"id", "name"})
+
+        again = self.client.get(url, {"fields": "id,name"}, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+
+class PassVerificationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        club = Club.objects.create(name="TV Pass", slug="tv-pass")
+        sport = Sport.objects.create(name="Handball")
+        age_group = AgeGroup.objects.create(name="Senioren")
+        cls.home, cls.away, cls.other = [
+            Team.objects.create(name=name, club=club, slug=name.lower(), sport=sport, age_group=age_group)
+            for name in ("Heim", "Gast", "Andere")
+        ]
+        cls.timekeeper = CustomUser.objects.create_user(username="zeitnehmer", password="pw", role="timekeeper")
+        cls.players = CustomUser.objects.bulk_create(
+            [CustomUser(username=f"s{i}", short_id=f"s{i:04d}") for i in range(30)]
+        )
+        today = timezone.localdate()
+        PlayerProfile.objects.bulk_create([
+            PlayerProfile(
+                user=u, pass_number=f"PASS-{i}", club=club,
+                expires_at=today - timedelta(days=1) if i == 0 else today + timedelta(days=90),
+            )
+            for i, u in enumerate(cls.players)
+        ])
+        cls.home.players.add(*cls.players[:15])
+        cls.away.players.add(*cls.players[15:29])  # the last one is in no squad of the fixture
+        cls.fixture = Fixture.objects.create(home=cls.home, away=cls.away, datetime=timezone.now(), slug="heim-gast")
+        cls.url = reverse("v1:pass-verify")
+
+    def setUp(self):
+        passes.pass_cache().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.timekeeper)
+
+    def verify_all(self, queries):
+        codes = [f"PASS-{i}" for i in range(15)] + [u.short_id for u in self.players[15:]] + ["UNBEKANNT"]
+        with self.assertNumQueries(queries):
+            response = self.client.post(self.url, {"codes": codes, "fixture": self.fixture.slug}, format="json")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_batch_is_read_through_cached(self):
+        data = self.verify_all(3)  # fixture, then players + their teams for all codes
+        self.assertEqual((data["eligible"], data["ineligible"]), (28, 3))
+        by_code = {r["code"]: r for r in data["results"]}
+        self.assertEqual(by_code["PASS-3"]["side"], "home")
+        self.assertEqual(by_code[self.players[20].short_id]["side"], "away")
+        self.assertFalse(by_code["PASS-0"]["eligible"])  # expired
+        self.assertFalse(by_code[self.players[29].short_id]["eligible"])  # not in either squad
+        self.assertFalse(by_code["UNBEKANNT"]["found"])
+
+        self.verify_all(2)  # fixture + the unknown code
+
+    def test_profile_save_and_roster_change_invalidate(self):
+        self.verify_all(3)
+        profile = PlayerProfile.objects.get(pass_number="PASS-3")
+        profile.pass_number = "PASS-3B"
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+            # dropped only after the commit, a check in between still sees the old pass
+            self.assertTrue(self.client.get(self.url, {"code": "PASS-3"}).json()["found"])
+        self.assertFalse(self.client.get(self.url, {"code": "PASS-3"}).json()["found"])
+        self.assertTrue(self.client.get(self.url, {"code": "PASS-3B"}).json()["eligible"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.home.players.remove(self.players[4])
+        result = self.client.get(self.url, {"code": "PASS-4", "fixture": self.fixture.slug}).json()
+        self.assertFalse(result["eligible"])
+
+    def test_lineup_and_permissions(self):
+        lineup = Lineup.objects.create(team=self.home, name="Spiel", date=timezone.now())
+        lineup.players.add(*self.players[:10])
+        data = self.client.post(self.url, {"lineup": lineup.pk}, format="json").json()
+        self.assertEqual((data["eligible"], data["ineligible"]), (9, 1))
+        for bad in ("abc", [lineup.pk], 1.5):
+            response = self.client.post(self.url, {"lineup": bad}, format="json")
+            self.assertEqual(response.status_code, 400)
+
+        self.client.force_authenticate(self.players[1])
+        self.assertEqual(self.client.get(self.url, {"code": "PASS-1"}).status_code, 403)
@@ -0,0 +1,17 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from . import views
+
+v1 = DefaultRouter()
+v1.register("teams", views.TeamViewSet, basename="team")
+v1.register("trainings", views.TrainingEventViewSet, basename="training")
+v1.register("lineups", views.LineupViewSet, basename="lineup")
+v1.register("fixtures", views.FixtureViewSet, basename="fixture")
+
+urlpatterns = [
+    path("v1/", include(([
+        path("passes/verify/", views.PassVerificationView.as_view(), name="pass-verify"),
+        *v1.urls,
+    ], "v1"))),
+]
@@ -0,0 +1,203 @@
+# api/views.py
+"""
+Lese-API v1 (für die Mobile-App).
+
+- Cursor-Pagination (stabil auch bei neuen Einträgen, kein COUNT(*))
+- ``?fields=`` für sparse fieldsets; nicht angefragte Relationen werden gar nicht geladen
+- ETag über den gerenderten Inhalt, If-None-Match -> 304
+
+Dazu die Passkontrolle (PassVerificationView) für Zeitnehmer beim Einlass.
+"""
+import hashlib
+
+from django.db.models import Prefetch, Q
+from django.http import HttpResponseNotModified
+from django.shortcuts import get_object_or_404
+from django.utils.cache import quote_etag
+from django.utils.http import parse_etags
+from rest_framework import permissions, status, viewsets
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts import passes
+from accounts.models import CustomUser
+from match.models import Fixture
+from team.models import Team, TrainingEvent, Lineup
+from team.roles import member_teams
+from .serializers import TeamSerializer, TrainingEventSerializer, LineupSerializer, FixtureSerializer
+
+
+class ApiCursorPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = "id"
+
+
+class TrainingPagination(ApiCursorPagination):
+    ordering = ("start", "id")
+
+
+class LineupPagination(ApiCursorPagination):
+    ordering = "-id"
+
+
+class FixturePagination(ApiCursorPagination):
+    ordering = ("datetime", "id")
+
+
+class ReadOnlyApiViewSet(viewsets.ReadOnlyModelViewSet):
+    pagination_class = ApiCursorPagination
+
+    def requested(self, name):
+        """Wird das Feld ausgeliefert? (für das Tuning der Querysets)"""
+        fields = self.request.query_params.get("fields")
+        return not fields or name in {f.strip() for f in fields.split(",")}
+
+    def team_filter(self, qs, lookup="team__slug"):
+        slug = self.request.query_params.get("team")
+        return qs.filter(**{lookup: slug}) if slug else qs
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method in ("GET", "HEAD") and response.status_code == 200:
+            response.render()
+            etag = quote_etag(hashlib.md5(response.content).hexdigest())
+            if etag in parse_etags(request.headers.get("If-None-Match", "")):
+                not_modified = HttpResponseNotModified()
+                not_modified["ETag"] = etag
+                return not_modified
+            response["ETag"] = etag
+        return response
+
+
+class TeamViewSet(ReadOnlyApiViewSet):
+    serializer_class = TeamSerializer
+    lookup_field = "slug"
+
+    def get_queryset(self):
+        qs = Team.objects.all()
+        related = [name for name in ("club", "sport", "age_group") if self.requested(name)]
+        if related:
+            qs = qs.select_related(*related)
+        club = self.request.query_params.get("club")
+        return qs.filter(club__slug=club) if club else qs
+
+
+class TrainingEventViewSet(ReadOnlyApiViewSet):
+    """Trainings der eigenen Teams mit Zu-/Absagen (``?team=<slug>``)."""
+    serializer_class = TrainingEventSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TrainingPagination
+
+    def get_queryset(self):
+        qs = TrainingEvent.objects.filter(team__in=member_teams(self.request.user))
+        if self.requested("team"):
+            qs = qs.select_related("team")
+        return self.team_filter(qs)
+
+
+class LineupViewSet(ReadOnlyApiViewSet):
+    """Öffentliche Aufstellungen plus alle Aufstellungen der eigenen Teams (``?team=<slug>``)."""
+    serializer_class = LineupSerializer
+    pagination_class = LineupPagination
+
+    def get_queryset(self):
+        qs = Lineup.objects.filter(Q(is_public=True) | Q(team__in=member_teams(self.request.user)))
+        if self.requested("team"):
+            qs = qs.select_related("team")
+        if self.requested("players"):
+            qs = qs.prefetch_related(
+                Prefetch("players", queryset=CustomUser.objects.only("id", "username", "first_name", "last_name"))
+            )
+        return self.team_filter(qs)
+
+
+class FixtureViewSet(ReadOnlyApiViewSet):
+    """Spiele (``?team=<slug>``, ``?competition=``)."""
+    serializer_class = FixtureSerializer
+    lookup_field = "slug"
+    pagination_class = FixturePagination
+
+    def get_queryset(self):
+        qs = Fixture.objects.all()
+        related = [name for name in ("home", "away", "venue") if self.requested(name)]
+        if related:
+            qs = qs.select_related(*related)
+        slug = self.request.query_params.get("team")
+        if slug:
+            qs = qs.filter(Q(home__slug=slug) | Q(away__slug=slug))
+        competition = self.request.query_params.get("competition")
+        return qs.filter(competition=competition) if competition else qs
+
+
+# ------------------------------------------------------------------
+# Passkontrolle
+# ------------------------------------------------------------------
+class CanVerifyPasses(permissions.BasePermission):
+    message = "Nur Zeitnehmer, Schiedsrichter, Trainer und Admins dürfen Pässe prüfen."
+
+    def has_permission(self, request, view):
+        return passes.can_verify(request.user)
+
+
+class PassVerificationView(APIView):
+    """
+    Spielberechtigung zu short_id oder Passnummer.
+
+    - GET ``?code=<code>[&fixture=<slug>]`` - ein Pass
+    - POST ``{"codes": [...], "fixture": <slug>}`` - bis zu MAX_BATCH Pässe auf einmal
+    - POST ``{"lineup": <id>, "fixture": <slug>}`` - alle Spieler einer Aufstellung
+
+    Mit ``fixture`` muss der Spieler im Kader der Heim- oder Gastmannschaft stehen,
+    bei einer Aufstellung ohne Spiel im Kader des Teams der Aufstellung.
+    """
+    permission_classes = [permissions.IsAuthenticated, CanVerifyPasses]
+
+    def sides(self, slug):
+        if not slug:
+            return None
+        fixture = get_object_or_404(Fixture.objects.only("id", "home_id", "away_id"), slug=slug)
+        return passes.fixture_sides(fixture)
+
+    def get(self, request):
+        code = request.query_params.get("code", "").strip()
+        if not code:
+            return Response({"detail": "code fehlt."}, status=status.HTTP_400_BAD_REQUEST)
+        sides = self.sides(request.query_params.get("fixture"))
+        record = passes.records_for_codes([code])[code]
+        return Response(passes.verify(code, record, sides))
+
+    def post(self, request):
+        sides = self.sides(request.data.get("fixture"))
+        lineup_id = request.data.get("lineup")
+        if lineup_id not in (None, ""):
+            try:
+                lineup_id = int(str(lineup_id))
+            except ValueError:
+                return Response({"detail": "lineup muss eine ID sein."}, status=status.HTTP_400_BAD_REQUEST)
+            lineup = get_object_or_404(Lineup.objects.only("id", "team_id"), pk=lineup_id)
+            user_ids = list(Lineup.players.through.objects.filter(lineup_id=lineup.pk).values_list("customuser_id", flat=True))
+            records = passes.records_for_users(user_ids)
+            sides = sides or {lineup.team_id: "team"}
+            results = [
+                passes.verify(records[pk]["short_id"], records[pk], sides)
+                for pk in user_ids if pk in records
+            ]
+        else:
+            codes = request.data.get("codes")
+            if not isinstance(codes, list) or not codes:
+                return Response({"detail": "codes oder lineup fehlt."}, status=status.HTTP_400_BAD_REQUEST)
+            if len(codes) > passes.MAX_BATCH:
+                return Response(
+                    {"detail": f"Höchstens {passes.MAX_BATCH} Pässe pro Anfrage."}, status=status.HTTP_400_BAD_REQUEST
+                )
+            records = passes.records_for_codes(str(code) for code in codes)
+            results = [passes.verify(code, record, sides) for code, record in records.items()]
+
+        return Response({
+            "results": results,
+            "eligible": sum(result["eligible"] for result in results),
+            "ineligible": sum(not result["eligible"] for result in results),
+        })
@@ -6,4 +6,5 @@ urlpatterns = [
     path("create/", views.club_create, name="club_create"),
     path("<slug:slug>/", views.club_detail, name="club_detail"),
     path("<slug:slug>/edit/", views.club_edit, name="club_edit"),
+    path("<slug:slug>/penalties/export.<str:fmt>", views.club_penalties_export, name="club_penalties_export"),
 ]
@@ -2,6 +2,12 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.utils.text import slugify
 from django.contrib.auth.decorators import login_required
+from django.http import Http404, HttpResponseBadRequest, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+from django.urls import reverse
+from jobs.views import redirect_to_job
+from team.exports import FORMATS as EXPORT_FORMATS, export_response, penalties_for
+from team.jobs import export_penalties
 from .models import Club
 from .forms import ClubForm
 
@@ -15,7 +21,10 @@ def club_list(request):
 @login_required
 def club_detail(request, slug):
     club = get_object_or_404(Club, slug=slug)
-    return render(request, "clubs/club_detail.html", {"club": club})
+    return render(request, "clubs/club_detail.html", {
+        "club": club,
+        "can_export": can_export_finances(request.user, club),
+    })
 
 
 @login_required
@@ -51,3 +60,32 @@ def club_edit(request, slug):
         form = ClubForm(instance=club)
 
     return render(request, "clubs/club_form.html", {"form": form, "title": "Club bearbeiten"})
+
+
+def can_export_finances(user, club):
+    if user.role in ("global_admin", "federation_admin"):
+        return True
+    return user.role == "club_admin" and user.club_id == club.pk
+
+
+@login_required
+@require_GET
+def club_penalties_export(request, slug, fmt):
+    """Vergebene Strafen aller Teams des Vereins als CSV/XLSX (?season=2024)."""
+    club = get_object_or_404(Club, slug=slug)
+    if not can_export_finances(request.user, club):
+        return HttpResponseForbidden("Keine Rechte für den Export.")
+    if fmt not in EXPORT_FORMATS:
+        raise Http404
+    try:
+        season = int(request.GET["season"]) if request.GET.get("season") else None
+    except ValueError:
+        return HttpResponseBadRequest("Ungültige Saison.")
+
+    filename = f"strafen-{club.slug}" + (f"-{season}" if season else "")
+    if fmt == "xlsx":
+        entry = export_penalties.enqueue(
+            user=request.user, label=f"Strafen-Export {club.name}", filename=filename, club_id=club.pk, season=season
+        )
+        return redirect_to_job(entry, reverse("club_detail", args=[club.slug]))
+    return export_response(penalties_for(club=club, season=season), fmt, filename)
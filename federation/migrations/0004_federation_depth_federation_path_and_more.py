@@ -0,0 +1,50 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:22
+
+from django.db import migrations, models
+
+
+def build_paths(apps, schema_editor):
+    for model_name in ("Head_Federation", "Federation"):
+        model = apps.get_model("federation", model_name)
+        parents = dict(model.objects.values_list("pk", "parent_id"))
+        rows = []
+        for pk in parents:
+            chain, current = [], pk
+            # walk up to the root; a cycle in legacy data is cut at the repeated node
+            while current is not None and current not in chain:
+                chain.append(current)
+                current = parents.get(current)
+            chain.reverse()
+            rows.append(model(pk=pk, path="/" + "".join(f"{p}/" for p in chain), depth=len(chain) - 1))
+        model.objects.bulk_update(rows, ["path", "depth"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('federation', '0003_federation_sport_head_federation_sport'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='federation',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='federation',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='head_federation',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='head_federation',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(build_paths, migrations.RunPython.noop),
+    ]
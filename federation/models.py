@@ -1,7 +1,109 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Concat, Substr
+from django.core.exceptions import ValidationError
 from accounts.models import Sport
 
-class Head_Federation(models.Model):
+
+class HierarchyModel(models.Model):
+    """
+    Materialisierter Pfad für Verbands-Hierarchien über ``parent``.
+
+    ``path`` enthält die IDs aller Vorfahren inkl. der eigenen, z.B. ``/1/5/12/``.
+    Vorfahren, Nachfahren und Teilbaum-Abfragen laufen damit als eine SQL-Abfrage
+    (``path LIKE '/1/5/%'``) statt rekursiv über ``parent``.
+    Der Pfad wird in save() gepflegt; beim Umhängen werden alle Nachfahren mit
+    einem einzigen UPDATE nachgezogen.
+    """
+    path = models.CharField(max_length=255, blank=True, default="", editable=False, db_index=True)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def _parent_path(self):
+        # read from the DB: an in-memory parent may carry a stale path after a re-parenting
+        if not self.parent_id:
+            return "/", -1
+        return type(self).objects.filter(pk=self.parent_id).values_list("path", "depth").get()
+
+    def _build_path(self):
+        parent_path, parent_depth = self._parent_path()
+        return f"{parent_path}{self.pk}/", parent_depth + 1
+
+    def clean(self):
+        super().clean()
+        if self.pk and self.parent_id:
+            if self.parent_id == self.pk or (self.path and self._parent_path()[0].startswith(self.path)):
+                raise ValidationError({"parent": "Ein Verband kann nicht unter sich selbst oder einem Unterverband hängen."})
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            old_path = self.path
+            new_path, new_depth = self._build_path()
+            if old_path == new_path:
+                return
+            if old_path and new_path.startswith(old_path):
+                raise ValidationError("Ein Verband kann nicht unter einem eigenen Unterverband hängen.")
+
+            model = type(self)
+            model.objects.filter(pk=self.pk).update(path=new_path, depth=new_depth)
+            if old_path:
+                # re-parenting: move the whole subtree in one statement
+                model.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                    path=Concat(Value(new_path), Substr("path", len(old_path) + 1)),
+                    depth=F("depth") + (new_depth - self.depth),
+                )
+            self.path, self.depth = new_path, new_depth
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            old_path, old_depth = self.path, self.depth
+            result = super().delete(*args, **kwargs)
+            if old_path:
+                # children are SET_NULL'ed and become roots: cut the deleted prefix off their subtrees
+                type(self).objects.filter(path__startswith=old_path).update(
+                    path=Concat(Value("/"), Substr("path", len(old_path) + 1)),
+                    depth=F("depth") - (old_depth + 1),
+                )
+            return result
+
+    # -- queries (je eine SQL-Abfrage) --------------------------------
+    def ancestor_ids(self):
+        return [int(pk) for pk in self.path.strip("/").split("/") if pk][:-1]
+
+    def ancestors(self, include_self=False):
+        ids = self.ancestor_ids() + ([self.pk] if include_self else [])
+        return type(self).objects.filter(pk__in=ids).order_by("depth")
+
+    def descendants(self, include_self=False):
+        if not self.path:
+            # unsaved: "path LIKE ''%" would match every row
+            return type(self).objects.none()
+        qs = type(self).objects.filter(path__startswith=self.path).order_by("path")
+        return qs if include_self else qs.exclude(pk=self.pk)
+
+    def is_descendant_of(self, other, include_self=False):
+        if self.pk == other.pk:
+            return include_self and self.pk is not None
+        return bool(other.path) and self.path.startswith(other.path)
+
+    def subtree_q(self, lookup):
+        """
+        Q-Objekt für Objekte im Teilbaum, z.B.
+        ``Club.objects.filter(federation.subtree_q("federation"))``.
+        Für einen ungespeicherten Verband (leerer Pfad) trifft es nichts.
+        """
+        if not self.path:
+            return Q(pk__in=[])
+        return Q(**{f"{lookup}__path__startswith": self.path})
+
+    def get_full_hierarchy(self):
+        # top-down order, one query
+        return list(self.ancestors(include_self=True))
+
+class Head_Federation(HierarchyModel):
     name = models.CharField(max_length=255)
     parent = models.ForeignKey("self", null=True, blank=True, on_delete=models.SET_NULL)
     country = models.CharField(max_length=100, blank=True)
@@ -15,18 +117,10 @@ class Head_Federation(models.Model):
     website = models.URLField(null=True, blank=True)
     sport = models.ForeignKey(Sport, on_delete=models.SET_NULL, null=True)
 
-    def get_full_hierarchy(self):
-        hierarchy = []
-        current = self
-        while current:
-            hierarchy.append(current)
-            current = current.parent
-        return hierarchy[::-1]  # Reverse to get top-down order
-    
     def __str__(self):
         return self.name
 
-class Federation(models.Model):
+class Federation(HierarchyModel):
     name = models.CharField(max_length=255)
     parent = models.ForeignKey("self", null=True, blank=True, on_delete=models.SET_NULL)
     country = models.CharField(max_length=100, blank=True)
@@ -41,13 +135,5 @@ class Federation(models.Model):
     head_federation = models.ForeignKey(Head_Federation, null=True, blank=True, on_delete=models.SET_NULL)
     sport = models.ForeignKey(Sport, on_delete=models.SET_NULL, null=True)
 
-    def get_full_hierarchy(self):
-        hierarchy = []
-        current = self
-        while current:
-            hierarchy.append(current)
-            current = current.parent
-        return hierarchy[::-1]  # Reverse to get top-down order
-    
     def __str__(self):
         return self.name
\ No newline at end of file
@@ -1,3 +1,116 @@
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from accounts import expiry
+from accounts.models import CustomUser
+from club.models import Club
+from .models import Federation
+from .views import can_view_expiries
+
+
+class HierarchyTests(TestCase):
+    def make(self, slug, parent=None):
+        return Federation.objects.create(name=slug.upper(), slug=slug, parent=parent)
+
+    def paths(self):
+        return dict(Federation.objects.values_list("slug", "path"))
+
+    def test_paths_depths_and_subtree_moves(self):
+        root = self.make("dhb")
+        west = self.make("west", root)
+        nord = self.make("nord", root)
+        bezirk = self.make("bezirk", west)
+        kreis = self.make("kreis", bezirk)
+        self.assertEqual(kreis.path, f"/{root.pk}/{west.pk}/{bezirk.pk}/{kreis.pk}/")
+        self.assertEqual(kreis.depth, 3)
+        self.assertEqual([f.slug for f in kreis.ancestors()], ["dhb", "west", "bezirk"])
+        self.assertEqual({f.slug for f in west.descendants()}, {"bezirk", "kreis"})
+        self.assertTrue(kreis.is_descendant_of(root))
+        self.assertFalse(nord.is_descendant_of(west))
+
+        # move "bezirk" with its subtree from west to nord
+        bezirk.parent = nord
+        bezirk.save()
+        kreis.refresh_from_db()
+        self.assertEqual(kreis.path, f"/{root.pk}/{nord.pk}/{bezirk.pk}/{kreis.pk}/")
+        self.assertEqual(kreis.depth, 3)
+        self.assertFalse(west.descendants().exists())
+        self.assertEqual({f.slug for f in nord.descendants()}, {"bezirk", "kreis"})
+
+        Club.objects.create(name="TV Kreis", slug="tv-kreis", federation=kreis)
+        self.assertEqual(Club.objects.filter(nord.subtree_q("federation")).count(), 1)
+        self.assertEqual(Club.objects.filter(west.subtree_q("federation")).count(), 0)
+
+        # cycles are rejected
+        root.parent = kreis
+        with self.assertRaises(ValidationError):
+            root.full_clean()
+        with self.assertRaises(ValidationError):
+            root.save()
+        root.refresh_from_db()
+        self.assertEqual(root.path, f"/{root.pk}/")
+
+        # deleting a node makes its children roots with shortened paths
+        nord.delete()
+        bezirk.refresh_from_db()
+        kreis.refresh_from_db()
+        self.assertEqual((bezirk.path, bezirk.depth), (f"/{bezirk.pk}/", 0))
+        self.assertEqual((kreis.path, kreis.depth), (f"/{bezirk.pk}/{kreis.pk}/", 1))
+
+    def test_unsaved_node_matches_nothing(self):
+        root = self.make("dhb")
+        self.make("west", root)
+        Club.objects.create(name="TV Ohne", slug="tv-ohne", federation=root)
+        unsaved = Federation(name="Neu", slug="neu")
+        self.assertFalse(unsaved.descendants(include_self=True).exists())
+        self.assertFalse(Club.objects.filter(unsaved.subtree_q("federation")).exists())
+        self.assertFalse(root.is_descendant_of(unsaved))
+
+
+class ExpiryDashboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.root = Federation.objects.create(name="DHB", slug="dhb")
+        cls.west = Federation.objects.create(name="West", slug="west", parent=cls.root)
+        cls.kreis = Federation.objects.create(name="Kreis", slug="kreis", parent=cls.west)
+        cls.nord = Federation.objects.create(name="Nord", slug="nord", parent=cls.root)
+
+        def user(username, role, federation=None):
+            return CustomUser.objects.create_user(username=username, password="pw", role=role, federation=federation)
+
+        cls.global_admin = user("global", "global_admin")
+        cls.root_admin = user("dhb-admin", "federation_admin", cls.root)
+        cls.west_admin = user("west-admin", "federation_admin", cls.west)
+        cls.kreis_admin = user("kreis-admin", "federation_admin", cls.kreis)
+        cls.nord_admin = user("nord-admin", "federation_admin", cls.nord)
+        cls.no_federation = user("ohne", "federation_admin")
+        cls.player = user("spieler", "player", cls.west)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_parent_federation_admins_can_view(self):
+        allowed = {self.global_admin, self.root_admin, self.west_admin}
+        for user in (self.global_admin, self.root_admin, self.west_admin, self.kreis_admin,
+                     self.nord_admin, self.no_federation, self.player):
+            with self.subTest(user=user.username):
+                self.assertEqual(can_view_expiries(user, self.west), user in allowed)
+        self.assertTrue(can_view_expiries(self.root_admin, self.kreis))
+        self.assertFalse(can_view_expiries(self.kreis_admin, self.root))
+
+    def test_dashboard_and_csv_views(self):
+        url = reverse("federation_expiries", args=[self.west.slug])
+        csv_url = reverse("federation_expiries_csv", args=[self.west.slug])
+        self.client.force_login(self.root_admin)
+        response = self.client.get(url, HTTP_HOST="localhost")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["kind"] for row in response.context["dashboard"]["rows"]], list(expiry.KINDS))
+        response = self.client.get(csv_url, {"kind": "referee"}, HTTP_HOST="localhost")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(csv_url, {"kind": "x"}, HTTP_HOST="localhost").status_code, 400)
+
+        self.client.force_login(self.nord_admin)
+        self.assertEqual(self.client.get(url, HTTP_HOST="localhost").status_code, 403)
+        self.assertEqual(self.client.get(csv_url, HTTP_HOST="localhost").status_code, 403)
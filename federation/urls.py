@@ -13,4 +13,6 @@ urlpatterns = [
     path("create/", views.federation_create, name="federation_create"),
     path("<slug:slug>/", views.federation_detail, name="federation_detail"),
     path("<slug:slug>/edit/", views.federation_edit, name="federation_edit"),
+    path("<slug:slug>/expiries/", views.federation_expiries, name="federation_expiries"),
+    path("<slug:slug>/expiries.csv", views.federation_expiries_csv, name="federation_expiries_csv"),
 ]
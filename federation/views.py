@@ -1,8 +1,12 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.http import HttpResponseBadRequest, HttpResponseForbidden, StreamingHttpResponse
 from django.utils.text import slugify
 
+from accounts import expiry
+
+from club.models import Club
 from .models import Head_Federation, Federation
 from .forms import HeadFederationForm, FederationForm
 
@@ -20,7 +24,12 @@ def head_list(request):
 @login_required
 def head_detail(request, slug):
     head = get_object_or_404(Head_Federation, slug=slug)
-    return render(request, "federation/head_detail.html", {"head": head})
+    return render(request, "federation/head_detail.html", {
+        "head": head,
+        "hierarchy": head.get_full_hierarchy(),
+        "sub_heads": head.descendants().select_related("parent"),
+        "federations": Federation.objects.filter(head.subtree_q("head_federation")).order_by("name"),
+    })
 
 
 @login_required
@@ -70,7 +79,12 @@ def federation_list(request):
 @login_required
 def federation_detail(request, slug):
     federation = get_object_or_404(Federation, slug=slug)
-    return render(request, "federation/federation_detail.html", {"federation": federation})
+    return render(request, "federation/federation_detail.html", {
+        "federation": federation,
+        "hierarchy": federation.get_full_hierarchy(),
+        "sub_federations": federation.descendants().select_related("parent"),
+        "clubs": Club.objects.filter(federation.subtree_q("federation")).order_by("name"),
+    })
 
 
 @login_required
@@ -105,3 +119,50 @@ def federation_edit(request, slug):
         form = FederationForm(instance=federation)
 
     return render(request, "federation/federation_form.html", {"form": form, "title": "Verband bearbeiten"})
+
+
+# --------------------------
+# PASS / LICENCE EXPIRY
+# --------------------------
+
+def can_view_expiries(user, federation):
+    """Globale Admins und Verbandsadmins des Verbands oder eines übergeordneten Verbands."""
+    if user.role == "global_admin":
+        return True
+    if user.role != "federation_admin" or not user.federation_id:
+        return False
+    return federation.is_descendant_of(user.federation, include_self=True)
+
+
+@login_required
+def federation_expiries(request, slug):
+    federation = get_object_or_404(Federation, slug=slug)
+    if not can_view_expiries(request.user, federation):
+        return HttpResponseForbidden("Keine Rechte für diese Ansicht.")
+    return render(request, "federation/expiry_dashboard.html", {
+        "federation": federation,
+        "dashboard": expiry.dashboard(federation),
+        "kinds": expiry.KINDS,
+        "default_days": expiry.DEFAULT_DAYS,
+    })
+
+
+@login_required
+def federation_expiries_csv(request, slug):
+    """Ablaufende Pässe/Lizenzen als CSV (?days=60&kind=player|referee|timekeeper)."""
+    federation = get_object_or_404(Federation, slug=slug)
+    if not can_view_expiries(request.user, federation):
+        return HttpResponseForbidden("Keine Rechte für den Export.")
+    kind = request.GET.get("kind")
+    if kind and kind not in expiry.KINDS:
+        return HttpResponseBadRequest("Unbekannte Art.")
+    try:
+        days = int(request.GET.get("days", expiry.DEFAULT_DAYS))
+    except ValueError:
+        return HttpResponseBadRequest("Ungültiger Zeitraum.")
+
+    start, end = expiry.window(days)
+    kinds = [kind] if kind else list(expiry.KINDS)
+    response = StreamingHttpResponse(expiry.csv_lines(kinds, start, end, federation), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="ablauf-{federation.slug}-{start:%Y%m%d}-{end:%Y%m%d}.csv"'
+    return response
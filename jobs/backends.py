@@ -0,0 +1,58 @@
+# jobs/backends.py
+"""
+Ausführung der Jobs (settings.JOBS_BACKEND).
+
+Jedes Backend bekommt nur die Job-ID; Argumente und Status liegen in der Datenbank.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+
+class SyncBackend:
+    """Führt den Job sofort im aufrufenden Thread aus (Tests, Management-Commands)."""
+
+    def submit(self, job_id):
+        from .runner import run_job
+
+        run_job(job_id)
+
+
+class LocalBackend:
+    """
+    Thread-Pool im Web-Prozess - kein Broker nötig. Jobs eines beendeten Prozesses
+    bleiben "wartend" bzw. "läuft"; ``manage.py run_jobs`` holt die wartenden nach
+    und reiht laufende nach JOBS_RUNNING_TIMEOUT neu ein.
+    """
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, "JOBS_LOCAL_WORKERS", 2), thread_name_prefix="jobs"
+        )
+
+    def submit(self, job_id):
+        self.executor.submit(self._run, job_id)
+
+    @staticmethod
+    def _run(job_id):
+        from .runner import run_job
+
+        close_old_connections()
+        try:
+            run_job(job_id)
+        finally:
+            close_old_connections()
+
+
+class CeleryBackend:
+    """Übergibt die Job-ID an Celery (Broker: settings.CELERY_BROKER_URL)."""
+
+    def __init__(self):
+        # configures the shared tasks with the project's Celery app
+        import sportmaster.celery  # noqa: F401
+
+    def submit(self, job_id):
+        from .tasks import run_job_task
+
+        run_job_task.delay(job_id)
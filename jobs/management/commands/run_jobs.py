@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.runner import prune_files, requeue_stale, run_job
+
+
+class Command(BaseCommand):
+    help = (
+        "Führt wartende Hintergrund-Jobs aus (z.B. nach einem Neustart mit dem LocalBackend, oder per Cron). "
+        "Jobs, die länger als JOBS_RUNNING_TIMEOUT laufen, werden vorher neu eingereiht, "
+        "Ergebnisdateien älter als JOBS_FILES_MAX_AGE gelöscht."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than", type=int, default=60, help="nur Jobs, die seit mindestens N Sekunden warten")
+        parser.add_argument("--limit", type=int, default=100)
+        parser.add_argument("--stale-after", type=int, help="laufende Jobs nach N Sekunden neu einreihen (Standard: JOBS_RUNNING_TIMEOUT)")
+        parser.add_argument("--files-max-age", type=int, help="Ergebnisdateien nach N Sekunden löschen (Standard: JOBS_FILES_MAX_AGE)")
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale(options["stale_after"])
+        if requeued:
+            self.stdout.write(f"{len(requeued)} hängende Jobs neu eingereiht.")
+        pruned = prune_files(options["files_max_age"])
+        if pruned:
+            self.stdout.write(f"{pruned} alte Ergebnisdateien gelöscht.")
+        cutoff = timezone.now() - timedelta(seconds=options["older_than"])
+        ids = list(
+            Job.objects.filter(status=Job.QUEUED, created_at__lte=cutoff)
+            .order_by("created_at")
+            .values_list("pk", flat=True)[: options["limit"]]
+        )
+        for job_id in ids:
+            run_job(job_id)
+        done = Job.objects.filter(pk__in=ids, status=Job.DONE).count()
+        self.stdout.write(self.style.SUCCESS(f"{len(ids)} Jobs ausgeführt, {done} erfolgreich."))
@@ -0,0 +1,40 @@
+# jobs/models.py
+from django.conf import settings
+from django.db import models
+
+
+class Job(models.Model):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Wartet"),
+        (RUNNING, "Läuft"),
+        (DONE, "Fertig"),
+        (FAILED, "Fehlgeschlagen"),
+    ]
+
+    name = models.CharField(max_length=100)
+    label = models.CharField(max_length=255, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name="jobs")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # run_jobs picks up waiting jobs oldest first
+            models.Index(fields=["status", "created_at"], name="jobs_job_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.label or self.name} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.DONE, self.FAILED)
@@ -0,0 +1,166 @@
+# jobs/runner.py
+"""
+Hintergrund-Jobs für langsame Arbeit außerhalb des Requests.
+
+- Apps registrieren Funktionen mit ``@job("app.name")`` in ``<app>/jobs.py``.
+- ``enqueue()`` legt einen Job-Eintrag an (Status in der Datenbank) und übergibt
+  ihn nach dem Commit an das Backend aus ``settings.JOBS_BACKEND``:
+  LocalBackend (Thread-Pool im Prozess, kein Broker nötig), CeleryBackend oder
+  SyncBackend (sofort, für Tests).
+- ``run_job()`` übernimmt einen wartenden Job genau einmal (bedingtes UPDATE),
+  führt ihn aus und speichert Ergebnis bzw. Fehler.
+- ``requeue_stale()`` stellt Jobs, die länger als JOBS_RUNNING_TIMEOUT laufen
+  (Prozess abgestürzt oder neu gestartet), wieder in die Warteschlange
+  (``manage.py run_jobs``). Meldet sich der alte Lauf doch noch zurück, wird
+  sein Ergebnis verworfen.
+- Ergebnisdateien (Exporte) und Uploads für Jobs (``save_upload()``, z.B. Importe)
+  liegen in ``file_storage()`` unter JOBS_FILES_ROOT,
+  außerhalb von MEDIA_ROOT und mit zufälligen Namen; ausgeliefert werden sie nur
+  über ``job_download`` an den Auftraggeber. ``prune_files()`` löscht sie nach
+  JOBS_FILES_MAX_AGE Sekunden (``manage.py run_jobs``).
+"""
+import logging
+import os
+import secrets
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = "jobs.backends.LocalBackend"
+DEFAULT_RUNNING_TIMEOUT = 60 * 60
+DEFAULT_FILES_MAX_AGE = 7 * 24 * 60 * 60
+
+_registry = {}
+_backend = None
+
+
+class JobFunction:
+    def __init__(self, name, func, bind):
+        self.name = name
+        self.func = func
+        self.bind = bind
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, user=None, label="", **kwargs):
+        return enqueue(self.name, user=user, label=label, **kwargs)
+
+
+def job(name, bind=False):
+    """
+    Registriert eine Job-Funktion. Argumente müssen JSON-serialisierbar sein
+    (IDs statt Objekte), der Rückgabewert ebenso. bind=True übergibt den Job-Eintrag
+    als erstes Argument.
+    """
+    def decorator(func):
+        _registry[name] = JobFunction(name, func, bind)
+        return _registry[name]
+    return decorator
+
+
+def get_backend():
+    global _backend
+    path = getattr(settings, "JOBS_BACKEND", DEFAULT_BACKEND)
+    if _backend is None or _backend.path != path:
+        _backend = import_string(path)()
+        _backend.path = path
+    return _backend
+
+
+def enqueue(name, user=None, label="", **kwargs):
+    """Legt den Job an; ausgeführt wird er erst nach dem Commit der laufenden Transaktion."""
+    if name not in _registry:
+        raise KeyError(f"Unbekannter Job: {name}")
+    entry = Job.objects.create(
+        name=name,
+        label=label,
+        kwargs=kwargs,
+        created_by=user if user is not None and user.is_authenticated else None,
+    )
+    transaction.on_commit(lambda: get_backend().submit(entry.pk))
+    return entry
+
+
+def run_job(job_id):
+    """Führt einen wartenden Job aus (no-op, wenn ihn schon jemand übernommen hat)."""
+    started_at = timezone.now()
+    claimed = Job.objects.filter(pk=job_id, status=Job.QUEUED).update(status=Job.RUNNING, started_at=started_at)
+    if not claimed:
+        return
+    entry = Job.objects.get(pk=job_id)
+    function = _registry.get(entry.name)
+    # only this run may finish the job - not one that was requeued in the meantime
+    mine = Job.objects.filter(pk=job_id, status=Job.RUNNING, started_at=started_at)
+    try:
+        if function is None:
+            raise KeyError(f"Unbekannter Job: {entry.name}")
+        args = (entry,) if function.bind else ()
+        result = function(*args, **entry.kwargs)
+    except Exception:
+        logger.exception("Job %s (%s) fehlgeschlagen", entry.pk, entry.name)
+        mine.update(status=Job.FAILED, error=traceback.format_exc(), finished_at=timezone.now())
+        return
+    if not mine.update(status=Job.DONE, result=result, finished_at=timezone.now()):
+        logger.warning("Job %s (%s) wurde zwischenzeitlich neu eingereiht; Ergebnis verworfen", entry.pk, entry.name)
+
+
+def requeue_stale(timeout=None):
+    """Setzt Jobs, die seit mehr als ``timeout`` Sekunden laufen, auf wartend; returns ihre IDs."""
+    if timeout is None:
+        timeout = getattr(settings, "JOBS_RUNNING_TIMEOUT", DEFAULT_RUNNING_TIMEOUT)
+    stale = Job.objects.filter(status=Job.RUNNING, started_at__lt=timezone.now() - timedelta(seconds=timeout))
+    ids = list(stale.values_list("pk", flat=True))
+    if ids:
+        # re-check the status, a job may have finished since the select
+        Job.objects.filter(pk__in=ids, status=Job.RUNNING).update(status=Job.QUEUED, started_at=None)
+        logger.warning("%d hängende Jobs neu eingereiht: %s", len(ids), ids)
+    return ids
+
+
+# ------------------------------------------------------------------
+# Ergebnisdateien
+# ------------------------------------------------------------------
+def file_storage():
+    """Ablage für Job-Dateien; bewusst ohne URL, nicht öffentlich ausgeliefert."""
+    return FileSystemStorage(location=settings.JOBS_FILES_ROOT, base_url=None)
+
+
+def save_file(entry, fileobj, filename):
+    """Speichert eine Ergebnisdatei des Jobs; returns das Job-Ergebnis {"file", "filename"}"""
+    _, ext = os.path.splitext(filename)
+    name = file_storage().save(f"{entry.pk}/{secrets.token_urlsafe(24)}{ext}", File(fileobj))
+    return {"file": name, "filename": filename}
+
+
+def save_upload(upload):
+    """Legt eine hochgeladene Datei für einen Job ab; returns den Namen im file_storage()"""
+    _, ext = os.path.splitext(upload.name)
+    return file_storage().save(f"uploads/{secrets.token_urlsafe(24)}{ext}", upload)
+
+
+def prune_files(max_age=None):
+    """Löscht Ergebnisdateien von Jobs, die vor mehr als ``max_age`` Sekunden fertig wurden; returns Anzahl"""
+    if max_age is None:
+        max_age = getattr(settings, "JOBS_FILES_MAX_AGE", DEFAULT_FILES_MAX_AGE)
+    storage = file_storage()
+    old = Job.objects.filter(
+        status=Job.DONE, finished_at__lt=timezone.now() - timedelta(seconds=max_age), result__has_key="file"
+    )
+    pruned = 0
+    for entry in old.only("pk", "result"):
+        storage.delete(entry.result["file"])
+        result = {key: value for key, value in entry.result.items() if key != "file"}
+        Job.objects.filter(pk=entry.pk).update(result=result)
+        pruned += 1
+    return pruned
@@ -0,0 +1,10 @@
+# jobs/tasks.py
+# Celery task for the CeleryBackend (worker: celery -A sportmaster worker)
+from celery import shared_task
+
+from .runner import run_job
+
+
+@shared_task(name="jobs.run_job", ignore_result=True)
+def run_job_task(job_id):
+    run_job(job_id)
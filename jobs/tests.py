@@ -0,0 +1,124 @@
+import os
+import tempfile
+from datetime import date, time, timedelta
+from io import StringIO
+
+from django.conf import settings
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser, Sport
+from club.models import Club
+from team.models import AgeGroup, AssignedPenalty, Penalty, Team, TrainingEvent, TrainingSeries
+
+from .models import Job
+from .runner import file_storage, job, run_job
+
+
+@job("jobs.tests.fail")
+def failing_job():
+    raise ValueError("kaputt")
+
+
+@override_settings(JOBS_BACKEND="jobs.backends.SyncBackend")
+class JobRunnerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.team = Team.objects.create(
+            name="Herren 1",
+            club=Club.objects.create(name="TV Jobs", slug="tv-jobs"),
+            slug="herren-1",
+            sport=Sport.objects.create(name="Handball"),
+            age_group=AgeGroup.objects.create(name="Senioren"),
+        )
+        cls.trainer = CustomUser.objects.create_user(username="trainer", password="pw", role="coach")
+        cls.other = CustomUser.objects.create_user(username="other", password="pw")
+        cls.team.trainers.add(cls.trainer)
+
+    def test_series_events_are_generated_after_commit(self):
+        self.client.force_login(self.trainer)
+        data = {"weekday": 0, "time": "19:00", "start_date": "2026-01-05", "end_date": "2026-02-23"}
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("training_series_create", kwargs={"slug": self.team.slug}), data, HTTP_HOST="localhost"
+            )
+        entry = Job.objects.get()
+        self.assertRedirects(response, reverse("job_detail", args=[entry.pk]) + "?next=%2Fteam%2Fherren-1%2Ftrainers%2F",
+                             fetch_redirect_response=False)
+        self.assertEqual(entry.status, Job.DONE)
+        self.assertEqual(entry.result, {"created": 8})
+        self.assertEqual(TrainingEvent.objects.filter(team=self.team).count(), 8)
+
+        response = self.client.get(reverse("job_detail", args=[entry.pk]), HTTP_HOST="localhost")
+        self.assertContains(response, "8 Termine angelegt")
+        self.client.force_login(self.other)
+        response = self.client.get(reverse("job_detail", args=[entry.pk]), HTTP_HOST="localhost")
+        self.assertEqual(response.status_code, 403)
+
+    def test_job_runs_once_and_records_failures(self):
+        with self.assertLogs("jobs.runner", "ERROR"), self.captureOnCommitCallbacks(execute=True):
+            entry = failing_job.enqueue()
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, Job.FAILED)
+        self.assertIn("ValueError: kaputt", entry.error)
+
+        series = TrainingSeries.objects.create(
+            team=self.team, weekday=2, time=time(18), start_date=date(2026, 3, 2), end_date=date(2026, 3, 31)
+        )
+        entry = Job.objects.create(name="team.generate_series_events", kwargs={"series_id": series.pk})
+        run_job(entry.pk)
+        run_job(entry.pk)
+        entry.refresh_from_db()
+        self.assertEqual(entry.result, {"created": 4})
+        self.assertEqual(TrainingEvent.objects.filter(team=self.team).count(), 4)
+
+    def test_run_jobs_requeues_jobs_of_dead_workers(self):
+        series = TrainingSeries.objects.create(
+            team=self.team, weekday=4, time=time(18), start_date=date(2026, 4, 1), end_date=date(2026, 4, 30)
+        )
+        long_ago = timezone.now() - timedelta(hours=2)
+        lost = Job.objects.create(name="team.generate_series_events", kwargs={"series_id": series.pk})
+        busy = Job.objects.create(name="team.generate_series_events", kwargs={"series_id": series.pk})
+        Job.objects.filter(pk=lost.pk).update(status=Job.RUNNING, started_at=long_ago, created_at=long_ago)
+        Job.objects.filter(pk=busy.pk).update(status=Job.RUNNING, started_at=timezone.now(), created_at=long_ago)
+
+        with self.assertLogs("jobs.runner", "WARNING"):
+            call_command("run_jobs", stale_after=3600, stdout=StringIO())
+        lost.refresh_from_db()
+        busy.refresh_from_db()
+        self.assertEqual((lost.status, lost.result), (Job.DONE, {"created": 4}))
+        self.assertEqual(busy.status, Job.RUNNING)
+
+    def test_export_files_are_private_and_pruned(self):
+        penalty = Penalty.objects.create(team=self.team, title="Zu spät", amount="2.50")
+        AssignedPenalty.objects.create(team=self.team, user=self.other, penalty=penalty)
+        self.client.force_login(self.trainer)
+        with tempfile.TemporaryDirectory() as root, override_settings(JOBS_FILES_ROOT=root):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.get(reverse("penalties_export", args=[self.team.slug, "xlsx"]), HTTP_HOST="localhost")
+            entry = Job.objects.get()
+            name = entry.result["file"]
+            self.assertEqual(entry.result["filename"], "strafen-herren-1.xlsx")
+            self.assertNotIn("herren", name)
+            path = file_storage().path(name)
+            self.assertTrue(path.startswith(root) and os.path.exists(path))
+            self.assertFalse(path.startswith(str(settings.MEDIA_ROOT)))
+
+            url = reverse("job_download", args=[entry.pk])
+            response = self.client.get(url, HTTP_HOST="localhost")
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("strafen-herren-1.xlsx", response["Content-Disposition"])
+            response.close()
+            self.client.force_login(self.other)
+            self.assertEqual(self.client.get(url, HTTP_HOST="localhost").status_code, 403)
+
+            Job.objects.filter(pk=entry.pk).update(finished_at=timezone.now() - timedelta(days=8))
+            call_command("run_jobs", files_max_age=7 * 24 * 3600, stdout=StringIO())
+            entry.refresh_from_db()
+            self.assertFalse(os.path.exists(path))
+            self.assertNotIn("file", entry.result)
+            self.client.force_login(self.trainer)
+            self.assertEqual(self.client.get(url, HTTP_HOST="localhost").status_code, 404)
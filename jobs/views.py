@@ -0,0 +1,45 @@
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, HttpResponseForbidden
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
+from django.utils.http import url_has_allowed_host_and_scheme, urlencode
+
+from .models import Job
+from .runner import file_storage
+
+
+def redirect_to_job(entry, next_url=""):
+    """Weiterleitung auf die Statusseite eines gerade eingereihten Auftrags."""
+    url = reverse("job_detail", args=[entry.pk])
+    return redirect(f"{url}?{urlencode({'next': next_url})}" if next_url else url)
+
+
+def _own_job(request, pk):
+    entry = get_object_or_404(Job, pk=pk)
+    if entry.created_by_id != request.user.pk and not request.user.is_staff:
+        return entry, HttpResponseForbidden("Das ist nicht dein Auftrag.")
+    return entry, None
+
+
+@login_required
+def job_detail(request, pk):
+    """Status eines Hintergrund-Auftrags; lädt sich neu, bis er fertig ist."""
+    entry, denied = _own_job(request, pk)
+    if denied:
+        return denied
+    next_url = request.GET.get("next", "")
+    if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+        next_url = ""
+    return render(request, "jobs/job_detail.html", {"job": entry, "next": next_url})
+
+
+@login_required
+def job_download(request, pk):
+    entry, denied = _own_job(request, pk)
+    if denied:
+        return denied
+    result = entry.result or {}
+    storage = file_storage()
+    if entry.status != Job.DONE or not result.get("file") or not storage.exists(result["file"]):
+        raise Http404("Keine Datei vorhanden.")
+    return FileResponse(storage.open(result["file"], "rb"), as_attachment=True, filename=result.get("filename"))
@@ -0,0 +1,37 @@
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from match.models import Fixture
+from match.referees import assign_referees, plan_assignments
+
+
+class Command(BaseCommand):
+    help = "Teilt Schiedsrichter für alle noch unbesetzten Spiele eines Zeitraums ein."
+
+    def add_arguments(self, parser):
+        parser.add_argument("start", help="erster Tag (JJJJ-MM-TT)")
+        parser.add_argument("end", help="letzter Tag (JJJJ-MM-TT)")
+        parser.add_argument("--competition", help="nur Spiele dieses Wettbewerbs")
+        parser.add_argument("--dry-run", action="store_true", help="nur berechnen, nicht speichern")
+
+    def handle(self, *args, **options):
+        try:
+            start = datetime.strptime(options["start"], "%Y-%m-%d").date()
+            end = datetime.strptime(options["end"], "%Y-%m-%d").date()
+        except ValueError:
+            raise CommandError("Datum im Format JJJJ-MM-TT angeben.")
+
+        fixtures = Fixture.objects.filter(
+            referee__isnull=True,
+            status="scheduled",
+            datetime__gte=timezone.make_aware(datetime.combine(start, time.min)),
+            datetime__lte=timezone.make_aware(datetime.combine(end, time.max)),
+        )
+        if options["competition"]:
+            fixtures = fixtures.filter(competition=options["competition"])
+
+        total = fixtures.count()
+        plan = plan_assignments(fixtures) if options["dry_run"] else assign_referees(fixtures)
+        self.stdout.write(self.style.SUCCESS(f"{len(plan)} von {total} Spielen besetzt."))
@@ -0,0 +1,74 @@
+import time
+from collections import Counter
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import Sport
+from club.models import Club
+from team.models import Team, AgeGroup
+from venue.models import Venue
+from match import scheduling
+
+
+class Command(BaseCommand):
+    help = (
+        "Misst den Spielplan-Generator (Standard: 20 Teams, Hin- und Rückrunde = 380 Spiele). "
+        "Alle Daten werden in einer Transaktion angelegt und am Ende zurückgerollt."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--teams", type=int, default=20)
+        parser.add_argument("--venues", type=int, default=4)
+        parser.add_argument("--single", action="store_true", help="nur Hinrunde")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            teams, venues = self.seed(options["teams"], options["venues"])
+            self.run(teams, venues, not options["single"], options["repeat"])
+            transaction.set_rollback(True)
+
+    def seed(self, n_teams, n_venues):
+        club = Club.objects.create(name="Bench Liga", slug="bench-liga")
+        sport = Sport.objects.create(name="Bench Handball")
+        age_group = AgeGroup.objects.create(name="Bench Senioren")
+        teams = Team.objects.bulk_create([
+            Team(name=f"Bench Team {i}", club=club, sport=sport, age_group=age_group, slug=f"bench-team-{i}")
+            for i in range(n_teams)
+        ])
+        venues = Venue.objects.bulk_create([Venue(name=f"Bench Halle {i}", slug=f"bench-halle-{i}") for i in range(n_venues)])
+        return teams, venues
+
+    def run(self, teams, venues, double, repeat):
+        home_venues = {team.pk: venues[i % len(venues)].pk for i, team in enumerate(teams)}
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            rounds = scheduling.round_robin([t.pk for t in teams], double=double)
+            plan = scheduling.schedule(
+                rounds, scheduling.round_dates(date(2030, 9, 1), len(rounds)), venues=venues, home_venues=home_venues
+            )
+        generate_ms = (time.perf_counter() - started) / repeat * 1000
+
+        started = time.perf_counter()
+        for i in range(repeat):
+            sid = transaction.savepoint()
+            fixtures = scheduling.create_season(
+                teams, date(2030, 9, 1), double=double, venues=venues, home_venues=home_venues, competition=f"Bench {i}"
+            )
+            transaction.savepoint_rollback(sid)
+        total_ms = (time.perf_counter() - started) / repeat * 1000
+
+        home = Counter(home for _, home, _, _, _ in plan)
+        away = Counter(away for _, _, away, _, _ in plan)
+        pairs = Counter(frozenset((h, a)) for _, h, a, _, _ in plan)
+        slots = Counter((v, when) for _, _, _, v, when in plan)
+        self.stdout.write(f"{len(teams)} Teams, {len(rounds)} Spieltage, {len(fixtures)} Spiele")
+        self.stdout.write(f"Generieren:            {generate_ms:8.1f}ms")
+        self.stdout.write(f"Generieren+Speichern:  {total_ms:8.1f}ms")
+        self.stdout.write(
+            f"Heim/Auswärts max. Differenz: {max(abs(home[t.pk] - away[t.pk]) for t in teams)}, "
+            f"Paarungen je {set(pairs.values())}, Hallen doppelt belegt: {sum(1 for c in slots.values() if c > 1)}"
+        )
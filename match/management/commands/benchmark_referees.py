@@ -0,0 +1,96 @@
+import random
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import CustomUser, RefereeProfile, Sport
+from club.models import Club
+from team.models import Team, AgeGroup
+from match.models import Fixture, MATCH_DURATION
+from match.referees import plan_assignments
+
+
+class Command(BaseCommand):
+    help = (
+        "Misst die Schiedsrichter-Einteilung (Standard: 2000 Spiele x 500 Schiedsrichter an 8 Spieltagen). "
+        "Alle Daten werden in einer Transaktion angelegt und am Ende zurückgerollt."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fixtures", type=int, default=2000)
+        parser.add_argument("--referees", type=int, default=500)
+        parser.add_argument("--days", type=int, default=8)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            fixtures = self.seed(options["fixtures"], options["referees"], options["days"])
+            self.run(fixtures)
+            transaction.set_rollback(True)
+
+    def seed(self, n_fixtures, n_referees, n_days):
+        rnd = random.Random(42)
+        club = Club.objects.create(name="Bench Schiri", slug="bench-schiri")
+        sport = Sport.objects.create(name="Bench Handball")
+        age_group = AgeGroup.objects.create(name="Bench Senioren")
+        teams = Team.objects.bulk_create([
+            Team(name=f"Bench Team {i}", club=club, sport=sport, age_group=age_group, slug=f"bench-team-{i}")
+            for i in range(200)
+        ])
+        referees = CustomUser.objects.bulk_create([
+            CustomUser(username=f"bench-ref-{i}", short_id=f"bref{i}", role="referee") for i in range(n_referees)
+        ])
+        today = date.today()
+        RefereeProfile.objects.bulk_create([
+            RefereeProfile(
+                user=ref,
+                license_number=f"BENCH-{i}",
+                license_level="Basis",
+                # every tenth licence has expired
+                expires_at=today - timedelta(days=1) if i % 10 == 0 else today + timedelta(days=365),
+            )
+            for i, ref in enumerate(referees)
+        ])
+
+        first_day = today + timedelta(days=7)
+        kickoffs = [timezone.make_aware(datetime.combine(first_day, datetime.min.time())) + timedelta(days=d, hours=h)
+                    for d in range(n_days) for h in range(10, 21)]
+        fixtures = Fixture.objects.bulk_create([
+            Fixture(
+                home=teams[(2 * i) % 200],
+                away=teams[(2 * i + 1) % 200],
+                datetime=rnd.choice(kickoffs),
+                slug=f"bench-fixture-{i}",
+            )
+            for i in range(n_fixtures)
+        ], batch_size=500)
+        Fixture.referee_preferences.through.objects.bulk_create([
+            Fixture.referee_preferences.through(fixture=f, customuser=ref)
+            for f in fixtures
+            for ref in rnd.sample(referees, rnd.randint(0, 3))
+        ], batch_size=1000)
+        return Fixture.objects.filter(slug__startswith="bench-fixture-")
+
+    def run(self, fixtures):
+        started = time.perf_counter()
+        plan = plan_assignments(fixtures)
+        elapsed = time.perf_counter() - started
+
+        starts = dict(fixtures.values_list("id", "datetime"))
+        prefs = set(Fixture.referee_preferences.through.objects.filter(fixture__in=fixtures).values_list("fixture_id", "customuser_id"))
+        by_referee = {}
+        for fixture_id, referee_id in plan.items():
+            by_referee.setdefault(referee_id, []).append(starts[fixture_id])
+        conflicts = sum(
+            1 for times in by_referee.values() for a, b in zip(sorted(times), sorted(times)[1:]) if b - a < MATCH_DURATION
+        )
+        load = Counter({referee_id: len(times) for referee_id, times in by_referee.items()})
+        expired = RefereeProfile.objects.filter(user_id__in=load, expires_at__lt=date.today()).count()
+
+        self.stdout.write(f"{fixtures.count()} Spiele, {len(plan)} besetzt in {elapsed:.2f}s")
+        self.stdout.write(f"Wünsche erfüllt: {sum(1 for item in plan.items() if item in prefs)} / {len({f for f, _ in prefs})} Spiele mit Wunsch")
+        self.stdout.write(f"Belastung min/max: {min(load.values())}/{max(load.values())} bei {len(load)} Schiedsrichtern")
+        self.stdout.write(f"Überschneidungen: {conflicts}, abgelaufene Lizenzen eingeteilt: {expired}")
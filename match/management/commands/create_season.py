@@ -0,0 +1,87 @@
+from datetime import date, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from match import scheduling
+from team.models import Team
+from venue.models import Venue
+
+
+def _date(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Ungültiges Datum: {value} (erwartet JJJJ-MM-TT)")
+
+
+def _time(value):
+    try:
+        return time.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Ungültige Anstoßzeit: {value} (erwartet HH:MM)")
+
+
+class Command(BaseCommand):
+    help = (
+        "Erzeugt den Spielplan einer Saison (Jeder gegen Jeden) und speichert alle Spiele. "
+        "Beispiel: create_season --competition 'Kreisliga 2026/27' --first-day 2026-09-05 "
+        "--teams tv-a tv-b tv-c --venues halle-1 halle-2 --home-venue tv-a=halle-1 --double"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--competition", required=True)
+        parser.add_argument("--teams", nargs="+", required=True, help="Team-Slugs")
+        parser.add_argument("--first-day", required=True, type=_date, help="Datum des ersten Spieltags")
+        parser.add_argument("--interval-days", type=int, default=7, help="Abstand der Spieltage")
+        parser.add_argument("--double", action="store_true", help="mit Rückrunde")
+        parser.add_argument("--venues", nargs="*", default=[], help="Hallen-Slugs")
+        parser.add_argument("--home-venue", action="append", default=[], metavar="TEAM=HALLE",
+                            help="Heimhalle eines Teams (mehrfach möglich)")
+        parser.add_argument("--kickoffs", nargs="+", type=_time, default=list(scheduling.DEFAULT_KICKOFFS),
+                            help="Anstoßzeiten pro Spieltag, z.B. 15:00 17:00")
+        parser.add_argument("--dry-run", action="store_true", help="Plan nur ausgeben, nichts speichern")
+
+    def handle(self, *args, **options):
+        teams = self.lookup(Team, options["teams"], "Team")
+        venues = self.lookup(Venue, options["venues"], "Halle")
+        venue_names = {venue.pk: venue.name for venue in venues}
+        home_venues = {}
+        for entry in options["home_venue"]:
+            team_slug, _, venue_slug = entry.partition("=")
+            team = self.lookup(Team, [team_slug], "Team")[0]
+            venue = self.lookup(Venue, [venue_slug], "Halle")[0]
+            home_venues[team.pk] = venue.pk
+            venue_names[venue.pk] = venue.name
+
+        kwargs = {
+            "double": options["double"],
+            "kickoffs": options["kickoffs"],
+            "venues": venues,
+            "home_venues": home_venues,
+        }
+        interval = timedelta(days=options["interval_days"])
+        try:
+            if options["dry_run"]:
+                rounds = scheduling.round_robin([t.pk for t in teams], double=options["double"])
+                dates = scheduling.round_dates(options["first_day"], len(rounds), interval)
+                names = {t.pk: t.name for t in teams}
+                plan = scheduling.schedule(rounds, dates, kickoffs=kwargs["kickoffs"], venues=venues, home_venues=home_venues)
+                for round_no, home, away, venue, when in plan:
+                    when = timezone.localtime(when)
+                    self.stdout.write(f"{round_no:>3}. {when:%d.%m.%Y %H:%M}  {names[home]} - {names[away]}  {venue_names.get(venue, '')}")
+                return
+            fixtures = scheduling.create_season(
+                teams, options["first_day"], interval=interval, competition=options["competition"], **kwargs
+            )
+        except scheduling.ScheduleError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(f"{len(fixtures)} Spiele für {options['competition']} angelegt."))
+
+    @staticmethod
+    def lookup(model, slugs, label):
+        found = {obj.slug: obj for obj in model.objects.filter(slug__in=slugs)}
+        missing = [slug for slug in slugs if slug not in found]
+        if missing:
+            raise CommandError(f"{label} nicht gefunden: {', '.join(missing)}")
+        return [found[slug] for slug in slugs]
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from match import standings
+
+
+class Command(BaseCommand):
+    help = "Baut die Tabellen aus allen beendeten Spielen neu auf (Reparatur nach Importen oder queryset.update())."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--competition", help="nur diesen Wettbewerb neu aufbauen")
+
+    def handle(self, *args, **options):
+        rows = standings.rebuild(options["competition"])
+        self.stdout.write(self.style.SUCCESS(f"{rows} Tabellenzeilen neu aufgebaut."))
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('match', '0002_standing'),
+        ('team', '0008_message_team_message_keyset_idx'),
+        ('venue', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fixture',
+            index=models.Index(fields=['venue', 'datetime'], name='match_fixture_venue_time_idx'),
+        ),
+    ]
@@ -1,6 +1,12 @@
-from django.db import models
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
 from django.utils import timezone
 
+# how long a fixture occupies its venue and referee
+MATCH_DURATION = timedelta(minutes=getattr(settings, "MATCH_DURATION_MINUTES", 120))
+
 class Fixture(models.Model):
     home = models.ForeignKey("team.Team", related_name="home_fixtures", on_delete=models.CASCADE)
     away = models.ForeignKey("team.Team", related_name="away_fixtures", on_delete=models.CASCADE)
@@ -19,9 +25,49 @@ class Fixture(models.Model):
     additional_info = models.TextField(null=True, blank=True)
     slug = models.SlugField(unique=True)
     short_code = models.CharField(max_length=20, blank=True)
-    
+
+    class Meta:
+        indexes = [
+            # venue conflicts: WHERE venue = ? AND datetime BETWEEN ? AND ?
+            models.Index(fields=["venue", "datetime"], name="match_fixture_venue_time_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        # the standings receivers lock this row in pre_save and update the table in post_save
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def is_past(self):
         return self.datetime < timezone.now()
     
     def __str__(self):
-        return f"{self.home.name} vs {self.away.name} on {self.datetime.strftime('%Y-%m-%d %H:%M')}"
\ No newline at end of file
+        return f"{self.home.name} vs {self.away.name} on {self.datetime.strftime('%Y-%m-%d %H:%M')}"
+
+class Standing(models.Model):
+    """
+    Eine Tabellenzeile pro (Wettbewerb, Team). Wird bei jeder Ergebnisänderung
+    inkrementell fortgeschrieben (siehe match/standings.py).
+    """
+    competition = models.CharField(max_length=255)
+    team = models.ForeignKey("team.Team", related_name="standings", on_delete=models.CASCADE)
+    played = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+    draws = models.IntegerField(default=0)
+    losses = models.IntegerField(default=0)
+    goals_for = models.IntegerField(default=0)
+    goals_against = models.IntegerField(default=0)
+    points = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("competition", "team")
+        indexes = [
+            models.Index(fields=["competition", "-points"], name="match_standing_table_idx"),
+        ]
+
+    @property
+    def goal_difference(self):
+        return self.goals_for - self.goals_against
+
+    def __str__(self):
+        return f"{self.competition}: {self.team} ({self.points})"
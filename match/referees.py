@@ -0,0 +1,116 @@
+# match/referees.py
+"""
+Schiedsrichter-Einteilung für viele Spiele auf einmal (Spielwochenende, Monat).
+
+Die Spiele werden chronologisch in "Wellen" zerlegt: alle Spiele, die vor dem Ende
+des ersten Spiels der Welle anpfeifen, überschneiden sich paarweise - pro Welle darf
+ein Schiedsrichter also höchstens ein Spiel leiten. Jede Welle ist ein gewichtetes
+bipartites Matching (networkx.max_weight_matching):
+
+- jedes Spiel bekommt Kanten zu seinen Wunsch-Schiedsrichtern (referee_preferences)
+  und zu einigen der aktuell am wenigsten belasteten freien Schiedsrichter,
+- Gewicht = Zuteilung + Wunschbonus - Belastung; damit werden erst möglichst viele
+  Spiele besetzt, dann Wünsche erfüllt und die Arbeit gleichmäßig verteilt.
+
+Eingeteilt werden nur Schiedsrichter mit gültigem RefereeProfile (expires_at nach dem
+Spieltag); bereits bestehende Einteilungen zählen als belegt und als Belastung.
+"""
+from collections import defaultdict
+
+import networkx as nx
+from django.db import transaction
+
+from accounts.models import RefereeProfile
+from .models import Fixture, MATCH_DURATION
+
+CANDIDATES = 8  # least-loaded referees offered to each fixture besides its preferences
+
+WEIGHT_ASSIGNED = 10000
+WEIGHT_PREFERENCE = 100
+WEIGHT_LOAD = 10
+
+
+def _waves(fixtures):
+    """Zerlegt (nach Anpfiff sortierte) Spiele in Gruppen, die sich paarweise überschneiden."""
+    wave = []
+    for fixture in fixtures:
+        if wave and fixture[1] >= wave[0][1] + MATCH_DURATION:
+            yield wave
+            wave = []
+        wave.append(fixture)
+    if wave:
+        yield wave
+
+
+def plan_assignments(fixtures):
+    """
+    Berechnet die Einteilung, ohne zu speichern.
+    fixtures: Queryset der zu besetzenden Spiele
+    returns {fixture_id: referee_id} - Spiele ohne freien Schiedsrichter fehlen
+    """
+    rows = sorted(fixtures.values_list("id", "datetime"), key=lambda row: (row[1], row[0]))
+    if not rows:
+        return {}
+    ids = [fixture_id for fixture_id, _ in rows]
+    window_start, window_end = rows[0][1] - MATCH_DURATION, rows[-1][1] + MATCH_DURATION
+
+    valid_until = dict(
+        RefereeProfile.objects.filter(expires_at__gte=rows[0][1].date()).values_list("user_id", "expires_at")
+    )
+    preferences = defaultdict(list)
+    for fixture_id, user_id in Fixture.referee_preferences.through.objects.filter(
+        fixture_id__in=ids, customuser_id__in=valid_until
+    ).values_list("fixture_id", "customuser_id"):
+        preferences[fixture_id].append(user_id)
+
+    # existing assignments outside this batch: the referee is busy then and it counts as workload
+    load = dict.fromkeys(valid_until, 0)
+    busy = defaultdict(list)
+    for referee_id, start in (
+        Fixture.objects.filter(referee_id__in=valid_until, datetime__gt=window_start, datetime__lt=window_end)
+        .exclude(id__in=ids)
+        .values_list("referee_id", "datetime")
+    ):
+        load[referee_id] += 1
+        busy[referee_id].append(start)
+    busy_until = dict.fromkeys(valid_until, window_start)
+
+    def available(referee_id, start):
+        return (
+            valid_until[referee_id] >= start.date()
+            and busy_until[referee_id] <= start
+            and all(abs(other - start) >= MATCH_DURATION for other in busy[referee_id])
+        )
+
+    plan = {}
+    for wave in _waves(rows):
+        last_start = wave[-1][1]
+        pool = sorted((r for r in valid_until if busy_until[r] <= last_start), key=lambda r: (load[r], r))
+        graph = nx.Graph()
+        for i, (fixture_id, start) in enumerate(wave):
+            offered = {r: 0 for r in pool[i:i + CANDIDATES]}
+            offered.update({r: WEIGHT_PREFERENCE for r in preferences.get(fixture_id, ())})
+            for referee_id, bonus in offered.items():
+                if available(referee_id, start):
+                    weight = WEIGHT_ASSIGNED + bonus - WEIGHT_LOAD * load[referee_id]
+                    graph.add_edge(("f", fixture_id), ("r", referee_id), weight=weight)
+
+        starts = dict(wave)
+        for a, b in nx.max_weight_matching(graph, maxcardinality=True):
+            (_, fixture_id), (_, referee_id) = (a, b) if a[0] == "f" else (b, a)
+            plan[fixture_id] = referee_id
+            load[referee_id] += 1
+            busy_until[referee_id] = starts[fixture_id] + MATCH_DURATION
+    return plan
+
+
+def assign_referees(fixtures):
+    """Berechnet und speichert die Einteilung (ein bulk_update). returns {fixture_id: referee_id}"""
+    plan = plan_assignments(fixtures)
+    with transaction.atomic():
+        Fixture.objects.bulk_update(
+            [Fixture(id=fixture_id, referee_id=referee_id) for fixture_id, referee_id in plan.items()],
+            ["referee"],
+            batch_size=500,
+        )
+    return plan
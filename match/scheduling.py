@@ -0,0 +1,148 @@
+# match/scheduling.py
+"""
+Spielplan-Generator (Jeder gegen Jeden) nach der Kreismethode.
+
+- round_robin(): Paarungen pro Spieltag, einfach oder mit Hin- und Rückrunde.
+  Heim/Auswärts wird ausgeglichen (Differenz höchstens 1, bei Hin- und Rückrunde 0).
+- schedule(): verteilt die Paarungen auf Spieltage, Anstoßzeiten und Hallen, ohne
+  dass sich zwei Spiele (je MATCH_DURATION) in einer Halle überschneiden - auch
+  nicht mit bereits gespeicherten Fixtures oder Hallenbuchungen.
+- create_season(): speichert den ganzen Plan mit einem bulk_create.
+"""
+import uuid
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from venue.availability import bookings_between
+from .models import Fixture, MATCH_DURATION
+
+DEFAULT_KICKOFFS = (time(15, 0), time(17, 0), time(19, 0))
+
+
+class ScheduleError(ValueError):
+    pass
+
+
+def round_robin(team_ids, double=False):
+    """
+    Paarungen nach der Kreismethode: Position 0 bleibt stehen, alle anderen rotieren.
+    Bei ungerader Teamzahl steht der Spielfrei-Platz fest, sonst das erste Team.
+    Heimrecht: die Paarungen wechseln es nach ihrer Position ab, die Paarung mit
+    dem festen Platz von Spieltag zu Spieltag - bei ungerader Teamzahl hat so jedes
+    Team gleich viele Heim- und Auswärtsspiele, bei gerader höchstens eines mehr.
+    returns [[(home_id, away_id), ...], ...] - ein Eintrag pro Spieltag
+    """
+    teams = list(team_ids)
+    if len(teams) < 2:
+        raise ScheduleError("Für einen Spielplan werden mindestens zwei Teams benötigt.")
+    if len(set(teams)) != len(teams):
+        raise ScheduleError("Ein Team ist mehrfach angegeben.")
+    if len(teams) % 2:
+        teams.insert(0, None)  # spielfrei
+
+    n = len(teams)
+    rotating = teams[1:]
+    rounds = []
+    for round_no in range(n - 1):
+        circle = [teams[0]] + rotating
+        pairs = []
+        for i in range(n // 2):
+            a, b = circle[i], circle[n - 1 - i]
+            if a is None or b is None:
+                continue
+            # each team moves one position per round, so alternating by position
+            # also alternates its home games (no two in a row for odd leagues)
+            swap = round_no % 2 if i == 0 else i % 2
+            pairs.append((b, a) if swap else (a, b))
+        rounds.append(pairs)
+        rotating = rotating[-1:] + rotating[:-1]
+
+    if double:
+        rounds += [[(away, home) for home, away in pairs] for pairs in rounds]
+    return rounds
+
+
+def round_dates(first_day, count, interval=timedelta(days=7)):
+    return [first_day + interval * i for i in range(count)]
+
+
+def schedule(rounds, dates, kickoffs=DEFAULT_KICKOFFS, venues=None, home_venues=None):
+    """
+    Ordnet jeder Paarung Datum/Uhrzeit und Halle zu.
+
+    dates: ein Datum pro Spieltag
+    venues: Hallen-Pool; home_venues: optional {team_id: venue_id} (Heimhalle bevorzugt)
+    returns [(round_no, home_id, away_id, venue_id, datetime), ...]
+    """
+    if len(dates) < len(rounds):
+        raise ScheduleError(f"{len(rounds)} Spieltage, aber nur {len(dates)} Termine.")
+    home_venues = home_venues or {}
+    venue_ids = [getattr(v, "pk", v) for v in (venues or [])]
+    slots = []  # (round_no, [aware datetimes])
+    for round_no, day in enumerate(dates[:len(rounds)], start=1):
+        slots.append([timezone.make_aware(datetime.combine(day, kickoff)) for kickoff in kickoffs])
+
+    # venue_id -> [(start, end)]: stored fixtures and bookings, then the planned games
+    busy = {}
+    pool = set(venue_ids) | set(home_venues.values())
+    if pool:
+        window_start, window_end = slots[0][0], slots[-1][-1] + MATCH_DURATION
+        for venue_id, start in Fixture.objects.filter(
+            venue_id__in=pool, datetime__gt=window_start - MATCH_DURATION, datetime__lt=window_end
+        ).values_list("venue_id", "datetime"):
+            busy.setdefault(venue_id, []).append((start, start + MATCH_DURATION))
+        for venue_id, start, end in bookings_between(window_start, window_end).filter(
+            venue_id__in=pool
+        ).values_list("venue_id", "start", "end"):
+            busy.setdefault(venue_id, []).append((start, end))
+
+    def is_free(venue_id, start):
+        end = start + MATCH_DURATION
+        return all(end <= other_start or start >= other_end for other_start, other_end in busy.get(venue_id, ()))
+
+    plan = []
+    for round_no, (pairs, times) in enumerate(zip(rounds, slots), start=1):
+        if not venue_ids and not home_venues:
+            plan.extend((round_no, home, away, None, times[0]) for home, away in pairs)
+            continue
+        for home, away in pairs:
+            preferred = home_venues.get(home)
+            candidates = ([preferred] if preferred else []) + [v for v in venue_ids if v != preferred]
+            slot = next(((v, t) for v in candidates for t in times if is_free(v, t)), None)
+            if slot is None:
+                raise ScheduleError(f"Spieltag {round_no}: nicht genug freie Hallenzeiten.")
+            busy.setdefault(slot[0], []).append((slot[1], slot[1] + MATCH_DURATION))
+            plan.append((round_no, home, away, slot[0], slot[1]))
+    return plan
+
+
+def create_season(teams, first_day, double=False, interval=timedelta(days=7), dates=None,
+                  kickoffs=DEFAULT_KICKOFFS, venues=None, home_venues=None, competition=""):
+    """
+    Erzeugt und speichert einen kompletten Spielplan (ein bulk_create).
+    returns die angelegten Fixtures
+    """
+    team_ids = [getattr(t, "pk", t) for t in teams]
+    rounds = round_robin(team_ids, double=double)
+    dates = dates or round_dates(first_day, len(rounds), interval)
+    plan = schedule(rounds, dates, kickoffs=kickoffs, venues=venues, home_venues=home_venues)
+
+    prefix = slugify(competition) or "spiel"
+    batch = uuid.uuid4().hex[:6]
+    fixtures = [
+        Fixture(
+            home_id=home,
+            away_id=away,
+            venue_id=venue,
+            datetime=when,
+            competition=competition,
+            round=str(round_no),
+            slug=f"{prefix}-{batch}-{round_no}-{home}-{away}",
+        )
+        for round_no, home, away, venue, when in plan
+    ]
+    with transaction.atomic():
+        return Fixture.objects.bulk_create(fixtures, batch_size=500)
@@ -0,0 +1,42 @@
+# match/signals.py
+from django.db.models.signals import pre_delete, pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Fixture
+from . import standings
+
+
+# ------------------------------------------------------------------
+# Tabellen inkrementell fortschreiben
+# ------------------------------------------------------------------
+@receiver(pre_save, sender=Fixture)
+@receiver(pre_delete, sender=Fixture)
+def lock_standings_key(sender, instance, raw=False, **kwargs):
+    # lock the row and take back what is stored, not what this (maybe stale)
+    # instance was loaded with; Fixture.save()/delete() run in a transaction
+    if raw or instance.pk is None or instance._state.adding:
+        instance._standings_key = None
+        return
+    instance._standings_key = (
+        Fixture.objects.select_for_update().filter(pk=instance.pk).values_list(*standings.KEY_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=Fixture)
+def update_standings(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    new_key = standings.fixture_key(instance)
+    if created:
+        standings.fixture_changed(None, new_key)
+    elif instance._standings_key is None:
+        # previous state unknown: repair the affected table
+        standings.rebuild(instance.competition)
+    else:
+        standings.fixture_changed(instance._standings_key, new_key)
+    instance._standings_key = new_key
+
+
+@receiver(post_delete, sender=Fixture)
+def remove_from_standings(sender, instance, **kwargs):
+    standings.fixture_changed(instance._standings_key or standings.fixture_key(instance), None)
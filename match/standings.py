@@ -0,0 +1,132 @@
+# match/standings.py
+"""
+Tabellen aus Fixture-Ergebnissen.
+
+Jedes beendete Spiel mit Ergebnis trägt zu zwei Standing-Zeilen bei. Ändert sich
+ein Fixture (Status, Ergebnis, Wettbewerb, Teams), wird der alte Beitrag abgezogen
+und der neue addiert (F-Ausdrücke, zwei UPDATEs pro Seite) - es wird nie über alle
+Spiele neu gerechnet. Der alte Beitrag kommt aus der gesperrten Fixture-Zeile
+(pre_save/pre_delete in match/signals.py), nicht aus einer evtl. veralteten
+Instanz. rebuild() baut die Tabellen zur Reparatur komplett neu auf.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Fixture, Standing
+
+FINISHED = "finished"
+POINTS_WIN = getattr(settings, "STANDINGS_POINTS_WIN", 2)
+POINTS_DRAW = getattr(settings, "STANDINGS_POINTS_DRAW", 1)
+COUNTERS = ("played", "wins", "draws", "losses", "goals_for", "goals_against", "points")
+# fields of fixture_key(), in order
+KEY_FIELDS = ("competition", "status", "home_id", "away_id", "result_home", "result_away")
+
+
+def fixture_key(fixture):
+    """Alles, was den Tabellenbeitrag eines Spiels bestimmt."""
+    return (
+        fixture.competition,
+        fixture.status,
+        fixture.home_id,
+        fixture.away_id,
+        fixture.result_home,
+        fixture.result_away,
+    )
+
+
+def contribution(key):
+    """returns {team_id: {counter: delta}} - leer, solange das Spiel nicht gewertet wird"""
+    competition, status, home, away, goals_home, goals_away = key
+    if status != FINISHED or not competition or goals_home is None or goals_away is None:
+        return {}
+
+    def row(scored, conceded):
+        win, draw = scored > conceded, scored == conceded
+        return {
+            "played": 1,
+            "wins": int(win),
+            "draws": int(draw),
+            "losses": int(not win and not draw),
+            "goals_for": scored,
+            "goals_against": conceded,
+            "points": POINTS_WIN if win else POINTS_DRAW if draw else 0,
+        }
+
+    return {home: row(goals_home, goals_away), away: row(goals_away, goals_home)}
+
+
+def _apply(competition, rows, sign):
+    Standing.objects.bulk_create(
+        [Standing(competition=competition, team_id=team_id) for team_id in rows], ignore_conflicts=True
+    )
+    now = timezone.now()
+    for team_id, deltas in rows.items():
+        # .update() skips auto_now
+        Standing.objects.filter(competition=competition, team_id=team_id).update(
+            updated_at=now, **{name: F(name) + sign * value for name, value in deltas.items()}
+        )
+
+
+def fixture_changed(old_key, new_key):
+    """Schreibt die Tabelle fort: alten Beitrag abziehen, neuen addieren."""
+    if old_key == new_key:
+        return
+    old, new = contribution(old_key) if old_key else {}, contribution(new_key) if new_key else {}
+    if not old and not new:
+        return
+    with transaction.atomic():
+        if old:
+            _apply(old_key[0], old, -1)
+        if new:
+            _apply(new_key[0], new, +1)
+
+
+def rebuild(competition=None):
+    """Baut die Tabellen (eines oder aller Wettbewerbe) aus allen beendeten Spielen neu auf."""
+    fixtures = Fixture.objects.filter(status=FINISHED).exclude(competition="")
+    standings = Standing.objects.all()
+    if competition is not None:
+        fixtures = fixtures.filter(competition=competition)
+        standings = standings.filter(competition=competition)
+
+    totals = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    for key in fixtures.values_list(*KEY_FIELDS).iterator():
+        for team_id, deltas in contribution(key).items():
+            row = totals[(key[0], team_id)]
+            for name, value in deltas.items():
+                row[name] += value
+
+    with transaction.atomic():
+        standings.delete()
+        Standing.objects.bulk_create(
+            [Standing(competition=comp, team_id=team_id, **row) for (comp, team_id), row in totals.items()],
+            batch_size=500,
+        )
+    return len(totals)
+
+
+def table(competition):
+    """Tabelle sortiert nach Punkten, Tordifferenz, Toren."""
+    return (
+        Standing.objects.filter(competition=competition)
+        .select_related("team")
+        .annotate(diff=F("goals_for") - F("goals_against"))
+        .order_by("-points", "-diff", "-goals_for", "team__name")
+    )
+
+
+def current_competition(team):
+    """Wettbewerb des letzten gewerteten Spiels des Teams (oder None)."""
+    return (
+        Fixture.objects.filter(Q(home=team) | Q(away=team), status=FINISHED)
+        .exclude(competition="")
+        .exclude(result_home=None)
+        .exclude(result_away=None)
+        .order_by("-datetime")
+        .values_list("competition", flat=True)
+        .first()
+    )
@@ -1,3 +1,133 @@
-from django.test import TestCase
+from collections import Counter
+from io import StringIO
+from datetime import date, datetime, time
+from itertools import combinations
 
-# Create your tests here.
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from accounts.models import Sport
+from club.models import Club
+from team.models import AgeGroup, Team
+from venue.models import Venue
+from . import standings
+from .models import Fixture, Standing
+from .scheduling import round_robin, schedule
+
+
+class RoundRobinTests(SimpleTestCase):
+    def check(self, size, double):
+        teams = list(range(1, size + 1))
+        rounds = round_robin(teams, double=double)
+        games = [pair for pairs in rounds for pair in pairs]
+
+        self.assertEqual(len(rounds), (size - 1 + size % 2) * (2 if double else 1))
+        for pairs in rounds:
+            playing = [team for pair in pairs for team in pair]
+            self.assertEqual(len(playing), len(set(playing)))
+        meetings = Counter(frozenset(pair) for pair in games)
+        self.assertEqual(set(meetings), {frozenset(pair) for pair in combinations(teams, 2)})
+        self.assertEqual(set(meetings.values()), {2 if double else 1})
+
+        home = Counter(h for h, _ in games)
+        away = Counter(a for _, a in games)
+        allowed = 0 if double or size % 2 else 1
+        for team in teams:
+            self.assertLessEqual(abs(home[team] - away[team]), allowed, (size, double, team))
+
+    def test_home_away_balance(self):
+        for size in range(2, 17):
+            for double in (False, True):
+                with self.subTest(size=size, double=double):
+                    self.check(size, double)
+
+
+class StandingsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        club = Club.objects.create(name="TV Tabelle", slug="tv-tabelle")
+        sport = Sport.objects.create(name="Handball")
+        age_group = AgeGroup.objects.create(name="Senioren")
+        cls.home, cls.away = [
+            Team.objects.create(name=name, club=club, slug=name.lower(), sport=sport, age_group=age_group)
+            for name in ("Heim", "Gast")
+        ]
+
+    def fixture(self, slug, day, competition="Liga", **result):
+        return Fixture.objects.create(
+            home=self.home, away=self.away, slug=slug, competition=competition,
+            datetime=timezone.make_aware(datetime(2026, 9, day, 18)), **result,
+        )
+
+    def rows(self):
+        return set(Standing.objects.exclude(played=0).values_list("competition", "team_id", *standings.COUNTERS))
+
+    def assert_matches_rebuild(self):
+        incremental = self.rows()
+        standings.rebuild()
+        self.assertEqual(incremental, self.rows())
+
+    def test_results_update_table_and_stale_instances_do_not_double_count(self):
+        game = self.fixture("g1", 1)
+        first, second = Fixture.objects.get(pk=game.pk), Fixture.objects.get(pk=game.pk)
+        first.status, first.result_home, first.result_away = "finished", 30, 25
+        first.save()
+        # loaded before the first save: must take back 30:25, not "nothing"
+        second.status, second.result_home, second.result_away = "finished", 20, 20
+        second.save()
+        home = Standing.objects.get(competition="Liga", team=self.home)
+        self.assertEqual((home.played, home.draws, home.points, home.goals_for), (1, 1, 1, 20))
+        self.assert_matches_rebuild()
+
+        first.delete()
+        self.assertFalse(Standing.objects.exclude(played=0).exists())
+        self.assert_matches_rebuild()
+
+    def test_current_competition_is_the_last_one_played(self):
+        self.assertIsNone(standings.current_competition(self.home))
+        self.fixture("pokal", 20, "Pokal", status="finished", result_home=1, result_away=0)
+        self.fixture("liga", 10, status="finished", result_home=2, result_away=0)
+        self.fixture("liga-2", 27, status="scheduled")
+        self.assertEqual(standings.current_competition(self.home), "Pokal")
+        self.assertEqual(standings.current_competition(self.away), "Pokal")
+
+
+class ScheduleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        club = Club.objects.create(name="TV Plan", slug="tv-plan")
+        sport = Sport.objects.create(name="Handball")
+        age_group = AgeGroup.objects.create(name="Senioren")
+        cls.teams = [
+            Team.objects.create(name=f"Team {i}", club=club, slug=f"plan-{i}", sport=sport, age_group=age_group)
+            for i in range(4)
+        ]
+        cls.venue = Venue.objects.create(name="Halle", slug="halle")
+        cls.day = date(2026, 9, 5)
+
+    def test_stored_fixture_blocks_overlapping_kickoffs(self):
+        # 16:00-18:00 overlaps both the 15:00 and the 17:00 slot
+        Fixture.objects.create(
+            home=self.teams[2], away=self.teams[3], venue=self.venue, slug="stored",
+            datetime=timezone.make_aware(datetime.combine(self.day, time(16, 0))),
+        )
+        rounds = [[(self.teams[0].pk, self.teams[1].pk)]]
+        plan = schedule(rounds, [self.day], venues=[self.venue])
+        self.assertEqual(timezone.localtime(plan[0][4]).time(), time(19, 0))
+
+    def test_planned_games_do_not_overlap_each_other(self):
+        rounds = [[(self.teams[0].pk, self.teams[1].pk), (self.teams[2].pk, self.teams[3].pk)]]
+        plan = schedule(rounds, [self.day], kickoffs=(time(15, 0), time(16, 0), time(17, 0)), venues=[self.venue])
+        self.assertEqual([timezone.localtime(when).time() for *_, when in plan], [time(15, 0), time(17, 0)])
+
+    def test_create_season_command(self):
+        slugs = [team.slug for team in self.teams[:3]]
+        args = ["--competition", "Kreisliga", "--first-day", "2026-09-05", "--venues", "halle", "--double"]
+        call_command("create_season", *args, "--teams", *slugs, stdout=StringIO())
+        fixtures = Fixture.objects.filter(competition="Kreisliga")
+        self.assertEqual(fixtures.count(), 6)
+        self.assertEqual(set(fixtures.values_list("venue", flat=True)), {self.venue.pk})
+
+        with self.assertRaises(CommandError):
+            call_command("create_season", *args, "--teams", slugs[0], "unbekannt", stdout=StringIO())
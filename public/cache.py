@@ -0,0 +1,38 @@
+# core/cache.py
+"""
+Fragment- und Seiten-Cache für die öffentlichen Seiten.
+
+Die Blöcke "Sportarten" und "Neueste Teams" sowie die komplette Startseite für
+anonyme Besucher liegen ohne Ablaufzeit im Cache ``public`` und werden über
+post_save/post_delete-Signale auf Team, Club und Sport nach dem Commit verworfen
+(siehe signals.py).
+"""
+from django.core.cache import caches
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+CACHE_ALIAS = "public"
+
+SPORTS_MENU_KEY = "public:home:sports_menu"
+LATEST_TEAMS_KEY = "public:home:latest_teams"
+HOME_ANONYMOUS_KEY = "public:home:anonymous"
+
+HOME_KEYS = (SPORTS_MENU_KEY, LATEST_TEAMS_KEY, HOME_ANONYMOUS_KEY)
+
+
+def public_cache():
+    return caches[CACHE_ALIAS]
+
+
+def cached_fragment(key, template_name, context_fn):
+    """HTML eines Template-Fragments aus dem Cache oder frisch gerendert (und gespeichert)."""
+    cache = public_cache()
+    html = cache.get(key)
+    if html is None:
+        html = render_to_string(template_name, context_fn())
+        cache.set(key, html, timeout=None)
+    return mark_safe(html)
+
+
+def invalidate_home():
+    public_cache().delete_many(HOME_KEYS)
@@ -0,0 +1,105 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Q
+
+from accounts.models import Sport
+from club.models import Club
+from team.models import Team, AgeGroup
+from public import search
+from public.views import SEARCH_PAGE_SIZE
+
+WORDS = [
+    "Handball", "Sport", "Verein", "Turn", "Eintracht", "Borussia", "Union", "Fortuna",
+    "Germania", "Victoria", "Concordia", "Alemannia", "Rot", "Weiss", "Blau", "Gelb",
+    "Nord", "Sued", "Ost", "West", "Stadt", "Land", "Berg", "Tal", "Hafen", "Wald",
+]
+CITIES = [
+    "Berlin", "Hamburg", "Muenchen", "Koeln", "Frankfurt", "Stuttgart", "Dortmund", "Essen",
+    "Leipzig", "Bremen", "Dresden", "Hannover", "Nuernberg", "Kiel", "Flensburg", "Magdeburg",
+]
+QUERIES = ["Eintracht", "ham", "Handball Kiel", "Borussia Dort", "A-Jugend", "xyz"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Vergleicht die alte icontains-Suche mit dem Suchindex auf synthetischen Daten. "
+        "Alle Daten werden in einer Transaktion angelegt und am Ende zurückgerollt."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--teams", type=int, default=50000)
+        parser.add_argument("--clubs", type=int, default=2000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options["teams"], options["clubs"])
+            self.run(options["repeat"])
+            transaction.set_rollback(True)
+
+    def seed(self, n_teams, n_clubs):
+        rnd = random.Random(42)
+        sports = [Sport.objects.create(name=f"Bench {n}") for n in ("Handball", "Fussball", "Volleyball")]
+        age_groups = [AgeGroup.objects.create(name=f"Bench {n}", order=i) for i, n in enumerate(("A-Jugend", "B-Jugend", "Senioren"))]
+
+        clubs = Club.objects.bulk_create([
+            Club(
+                name=f"{rnd.choice(WORDS)} {rnd.choice(WORDS)} {rnd.choice(CITIES)} {i}",
+                address=f"{rnd.choice(WORDS)}strasse {i}, {rnd.choice(CITIES)}",
+                slug=f"bench-club-{i}",
+            )
+            for i in range(n_clubs)
+        ], batch_size=1000)
+        Team.objects.bulk_create([
+            Team(
+                name=f"{rnd.choice(WORDS)} {rnd.choice(CITIES)} {i}",
+                club=rnd.choice(clubs),
+                sport=rnd.choice(sports),
+                age_group=rnd.choice(age_groups),
+                slug=f"bench-team-{i}",
+            )
+            for i in range(n_teams)
+        ], batch_size=1000)
+
+        started = time.perf_counter()
+        search.index_clubs(Club.objects.filter(slug__startswith="bench-club-"))
+        search.index_teams(Team.objects.filter(slug__startswith="bench-team-"))
+        self.stdout.write(f"Index für {n_teams} Teams / {n_clubs} Vereine aufgebaut in {time.perf_counter() - started:.2f}s")
+
+    def legacy(self, query):
+        teams = list(
+            Team.objects.filter(
+                Q(name__icontains=query)
+                | Q(club__name__icontains=query)
+                | Q(sport__name__icontains=query)
+                | Q(age_group__name__icontains=query)
+            )
+            .select_related("club", "age_group", "sport")
+            .order_by("name")
+        )
+        clubs = list(Club.objects.filter(Q(name__icontains=query) | Q(address__icontains=query)).order_by("name"))
+        return len(teams) + len(clubs)
+
+    def indexed(self, query):
+        teams = Paginator(search.search_teams(query), SEARCH_PAGE_SIZE).get_page(1)
+        clubs = Paginator(search.search_clubs(query), SEARCH_PAGE_SIZE).get_page(1)
+        return teams.paginator.count + clubs.paginator.count
+
+    def run(self, repeat):
+        self.stdout.write(f"{'Suchbegriff':<20}{'icontains':>14}{'Index':>14}{'Treffer alt/neu':>20}")
+        for query in QUERIES:
+            timings = {}
+            hits = {}
+            for name, fn in (("legacy", self.legacy), ("indexed", self.indexed)):
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    hits[name] = fn(query)
+                timings[name] = (time.perf_counter() - started) / repeat * 1000
+            self.stdout.write(
+                f"{query:<20}{timings['legacy']:>12.1f}ms{timings['indexed']:>12.1f}ms"
+                f"{hits['legacy']:>10}/{hits['indexed']}"
+            )
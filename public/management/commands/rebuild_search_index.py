@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from public.models import SearchDocument
+from public.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Baut die Suchdokumente für alle Teams und Vereine neu auf."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rebuild_index(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{SearchDocument.objects.count()} Suchdokumente indexiert."))
@@ -0,0 +1,95 @@
+from django.db import migrations
+
+FTS_TABLE = "public_searchdocument_fts"
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS public_searchdoc_tsv_idx ON public_searchdocument "
+    "USING gin (to_tsvector('simple', document))",
+    "CREATE INDEX IF NOT EXISTS public_searchdoc_trgm_idx ON public_searchdocument "
+    "USING gin (document gin_trgm_ops)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS public_searchdoc_trgm_idx",
+    "DROP INDEX IF EXISTS public_searchdoc_tsv_idx",
+]
+
+# external-content FTS5 table, kept in sync with public_searchdocument by triggers
+SQLITE_FORWARD = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, document, content='public_searchdocument', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON public_searchdocument BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, document) VALUES (new.id, new.title, new.document); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON public_searchdocument BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, document) VALUES ('delete', old.id, old.title, old.document); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON public_searchdocument BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, document) VALUES ('delete', old.id, old.title, old.document); "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, document) VALUES (new.id, new.title, new.document); END",
+]
+SQLITE_BACKWARD = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def _run(schema_editor, statements):
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        _run(schema_editor, POSTGRES_FORWARD)
+    elif vendor == "sqlite":
+        _run(schema_editor, SQLITE_FORWARD)
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        _run(schema_editor, POSTGRES_BACKWARD)
+    elif vendor == "sqlite":
+        _run(schema_editor, SQLITE_BACKWARD)
+
+
+def populate_documents(apps, schema_editor):
+    SearchDocument = apps.get_model("public", "SearchDocument")
+    Team = apps.get_model("team", "Team")
+    Club = apps.get_model("club", "Club")
+
+    docs = []
+    for club in Club.objects.all().iterator():
+        docs.append(SearchDocument(
+            kind="club", object_id=club.pk, title=club.name,
+            document=" ".join(p for p in (club.name, club.address) if p),
+        ))
+    for team in Team.objects.select_related("club", "sport", "age_group").iterator():
+        parts = [
+            team.name,
+            team.club.name if team.club_id else "",
+            team.sport.name if team.sport_id else "",
+            team.age_group.name if team.age_group_id else "",
+        ]
+        docs.append(SearchDocument(
+            kind="team", object_id=team.pk, title=team.name,
+            document=" ".join(p for p in parts if p),
+        ))
+    SearchDocument.objects.bulk_create(docs, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('public', '0001_initial'),
+        ('team', '0007_alter_trainingevent_unique_together'),
+        ('club', '0002_club_sport'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+        migrations.RunPython(populate_documents, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,24 @@
 from django.db import models
 
-# Create your models here.
+
+class SearchDocument(models.Model):
+    """
+    Denormalisiertes Suchdokument pro Team / Club (siehe public/search.py).
+    Wird über Signals aktuell gehalten; die Volltext-Indizes (pg_trgm/tsvector bzw.
+    SQLite FTS5) werden in der Migration datenbankspezifisch angelegt.
+    """
+    KIND_TEAM = "team"
+    KIND_CLUB = "club"
+    KIND_CHOICES = ((KIND_TEAM, "Team"), (KIND_CLUB, "Club"))
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    title = models.CharField(max_length=255)
+    document = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("kind", "object_id")
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
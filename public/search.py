@@ -0,0 +1,218 @@
+# core/search.py
+"""
+Suche über Teams und Vereine.
+
+Jedes Team / jeder Club hat ein SearchDocument (Name, Verein, Sportart, Altersklasse bzw.
+Name + Adresse). Gesucht wird datenbankspezifisch:
+
+- PostgreSQL: tsvector (GIN) mit Präfix-Abfrage ``term:*`` plus pg_trgm für Teilwörter
+- SQLite: FTS5-Tabelle ``public_searchdocument_fts`` (per Trigger synchron) mit ``"term"*``
+  plus LIKE für Teilwörter
+- sonst: icontains über das Suchdokument
+"""
+import re
+
+from django.db import connection
+
+from .models import SearchDocument
+
+FTS_TABLE = "public_searchdocument_fts"
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+# ------------------------------------------------------------------
+# Dokumente aufbauen / indexieren
+# ------------------------------------------------------------------
+def team_document(team):
+    parts = [
+        team.name,
+        team.club.name if team.club_id else "",
+        team.sport.name if team.sport_id else "",
+        team.age_group.name if team.age_group_id else "",
+    ]
+    return SearchDocument(
+        kind=SearchDocument.KIND_TEAM,
+        object_id=team.pk,
+        title=team.name,
+        document=" ".join(p for p in parts if p),
+    )
+
+
+def club_document(club):
+    return SearchDocument(
+        kind=SearchDocument.KIND_CLUB,
+        object_id=club.pk,
+        title=club.name,
+        document=" ".join(p for p in (club.name, club.address) if p),
+    )
+
+
+def save_documents(documents, batch_size=1000):
+    """Upsert der Dokumente in einem bulk-Statement pro Batch."""
+    SearchDocument.objects.bulk_create(
+        documents,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["kind", "object_id"],
+        update_fields=["title", "document", "updated_at"],
+    )
+
+
+def index_teams(queryset, batch_size=1000):
+    queryset = queryset.select_related("club", "sport", "age_group").order_by("pk")
+    batch = []
+    for team in queryset.iterator(chunk_size=batch_size):
+        batch.append(team_document(team))
+        if len(batch) >= batch_size:
+            save_documents(batch, batch_size)
+            batch = []
+    if batch:
+        save_documents(batch, batch_size)
+
+
+def index_clubs(queryset, batch_size=1000):
+    batch = []
+    for club in queryset.order_by("pk").iterator(chunk_size=batch_size):
+        batch.append(club_document(club))
+        if len(batch) >= batch_size:
+            save_documents(batch, batch_size)
+            batch = []
+    if batch:
+        save_documents(batch, batch_size)
+
+
+def remove_document(kind, object_id):
+    SearchDocument.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def rebuild_index(batch_size=1000):
+    from team.models import Team
+    from club.models import Club
+
+    SearchDocument.objects.all().delete()
+    index_clubs(Club.objects.all(), batch_size)
+    index_teams(Team.objects.all(), batch_size)
+
+
+# ------------------------------------------------------------------
+# Abfragen
+# ------------------------------------------------------------------
+def tokenize(query):
+    return [t.lower() for t in TOKEN_RE.findall(query or "")]
+
+
+def like_pattern(query):
+    escaped = query.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class SearchResults:
+    """
+    Ranglisten-Ergebnis einer Suche für genau eine Art (Team oder Club).
+    Implementiert count() und Slicing, damit django.core.paginator.Paginator
+    nur die aktuelle Seite aus der Datenbank holt.
+    """
+
+    def __init__(self, query, kind):
+        self.query = query
+        self.kind = kind
+        self.tokens = tokenize(query)
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            self._count = self._backend_count() if self.tokens else 0
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, k):
+        if not isinstance(k, slice):
+            return self[k:k + 1][0]
+        start = k.start or 0
+        stop = k.stop if k.stop is not None else self.count()
+        if not self.tokens or stop <= start:
+            return []
+        ids = self._backend_ids(start, stop - start)
+        return self._load_objects(ids)
+
+    # -- backends -----------------------------------------------------
+    def _vendor(self):
+        return connection.vendor
+
+    def _backend_count(self):
+        sql, params = self._match_sql()
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM ({sql}) AS matches", params)
+            return cursor.fetchone()[0]
+
+    def _backend_ids(self, offset, limit):
+        sql, params = self._match_sql(ranked=True)
+        with connection.cursor() as cursor:
+            cursor.execute(f"{sql} LIMIT %s OFFSET %s", [*params, limit, offset])
+            return [row[0] for row in cursor.fetchall()]
+
+    def _match_sql(self, ranked=False):
+        table = SearchDocument._meta.db_table
+        vendor = self._vendor()
+
+        if vendor == "postgresql":
+            tsquery = " & ".join(f"{t}:*" for t in self.tokens)
+            sql = (
+                f"SELECT d.object_id FROM {table} d "
+                "WHERE d.kind = %s AND (to_tsvector('simple', d.document) @@ to_tsquery('simple', %s) "
+                "OR d.document ILIKE %s)"
+            )
+            params = [self.kind, tsquery, like_pattern(self.query)]
+            if ranked:
+                sql += (
+                    " ORDER BY ts_rank(to_tsvector('simple', d.document), to_tsquery('simple', %s)) "
+                    "+ similarity(d.document, %s) DESC, d.title"
+                )
+                params += [tsquery, self.query.strip()]
+            return sql, params
+
+        if vendor == "sqlite":
+            match = " ".join(f'"{t}"*' for t in self.tokens)
+            # FTS prefix hits first (bm25), then plain substring hits - same results as
+            # the tsquery + ILIKE combination on PostgreSQL
+            sql = (
+                f"SELECT d.object_id FROM {table} d LEFT JOIN ("
+                f"SELECT rowid, bm25({FTS_TABLE}, 5.0, 1.0) AS rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+                ") f ON f.rowid = d.id "
+                "WHERE d.kind = %s AND (f.rowid IS NOT NULL OR d.document LIKE %s ESCAPE '\\')"
+            )
+            params = [match, self.kind, like_pattern(self.query)]
+            if ranked:
+                sql += " ORDER BY f.rank IS NULL, f.rank, d.title"
+            return sql, params
+
+        # generic fallback: every token must appear somewhere in the document
+        sql = f"SELECT d.object_id FROM {table} d WHERE d.kind = %s"
+        params = [self.kind]
+        for t in self.tokens:
+            sql += " AND LOWER(d.document) LIKE %s"
+            params.append(f"%{t}%")
+        if ranked:
+            sql += " ORDER BY d.title"
+        return sql, params
+
+    def _load_objects(self, ids):
+        from team.models import Team
+        from club.models import Club
+
+        if self.kind == SearchDocument.KIND_TEAM:
+            objects = Team.objects.select_related("club", "age_group", "sport").in_bulk(ids)
+        else:
+            objects = Club.objects.in_bulk(ids)
+        # keep rank order, skip documents whose object vanished in the meantime
+        return [objects[i] for i in ids if i in objects]
+
+
+def search_teams(query):
+    return SearchResults(query, SearchDocument.KIND_TEAM)
+
+
+def search_clubs(query):
+    return SearchResults(query, SearchDocument.KIND_CLUB)
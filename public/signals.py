@@ -0,0 +1,79 @@
+# core/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from accounts.models import Sport
+from club.models import Club
+from team.models import Team, AgeGroup
+from .models import SearchDocument
+from . import search
+from .cache import invalidate_home
+
+
+# ------------------------------------------------------------------
+# Suchdokumente aktuell halten
+# ------------------------------------------------------------------
+@receiver(post_save, sender=Team)
+def index_team(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    search.save_documents([search.team_document(instance)])
+
+
+@receiver(post_delete, sender=Team)
+def unindex_team(sender, instance, **kwargs):
+    search.remove_document(SearchDocument.KIND_TEAM, instance.pk)
+
+
+@receiver(post_save, sender=Club)
+def index_club(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    search.save_documents([search.club_document(instance)])
+    # club name is part of every team document
+    search.index_teams(Team.objects.filter(club=instance))
+
+
+@receiver(post_delete, sender=Club)
+def unindex_club(sender, instance, **kwargs):
+    search.remove_document(SearchDocument.KIND_CLUB, instance.pk)
+
+
+@receiver(post_save, sender=Sport)
+@receiver(post_save, sender=AgeGroup)
+def reindex_teams_of_lookup(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    field = "sport" if sender is Sport else "age_group"
+    search.index_teams(Team.objects.filter(**{field: instance}))
+
+
+@receiver(pre_delete, sender=Sport)
+@receiver(pre_delete, sender=AgeGroup)
+def remember_teams_of_lookup(sender, instance, **kwargs):
+    # the FK is SET_NULL'ed with a plain UPDATE, so no Team signal fires
+    field = "sport" if sender is Sport else "age_group"
+    instance._search_team_ids = list(Team.objects.filter(**{field: instance}).values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Sport)
+@receiver(post_delete, sender=AgeGroup)
+def reindex_teams_after_lookup_delete(sender, instance, **kwargs):
+    team_ids = getattr(instance, "_search_team_ids", None)
+    if team_ids:
+        search.index_teams(Team.objects.filter(pk__in=team_ids))
+
+
+# ------------------------------------------------------------------
+# Startseiten-Cache verwerfen
+# ------------------------------------------------------------------
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+@receiver(post_save, sender=Club)
+@receiver(post_delete, sender=Club)
+@receiver(post_save, sender=Sport)
+@receiver(post_delete, sender=Sport)
+def invalidate_home_cache(sender, **kwargs):
+    # after the commit: dropped earlier, a concurrent request could re-cache the old page
+    transaction.on_commit(invalidate_home)
@@ -1,3 +1,45 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from accounts.models import Sport
+from club.models import Club
+from team.models import AgeGroup, Team
+
+from .cache import HOME_ANONYMOUS_KEY, public_cache
+from .search import search_clubs, search_teams
+from .views import SEARCH_PAGE_SIZE
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        sport = Sport.objects.create(name="Handball")
+        age_group = AgeGroup.objects.create(name="Senioren")
+        for i in range(SEARCH_PAGE_SIZE + 5):
+            club = Club.objects.create(name=f"TV Suche {i}", slug=f"tv-suche-{i}")
+            Team.objects.create(name=f"Herren {i}", club=club, slug=f"herren-{i}", sport=sport, age_group=age_group)
+
+    def test_prefix_and_substring_matches(self):
+        self.assertEqual(search_teams("herr").count(), SEARCH_PAGE_SIZE + 5)
+        self.assertEqual(search_teams("erren").count(), SEARCH_PAGE_SIZE + 5)
+        self.assertEqual([t.name for t in search_teams("Herren 3")[:1]], ["Herren 3"])
+        self.assertEqual(search_clubs("uche").count(), SEARCH_PAGE_SIZE + 5)
+        self.assertEqual(search_teams("100%").count(), 0)
+
+    def test_page_links_keep_the_other_list_page(self):
+        response = self.client.get(reverse("search"), {"q": "suche", "page": 2, "club_page": 2}, HTTP_HOST="localhost")
+        self.assertContains(response, "?q=suche&page=1&club_page=2")
+        self.assertContains(response, "?q=suche&page=2&club_page=1")
+
+
+@override_settings(CACHES={
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "public": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "public-tests"},
+})
+class HomeCacheTests(TestCase):
+    def test_home_is_dropped_after_the_commit(self):
+        public_cache().set(HOME_ANONYMOUS_KEY, "alt", timeout=None)
+        with self.captureOnCommitCallbacks(execute=True):
+            Club.objects.create(name="TV Neu", slug="tv-neu")
+            self.assertEqual(public_cache().get(HOME_ANONYMOUS_KEY), "alt")
+        self.assertIsNone(public_cache().get(HOME_ANONYMOUS_KEY))
@@ -1,8 +1,22 @@
 # core/views.py
 from django.shortcuts import render
-from django.db.models import Q
+from django.http import HttpResponse
+from django.core.paginator import Paginator
+from django.template.loader import render_to_string
+from accounts.models import Sport
 from team.models import Team
-from club.models import Club
+from .cache import public_cache, cached_fragment, SPORTS_MENU_KEY, LATEST_TEAMS_KEY, HOME_ANONYMOUS_KEY
+from .search import search_teams, search_clubs
+
+SEARCH_PAGE_SIZE = 20
+
+def sports_menu_context():
+    return {"sports": Sport.objects.filter(team__isnull=False).distinct().order_by("name")}
+
+
+def latest_teams_context():
+    return {"latest_teams": Team.objects.select_related("club", "sport").order_by("-created_at")[:12]}
+
 
 def home(request):
     """
@@ -10,20 +24,27 @@ def home(request):
     - Sportarten-Menü (distinct)
     - Letzte Teams
     - Optional: Meine Teams, falls eingeloggt
+    Anonyme Besucher bekommen die fertig gerenderte Seite aus dem Cache,
+    eingeloggte Nutzer die gecachten Fragmente plus ihren "Meine Teams"-Block.
     """
-    sports = Team.objects.values_list("sport", flat=True).distinct().order_by("sport")
-    latest_teams = Team.objects.select_related("club", "age_group")[:12]
+    if not request.user.is_authenticated:
+        html = public_cache().get(HOME_ANONYMOUS_KEY)
+        if html is None:
+            html = render_to_string("core/home.html", home_context(request), request=request)
+            public_cache().set(HOME_ANONYMOUS_KEY, html, timeout=None)
+        return HttpResponse(html)
 
-    my_teams = None
-    if request.user.is_authenticated:
-        my_teams = request.user.teams.select_related("club", "age_group")
+    context = home_context(request)
+    context["my_teams"] = request.user.teams.select_related("club", "sport")
+    return render(request, "core/home.html", context)
 
-    context = {
-        "sports": sports,
-        "latest_teams": latest_teams,
-        "my_teams": my_teams,
+
+def home_context(request):
+    return {
+        "sports_menu_html": cached_fragment(SPORTS_MENU_KEY, "core/_sports_menu.html", sports_menu_context),
+        "latest_teams_html": cached_fragment(LATEST_TEAMS_KEY, "core/_latest_teams.html", latest_teams_context),
+        "my_teams": None,
     }
-    return render(request, "core/home.html", context)
 
 
 def sport_overview(request, sport_name):
@@ -31,7 +52,7 @@ def sport_overview(request, sport_name):
     Zeigt alle Teams einer bestimmten Sportart.
     """
     teams = (
-        Team.objects.filter(sport__iexact=sport_name)
+        Team.objects.filter(sport__name__iexact=sport_name)
         .select_related("club", "age_group")
         .order_by("club__name", "name")
     )
@@ -48,31 +69,16 @@ def search(request):
     Universelle Suchseite:
     - Suche nach Teams
     - Suche nach Clubs
+    Rangliste + Präfixsuche über den Suchindex (public/search.py), seitenweise.
     """
-    query = request.GET.get("q", "")
+    query = request.GET.get("q", "").strip()
 
     teams = []
     clubs = []
 
     if query:
-        teams = (
-            Team.objects.filter(
-                Q(name__icontains=query)
-                | Q(club__name__icontains=query)
-                | Q(sport__name__icontains=query)        # FIX
-                | Q(age_group__name__icontains=query)
-            )
-            .select_related("club", "age_group", "sport")
-            .order_by("name")
-        )
-
-        clubs = (
-            Club.objects.filter(
-                Q(name__icontains=query)
-                | Q(address__icontains=query)
-            )
-            .order_by("name")
-        )
+        teams = Paginator(search_teams(query), SEARCH_PAGE_SIZE).get_page(request.GET.get("page"))
+        clubs = Paginator(search_clubs(query), SEARCH_PAGE_SIZE).get_page(request.GET.get("club_page"))
 
     context = {
         "query": query,
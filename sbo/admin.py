@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import SBOGame
+
+
+@admin.register(SBOGame)
+class SBOGameAdmin(admin.ModelAdmin):
+    list_display = ("fixture", "current_score_home", "current_score_away", "is_running")
+    raw_id_fields = ("fixture",)
+    filter_horizontal = ("officials",)
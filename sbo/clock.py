@@ -0,0 +1,118 @@
+# sbo/clock.py
+"""
+Spieluhr für SBOGame.
+
+Gespeichert werden nur Start/Pause/Fortsetzen als SBOEvent (clock_start, clock_pause,
+clock_resume). Die Spielzeit wird bei Bedarf berechnet: Sekunden bis zum letzten Start
+plus die seitdem vergangene Zeit, gemessen mit time.monotonic() (unempfindlich gegen
+Umstellungen der Systemuhr). SBOGame.time_elapsed wird nur bei Events geschrieben,
+nicht jede Sekunde.
+
+Zuschauer bekommen Tick-Frames von einem einzigen asyncio-Task pro Worker
+(TickScheduler), nicht von einem Task pro Spiel.
+"""
+import asyncio
+import time
+
+TICK_SECONDS = 1.0
+
+
+class GameClock:
+    """Laufende oder angehaltene Spieluhr; ``since`` ist der Zeitpunkt (Epoch) des letzten Starts."""
+
+    def __init__(self, base=0.0, running=False, since=None):
+        self.base = base
+        self.running = running
+        self.since = since
+        self._anchor = self._to_monotonic(since) if running else None
+
+    @staticmethod
+    def _to_monotonic(wall):
+        return time.monotonic() - (time.time() - wall)
+
+    def start(self, at):
+        """Startet bzw. setzt die Uhr fort; False, wenn sie schon läuft."""
+        if self.running:
+            return False
+        self.running = True
+        self.since = at
+        self._anchor = self._to_monotonic(at)
+        return True
+
+    def pause(self, at):
+        """Hält die Uhr an; False, wenn sie schon steht."""
+        if not self.running:
+            return False
+        self.base += max(0.0, at - self.since)
+        self.running = False
+        self.since = None
+        self._anchor = None
+        return True
+
+    def elapsed(self):
+        if not self.running:
+            return self.base
+        return self.base + max(0.0, time.monotonic() - self._anchor)
+
+    def as_dict(self):
+        return {"base": self.base, "running": self.running, "since": self.since, "elapsed": int(self.elapsed())}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(base=data.get("base", 0.0), running=data.get("running", False), since=data.get("since"))
+
+
+class TickScheduler:
+    """
+    Ein Task pro Worker schickt jede Sekunde allen lokal verbundenen Zuschauern
+    laufender Spiele einen Tick-Frame. Die Uhren hält der Scheduler selbst, gefüttert
+    vom vollständigen Zustand beim Verbinden und von den Clock-Diffs der Engine.
+    """
+
+    def __init__(self, interval=TICK_SECONDS):
+        self.interval = interval
+        self.clocks = {}    # game_id -> GameClock
+        self.watchers = {}  # game_id -> set of consumers
+        self._task = None
+
+    def watch(self, game_id, consumer, clock):
+        self.watchers.setdefault(game_id, set()).add(consumer)
+        self.clocks[game_id] = clock
+        self._ensure_running()
+
+    def unwatch(self, game_id, consumer):
+        consumers = self.watchers.get(game_id)
+        if consumers is None:
+            return
+        consumers.discard(consumer)
+        if not consumers:
+            del self.watchers[game_id]
+            self.clocks.pop(game_id, None)
+
+    def update(self, game_id, clock):
+        if game_id in self.watchers:
+            self.clocks[game_id] = clock
+
+    def _ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        while self.watchers:
+            await asyncio.sleep(self.interval)
+            await self.tick()
+
+    async def tick(self):
+        sends = []
+        for game_id, clock in list(self.clocks.items()):
+            if not clock.running:
+                continue
+            frame = {"type": "tick", "game": game_id, "elapsed": int(clock.elapsed())}
+            sends.extend(consumer.send_json(frame) for consumer in list(self.watchers.get(game_id, ())))
+        if sends:
+            # a closed socket must not stop the ticks for everybody else
+            await asyncio.gather(*sends, return_exceptions=True)
+
+
+scheduler = TickScheduler()
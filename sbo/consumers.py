@@ -0,0 +1,50 @@
+# sbo/consumers.py
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .clock import GameClock, scheduler
+from .engine import game_group_name, get_state
+from .models import SBOGame
+
+
+class SBOGameConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Live-Ticker für Zuschauer: beim Verbinden kommt der vollständige Spielstand,
+    danach nur noch Diffs aus der Gruppe des Spiels (siehe engine.broadcast) und,
+    solange die Uhr läuft, Tick-Frames vom TickScheduler des Workers.
+    Öffentlich, keine Anmeldung nötig.
+    """
+
+    async def connect(self):
+        game = await self.get_game(self.scope["url_route"]["kwargs"]["slug"])
+        if game is None:
+            await self.close(code=4404)
+            return
+
+        self.game_id = game.pk
+        self.group_name = game_group_name(game.pk)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        state = await self.load_state(game)
+        await self.send_json({"type": "state", "state": state})
+        scheduler.watch(self.game_id, self, GameClock.from_dict(state["clock"]))
+
+    async def disconnect(self, code):
+        if getattr(self, "group_name", None):
+            scheduler.unwatch(self.game_id, self)
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def state_diff(self, event):
+        diff = event["diff"]
+        if "clock" in diff:
+            scheduler.update(self.game_id, GameClock.from_dict(diff["clock"]))
+        await self.send_json({"type": "diff", "diff": diff})
+
+    # -- db helpers -----------------------------------------------------
+    @database_sync_to_async
+    def get_game(self, slug):
+        return SBOGame.objects.select_related("fixture").filter(slug=slug).first()
+
+    @database_sync_to_async
+    def load_state(self, game):
+        return get_state(game).as_dict()
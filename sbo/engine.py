@@ -0,0 +1,297 @@
+# sbo/engine.py
+"""
+Live-Ticker-Engine für SBOGame.
+
+- Kommandos (Tor, Auszeit, Strafe, Wechsel) werden als SBOEvent angehängt.
+- Der Spielzustand liegt pro Worker im Speicher und wird inkrementell aus dem
+  Event-Stream gefaltet: jedes Event ändert den Zustand in O(1).
+- Jede Änderung geht als Diff über den Channel-Layer an die Zuschauer
+  (Gruppe ``sbo_game_<id>``, siehe consumers.SBOGameConsumer).
+- Die Spielzeit kommt aus der Spieluhr (clock_start/clock_pause/clock_resume,
+  siehe clock.GameClock) und wird bei Bedarf berechnet.
+- Alle SNAPSHOT_EVERY Events wird ein SBOSnapshot geschrieben; ein neu gestarteter
+  Worker lädt den Snapshot und faltet nur die Events danach.
+
+Mehrere Worker bleiben konsistent: record_event sperrt die SBOGame-Zeile
+(select_for_update) für Insert, Nachladen und Spielstand in einer Transaktion.
+Schreibvorgänge eines Spiels laufen damit nacheinander, die IDs seiner Events
+werden in ID-Reihenfolge sichtbar, und das Nachladen aller Events mit
+id > last_event_id (eine Abfrage über (game, id)) überspringt keines.
+"""
+import logging
+import threading
+import uuid
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .clock import GameClock
+from .models import SBOGame, SBOEvent, SBOSnapshot
+
+logger = logging.getLogger(__name__)
+
+EVENT_GOAL = "goal"
+EVENT_TIMEOUT = "timeout"
+EVENT_PENALTY = "penalty"
+EVENT_SUBSTITUTION = "substitution"
+EVENT_CLOCK_START = "clock_start"
+EVENT_CLOCK_PAUSE = "clock_pause"
+EVENT_CLOCK_RESUME = "clock_resume"
+CLOCK_EVENTS = (EVENT_CLOCK_START, EVENT_CLOCK_PAUSE, EVENT_CLOCK_RESUME)
+EVENT_TYPES = (EVENT_GOAL, EVENT_TIMEOUT, EVENT_PENALTY, EVENT_SUBSTITUTION) + CLOCK_EVENTS
+# events that must name the home or away team
+TEAM_EVENTS = (EVENT_GOAL, EVENT_TIMEOUT, EVENT_PENALTY, EVENT_SUBSTITUTION)
+
+SNAPSHOT_EVERY = 25
+DEFAULT_PENALTY_SECONDS = 120
+
+
+def _meta_int(event, key, default):
+    # record_event validates meta; events stored before that must not break the fold
+    try:
+        return int((event.meta or {}).get(key, default))
+    except (TypeError, ValueError):
+        logger.warning("SBOEvent %s: ungültiges %s=%r ignoriert", event.pk, key, event.meta.get(key))
+        return default
+
+
+class GameState:
+    """Gefalteter Zustand eines Spiels."""
+
+    def __init__(self, game_id, home_id, away_id, score_home=0, score_away=0,
+                 timeouts_home=0, timeouts_away=0, penalties=None, clock=None,
+                 last_event_id=0, events_since_snapshot=0):
+        self.game_id = game_id
+        self.home_id = home_id
+        self.away_id = away_id
+        self.score_home = score_home
+        self.score_away = score_away
+        self.timeouts_home = timeouts_home
+        self.timeouts_away = timeouts_away
+        self.penalties = penalties or []
+        self.clock = clock or GameClock()
+        self.last_event_id = last_event_id
+        self.events_since_snapshot = events_since_snapshot
+
+    @property
+    def time_elapsed(self):
+        return int(self.clock.elapsed())
+
+    def side(self, team_id):
+        if team_id == self.home_id:
+            return "home"
+        if team_id == self.away_id:
+            return "away"
+        return None
+
+    def apply(self, event):
+        """Faltet ein Event in den Zustand und gibt den Diff für die Zuschauer zurück."""
+        side = self.side(event.team_id)
+        meta = event.meta or {}
+        diff = {}
+
+        if event.event_type == EVENT_GOAL and side:
+            field = f"score_{side}"
+            setattr(self, field, getattr(self, field) + _meta_int(event, "points", 1))
+            diff[field] = getattr(self, field)
+        elif event.event_type == EVENT_TIMEOUT and side:
+            field = f"timeouts_{side}"
+            setattr(self, field, getattr(self, field) + 1)
+            diff[field] = getattr(self, field)
+        elif event.event_type == EVENT_PENALTY and side:
+            penalty = {
+                "team": side,
+                "player": event.player_id,
+                "seconds": _meta_int(event, "penalty_seconds", DEFAULT_PENALTY_SECONDS),
+                "at": meta.get("time"),
+            }
+            self.penalties.append(penalty)
+            diff["penalty"] = penalty
+        elif event.event_type in (EVENT_CLOCK_START, EVENT_CLOCK_RESUME):
+            if self.clock.start(event.timestamp.timestamp()):
+                diff["clock"] = self.clock.as_dict()
+        elif event.event_type == EVENT_CLOCK_PAUSE:
+            if self.clock.pause(event.timestamp.timestamp()):
+                diff["clock"] = self.clock.as_dict()
+
+        self.last_event_id = event.pk
+        self.events_since_snapshot += 1
+        diff["last_event_id"] = event.pk
+        diff["event"] = {
+            "id": event.pk,
+            "type": event.event_type,
+            "team": side,
+            "player": event.player_id,
+            "description": event.description,
+        }
+        return diff
+
+    def as_dict(self):
+        return {
+            "game": self.game_id,
+            "score_home": self.score_home,
+            "score_away": self.score_away,
+            "timeouts_home": self.timeouts_home,
+            "timeouts_away": self.timeouts_away,
+            "penalties": list(self.penalties),
+            "time_elapsed": self.time_elapsed,
+            "clock": self.clock.as_dict(),
+            "last_event_id": self.last_event_id,
+        }
+
+    @classmethod
+    def from_dict(cls, game_id, home_id, away_id, data):
+        data = {k: v for k, v in data.items() if k not in ("game", "time_elapsed")}
+        data["clock"] = GameClock.from_dict(data.get("clock") or {})
+        return cls(game_id, home_id, away_id, **data)
+
+
+# ------------------------------------------------------------------
+# per-worker registry
+# ------------------------------------------------------------------
+_states = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+def _lock_for(game_id):
+    with _registry_lock:
+        return _locks.setdefault(game_id, threading.Lock())
+
+
+def _catch_up(state):
+    """Faltet alle Events, die neuer als der Zustand sind (eine Abfrage)."""
+    events = SBOEvent.objects.filter(game_id=state.game_id, id__gt=state.last_event_id).order_by("id")
+    return [state.apply(ev) for ev in events]
+
+
+def _restore(game):
+    fixture = game.fixture
+    snapshot = SBOSnapshot.objects.filter(game=game).first()
+    if snapshot:
+        return GameState.from_dict(game.pk, fixture.home_id, fixture.away_id, snapshot.state)
+    return GameState(game.pk, fixture.home_id, fixture.away_id)
+
+
+def get_state(game):
+    """Aktueller Zustand (aus dem Speicher, sonst aus Snapshot + restlichen Events)."""
+    with _lock_for(game.pk):
+        state = _states.get(game.pk)
+        if state is None:
+            state = _states[game.pk] = _restore(game)
+        _catch_up(state)
+        return state
+
+
+def forget(game_id):
+    """Zustand eines beendeten Spiels aus dem Speicher entfernen."""
+    with _registry_lock:
+        _states.pop(game_id, None)
+        _locks.pop(game_id, None)
+
+
+def write_snapshot(state):
+    SBOSnapshot.objects.update_or_create(
+        game_id=state.game_id,
+        defaults={"last_event_id": state.last_event_id, "state": state.as_dict()},
+    )
+    state.events_since_snapshot = 0
+
+
+# ------------------------------------------------------------------
+# command API
+# ------------------------------------------------------------------
+# meta keys read by GameState.apply: name -> smallest allowed value
+INT_META = {"points": 1, "penalty_seconds": 0, "time": 0}
+
+
+def clean_meta(meta):
+    """
+    Prüft die Zahlenwerte in meta, bevor das Event gespeichert wird - ein
+    gespeichertes Event mit ``points="x"`` würde jedes spätere Falten abbrechen.
+    """
+    meta = dict(meta or {})
+    for key, minimum in INT_META.items():
+        if key not in meta:
+            continue
+        try:
+            value = int(meta[key])
+        except (TypeError, ValueError):
+            raise ValidationError(f"{key} muss eine ganze Zahl sein.")
+        if value < minimum:
+            raise ValidationError(f"{key} muss mindestens {minimum} sein.")
+        meta[key] = value
+    return meta
+
+
+def record_event(game, event_type, team=None, player=None, meta=None, description=""):
+    """
+    Hängt ein SBOEvent an, faltet es in den Zustand, schreibt den Spielstand
+    zurück und verteilt den Diff an die Zuschauer.
+    returns (event, state)
+    """
+    if event_type not in EVENT_TYPES:
+        raise ValidationError(f"Unbekannter Event-Typ: {event_type}")
+    fixture = game.fixture
+    if event_type in TEAM_EVENTS and (team is None or team.pk not in (fixture.home_id, fixture.away_id)):
+        raise ValidationError("Das Event muss der Heim- oder Gastmannschaft zugeordnet sein.")
+    meta = clean_meta(meta)
+
+    with _lock_for(game.pk):
+        try:
+            with transaction.atomic():
+                # serializes writers of this game across workers; see module docstring
+                SBOGame.objects.select_for_update().filter(pk=game.pk).values_list("pk", flat=True).get()
+                state = _states.get(game.pk)
+                if state is None:
+                    state = _states[game.pk] = _restore(game)
+                diffs = _catch_up(state)
+                # game time of the event, unless the scorer entered it after the fact
+                meta.setdefault("time", state.time_elapsed)
+                event = SBOEvent.objects.create(
+                    game=game,
+                    event_type=event_type,
+                    team=team,
+                    player=player,
+                    meta=meta,
+                    description=description,
+                    slug=uuid.uuid4().hex,
+                )
+                diffs += _catch_up(state)
+
+                SBOGame.objects.filter(pk=game.pk).update(
+                    current_score_home=state.score_home,
+                    current_score_away=state.score_away,
+                    time_elapsed=state.time_elapsed,
+                    is_running=state.clock.running,
+                )
+                if state.events_since_snapshot >= SNAPSHOT_EVERY:
+                    write_snapshot(state)
+        except Exception:
+            # the in-memory state may hold events that were rolled back
+            _states.pop(game.pk, None)
+            raise
+
+    broadcast(game.pk, diffs)
+    return event, state
+
+
+# ------------------------------------------------------------------
+# spectators
+# ------------------------------------------------------------------
+def game_group_name(game_id):
+    return f"sbo_game_{game_id}"
+
+
+def broadcast(game_id, diffs):
+    layer = get_channel_layer()
+    if layer is None or not diffs:
+        return
+    try:
+        for diff in diffs:
+            async_to_sync(layer.group_send)(game_group_name(game_id), {"type": "state.diff", "diff": diff})
+    except Exception:
+        # state and events are stored; spectators resync from the full state on reconnect
+        logger.warning("Live-Ticker-Broadcast für Spiel %s fehlgeschlagen", game_id, exc_info=True)
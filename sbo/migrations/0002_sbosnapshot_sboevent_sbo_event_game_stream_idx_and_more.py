@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sbo', '0001_initial'),
+        ('team', '0008_message_team_message_keyset_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SBOSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_event_id', models.BigIntegerField(default=0)),
+                ('state', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='sboevent',
+            index=models.Index(fields=['game', 'id'], name='sbo_event_game_stream_idx'),
+        ),
+        migrations.AddField(
+            model_name='sbosnapshot',
+            name='game',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='snapshot', to='sbo.sbogame'),
+        ),
+    ]
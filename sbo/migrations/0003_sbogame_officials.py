@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-18 15:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sbo', '0002_sbosnapshot_sboevent_sbo_event_game_stream_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sbogame',
+            name='officials',
+            field=models.ManyToManyField(blank=True, related_name='sbo_games', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
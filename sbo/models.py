@@ -13,6 +13,8 @@ class SBOGame(models.Model):
     additional_info = models.TextField(null=True, blank=True)
     slug = models.SlugField(unique=True)
     short_code = models.CharField(max_length=20, blank=True)
+    # Zeitnehmer/Sekretär usw., die neben dem Schiedsrichter des Spiels Events erfassen dürfen
+    officials = models.ManyToManyField("accounts.CustomUser", related_name="sbo_games", blank=True)
 
     def __str__(self):
         return f"SBOGame for Fixture {self.fixture.id}"
@@ -30,5 +32,22 @@ class SBOEvent(models.Model):
     slug = models.SlugField(unique=True)
     short_code = models.CharField(max_length=20, blank=True)
 
+    class Meta:
+        indexes = [
+            # folding the event stream: WHERE game = ? AND id > ?
+            models.Index(fields=["game", "id"], name="sbo_event_game_stream_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} at {self.timestamp} in game {self.game.id}"
+
+class SBOSnapshot(models.Model):
+    """Zwischenstand des gefalteten Spielzustands (siehe sbo/engine.py), damit ein neu
+    gestarteter Worker nicht den kompletten Event-Stream abspielen muss."""
+    game = models.OneToOneField(SBOGame, related_name="snapshot", on_delete=models.CASCADE)
+    last_event_id = models.BigIntegerField(default=0)
+    state = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
     def __str__(self):
-        return f"{self.event_type} at {self.timestamp} in game {self.game.id}"
\ No newline at end of file
+        return f"Snapshot for SBOGame {self.game_id} at event {self.last_event_id}"
\ No newline at end of file
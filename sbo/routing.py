@@ -0,0 +1,6 @@
+from django.urls import path
+from . import consumers
+
+websocket_urlpatterns = [
+    path("ws/sbo/<slug:slug>/", consumers.SBOGameConsumer.as_asgi()),
+]
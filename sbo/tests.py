@@ -1,3 +1,184 @@
-from django.test import TestCase
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser, Sport
+from club.models import Club
+from match.models import Fixture
+from team.models import AgeGroup, Team
+
+from . import engine
+from .clock import GameClock, TickScheduler
+from .models import SBOEvent, SBOGame, SBOSnapshot
+
+IN_MEMORY_LAYER = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+
+
+def create_game(slug="sbo-test"):
+    club = Club.objects.create(name=f"TV {slug}", slug=slug)
+    sport = Sport.objects.create(name=f"Handball {slug}")
+    age_group = AgeGroup.objects.create(name=f"Senioren {slug}")
+    home, away = (
+        Team.objects.create(name=name, club=club, slug=f"{slug}-{name}", sport=sport, age_group=age_group)
+        for name in ("heim", "gast")
+    )
+    referee = CustomUser.objects.create_user(username=f"{slug}-ref", password="pw", role="referee")
+    fixture = Fixture.objects.create(
+        home=home, away=away, datetime=timezone.now() + timedelta(hours=1), slug=slug, referee=referee
+    )
+    return SBOGame.objects.create(fixture=fixture, slug=slug), home, away, referee
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_LAYER)
+class SBOEngineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.game, cls.home, cls.away, cls.referee = create_game()
+        cls.official = CustomUser.objects.create_user(username="secretary", password="pw", role="timekeeper")
+        cls.other_timekeeper = CustomUser.objects.create_user(username="elsewhere", password="pw", role="timekeeper")
+        cls.game.officials.add(cls.official)
+
+    def setUp(self):
+        engine.forget(self.game.pk)
+        self.game = SBOGame.objects.select_related("fixture").get(pk=self.game.pk)
+
+    def test_events_fold_into_state_and_game_row(self):
+        engine.record_event(self.game, "goal", team=self.home, meta={"points": 2})
+        engine.record_event(self.game, "goal", team=self.away)
+        engine.record_event(self.game, "timeout", team=self.home)
+        _, state = engine.record_event(self.game, "penalty", team=self.away, meta={"penalty_seconds": "60"})
+
+        self.assertEqual((state.score_home, state.score_away), (2, 1))
+        self.assertEqual((state.timeouts_home, state.timeouts_away), (1, 0))
+        self.assertEqual(state.penalties[0]["seconds"], 60)
+        self.game.refresh_from_db()
+        self.assertEqual((self.game.current_score_home, self.game.current_score_away), (2, 1))
+
+        # another worker (empty registry) folds the same state from the stored events
+        expected = state.as_dict()
+        engine.forget(self.game.pk)
+        self.assertEqual(engine.get_state(self.game).as_dict(), expected)
+
+    def test_snapshot_round_trip(self):
+        with mock.patch.object(engine, "SNAPSHOT_EVERY", 3):
+            events = [engine.record_event(self.game, "goal", team=self.home)[0] for _ in range(4)]
+        snapshot = SBOSnapshot.objects.get(game=self.game)
+        self.assertEqual(snapshot.last_event_id, events[2].pk)
+
+        engine.forget(self.game.pk)
+        # snapshot + the one event after it
+        with self.assertNumQueries(2):
+            state = engine.get_state(self.game)
+        self.assertEqual((state.score_home, state.last_event_id), (4, events[3].pk))
+
+    def test_invalid_meta_is_rejected_before_storing(self):
+        for meta in ({"points": "x"}, {"penalty_seconds": -5}, {"points": None}):
+            with self.assertRaises(ValidationError):
+                engine.record_event(self.game, "goal", team=self.home, meta=meta)
+        self.assertFalse(SBOEvent.objects.exists())
+
+        # an event stored before validation existed still folds (with the default)
+        SBOEvent.objects.create(game=self.game, event_type="goal", team=self.home, meta={"points": "x"}, slug="old")
+        with self.assertLogs("sbo.engine", "WARNING"):
+            self.assertEqual(engine.get_state(self.game).score_home, 1)
+
+    def test_only_referee_officials_and_staff_can_score(self):
+        url = reverse("sbo_game_command", kwargs={"slug": self.game.slug})
+        data = {"event_type": "goal", "side": "home"}
+        expected = {self.other_timekeeper: 403, self.official: 201, self.referee: 201}
+        for user, status in expected.items():
+            self.client.force_login(user)
+            self.assertEqual(self.client.post(url, data, HTTP_HOST="localhost").status_code, status, user)
+        for bad in ({"points": "x"}, {"player": "abc"}):
+            response = self.client.post(url, {**data, **bad}, HTTP_HOST="localhost")
+            self.assertEqual(response.status_code, 400, bad)
+        self.assertEqual(engine.get_state(self.game).score_home, 2)
+
+
+class GameClockTests(SimpleTestCase):
+    def test_pause_and_resume(self):
+        now = time.time()
+        clock = GameClock()
+        self.assertTrue(clock.start(now - 90))
+        self.assertFalse(clock.start(now))
+        self.assertTrue(clock.pause(now - 30))
+        self.assertFalse(clock.pause(now))
+        self.assertEqual(clock.elapsed(), 60)
+
+        self.assertTrue(clock.start(now - 10))
+        self.assertAlmostEqual(clock.elapsed(), 70, delta=1)
+        # a restored running clock keeps counting from the stored start
+        restored = GameClock.from_dict(clock.as_dict())
+        self.assertTrue(restored.running)
+        self.assertAlmostEqual(restored.elapsed(), 70, delta=1)
+
+
+class FakeConsumer:
+    def __init__(self, fail=False):
+        self.frames = []
+        self.fail = fail
+
+    async def send_json(self, frame):
+        if self.fail:
+            raise ConnectionError("closed")
+        self.frames.append(frame)
+
+
+class TickSchedulerTests(SimpleTestCase):
+    async def test_ticks_only_running_clocks(self):
+        scheduler = TickScheduler(interval=3600)
+        running, paused, broken = FakeConsumer(), FakeConsumer(), FakeConsumer(fail=True)
+        clock = GameClock()
+        clock.start(time.time() - 42)
+        scheduler.watch(1, running, clock)
+        scheduler.watch(1, broken, clock)
+        scheduler.watch(2, paused, GameClock(base=10))
+
+        await scheduler.tick()
+        self.assertEqual(running.frames, [{"type": "tick", "game": 1, "elapsed": 42}])
+        self.assertEqual(paused.frames, [])
+
+        scheduler.update(1, GameClock(base=42))
+        await scheduler.tick()
+        self.assertEqual(len(running.frames), 1)
+
+        scheduler.unwatch(1, running)
+        scheduler.unwatch(1, broken)
+        scheduler.unwatch(2, paused)
+        self.assertEqual((scheduler.watchers, scheduler.clocks), ({}, {}))
+        scheduler._task.cancel()
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_LAYER)
+class SBOGameConsumerTests(TransactionTestCase):
+    def setUp(self):
+        self.game, self.home, _, _ = create_game("sbo-live")
+        engine.forget(self.game.pk)
+
+    async def test_spectator_gets_state_then_diffs(self):
+        from sportmaster.asgi import application
+
+        ws = WebsocketCommunicator(application, f"/ws/sbo/{self.game.slug}/", headers=[(b"origin", b"http://localhost")])
+        self.assertTrue((await ws.connect())[0])
+        first = await ws.receive_json_from()
+        self.assertEqual((first["type"], first["state"]["score_home"]), ("state", 0))
+
+        await sync_to_async(engine.record_event)(self.game, "goal", team=self.home)
+        frame = await ws.receive_json_from()
+        self.assertEqual(frame["type"], "diff")
+        self.assertEqual(frame["diff"]["score_home"], 1)
+
+        await sync_to_async(engine.record_event)(self.game, "clock_start")
+        frame = await ws.receive_json_from()
+        self.assertTrue(frame["diff"]["clock"]["running"])
+        # the worker's scheduler now sends tick frames for this game
+        frame = await ws.receive_json_from(timeout=3)
+        self.assertEqual((frame["type"], frame["game"]), ("tick", self.game.pk))
+        await ws.disconnect()
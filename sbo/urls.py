@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path("<slug:slug>/state/", views.game_state, name="sbo_game_state"),
+    path("<slug:slug>/events/", views.game_command, name="sbo_game_command"),
+]
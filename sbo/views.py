@@ -1,3 +1,61 @@
-from django.shortcuts import render
+# sbo/views.py
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse, HttpResponseForbidden
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET, require_POST
 
-# Create your views here.
+from accounts.models import CustomUser
+from team.models import Team
+from .engine import get_state, record_event
+from .models import SBOGame
+
+def can_score(user, game):
+    """Events erfassen: der Schiedsrichter des Spiels, die eingeteilten Offiziellen und Staff."""
+    if not user.is_authenticated:
+        return False
+    if user.is_staff or game.fixture.referee_id == user.pk:
+        return True
+    return game.officials.filter(pk=user.pk).exists()
+
+
+@require_GET
+def game_state(request, slug):
+    """JSON: vollständiger Spielstand (Zuschauer synchronisieren sich hierüber oder per WebSocket)."""
+    game = get_object_or_404(SBOGame.objects.select_related("fixture"), slug=slug)
+    return JsonResponse(get_state(game).as_dict())
+
+
+@login_required
+@require_POST
+def game_command(request, slug):
+    """
+    Erfasst ein Event (goal / timeout / penalty / substitution / clock_start / clock_pause / clock_resume).
+    POST: event_type, side (home|away), optional player, time, penalty_seconds, points, description
+    """
+    game = get_object_or_404(SBOGame.objects.select_related("fixture"), slug=slug)
+    if not can_score(request.user, game):
+        return HttpResponseForbidden("Nur der Schiedsrichter und die eingeteilten Offiziellen dürfen Events erfassen.")
+
+    side = request.POST.get("side")
+    team_id = {"home": game.fixture.home_id, "away": game.fixture.away_id}.get(side)
+    team = Team.objects.filter(pk=team_id).first() if team_id else None
+    player = None
+    meta = {}
+    try:
+        if request.POST.get("player"):
+            player = CustomUser.objects.filter(pk=int(request.POST["player"])).first()
+        for key in ("time", "penalty_seconds", "points"):
+            if request.POST.get(key):
+                meta[key] = int(request.POST[key])
+        event, state = record_event(
+            game,
+            request.POST.get("event_type", ""),
+            team=team,
+            player=player,
+            meta=meta,
+            description=request.POST.get("description", ""),
+        )
+    except (ValueError, ValidationError) as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    return JsonResponse({"event": event.pk, "state": state.as_dict()}, status=201)
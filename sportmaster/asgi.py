@@ -2,6 +2,8 @@
 ASGI config for sportmaster project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP is served by Django, WebSockets (team chat, SBO live ticker) by Channels with the
+Django session as authentication.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -13,4 +15,19 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sportmaster.settings')
 
-application = get_asgi_application()
+# initialise Django before importing consumers (they import models)
+django_asgi_app = get_asgi_application()
+
+from channels.auth import AuthMiddlewareStack  # noqa: E402
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.security.websocket import AllowedHostsOriginValidator  # noqa: E402
+
+from team.routing import websocket_urlpatterns as team_websocket_urlpatterns  # noqa: E402
+from sbo.routing import websocket_urlpatterns as sbo_websocket_urlpatterns  # noqa: E402
+
+application = ProtocolTypeRouter({
+    "http": django_asgi_app,
+    "websocket": AllowedHostsOriginValidator(
+        AuthMiddlewareStack(URLRouter(team_websocket_urlpatterns + sbo_websocket_urlpatterns))
+    ),
+})
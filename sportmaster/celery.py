@@ -0,0 +1,11 @@
+# sportmaster/celery.py
+"""Celery-App für JOBS_BACKEND = "jobs.backends.CeleryBackend" (celery -A sportmaster worker)."""
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sportmaster.settings")
+
+app = Celery("sportmaster")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
@@ -58,6 +58,8 @@ INSTALLED_APPS = [
     "news",
     "payments",
     "public",
+    "api",
+    "jobs",
 ]
 
 MIDDLEWARE = [
@@ -145,6 +147,31 @@ STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Cache: "public" hält die vorgerenderten öffentlichen Seiten (Startseite).
+# Dateibasiert, damit alle Worker eines Hosts denselben Cache sehen und die
+# Invalidierung per Signal überall greift.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "public": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("PUBLIC_CACHE_DIR", os.path.join(BASE_DIR, ".cache", "public")),
+    },
+    # "shared": Daten, deren Invalidierung alle Web- und Job-Worker sehen müssen
+    # (Passkontrolle, accounts/passes.py) - Redis, wenn SHARED_CACHE_URL gesetzt ist,
+    # sonst dateibasiert (alle Worker eines Hosts)
+    "shared": (
+        {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": os.getenv("SHARED_CACHE_URL")}
+        if os.getenv("SHARED_CACHE_URL")
+        else {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.getenv("SHARED_CACHE_DIR", os.path.join(BASE_DIR, ".cache", "shared")),
+        }
+    ),
+}
+
+
 # Channels / Redis (für Live-Ticker, SBO)
 CHANNEL_LAYERS = {
     "default": {
@@ -153,13 +180,32 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Hintergrund-Jobs (jobs.runner): LocalBackend = Thread-Pool im Web-Prozess,
+# CeleryBackend = Worker über Redis (celery -A sportmaster worker)
+JOBS_BACKEND = os.getenv("JOBS_BACKEND", "jobs.backends.LocalBackend")
+JOBS_LOCAL_WORKERS = int(os.getenv("JOBS_LOCAL_WORKERS", "2"))
+# laufende Jobs gelten danach als verloren und werden von "manage.py run_jobs" neu eingereiht
+JOBS_RUNNING_TIMEOUT = int(os.getenv("JOBS_RUNNING_TIMEOUT", str(60 * 60)))
+# Ergebnisdateien (Exporte): nicht unter MEDIA_ROOT, nur über die Job-Seite abrufbar;
+# "manage.py run_jobs" löscht sie nach JOBS_FILES_MAX_AGE Sekunden
+JOBS_FILES_ROOT = os.getenv("JOBS_FILES_ROOT", os.path.join(BASE_DIR, "jobfiles"))
+JOBS_FILES_MAX_AGE = int(os.getenv("JOBS_FILES_MAX_AGE", str(7 * 24 * 60 * 60)))
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", os.getenv("REDIS_URL", "redis://localhost:6379"))
+CELERY_TASK_IGNORE_RESULT = True
+
+# Web Push (accounts.push): VAPID-Schlüssel z.B. mit "vapid --gen" erzeugen
+VAPID_PUBLIC_KEY = os.getenv("VAPID_PUBLIC_KEY", "")
+VAPID_PRIVATE_KEY = os.getenv("VAPID_PRIVATE_KEY", "")
+VAPID_CLAIMS_EMAIL = os.getenv("VAPID_CLAIMS_EMAIL", "admin@sportmaster.local")
+PUSH_TRANSPORT = os.getenv("PUSH_TRANSPORT", "accounts.push.WebPushTransport")
+PUSH_WORKERS = int(os.getenv("PUSH_WORKERS", "8"))
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticatedOrReadOnly",),
-    "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend",),
 }
 
 # JWT example
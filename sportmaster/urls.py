@@ -26,7 +26,9 @@ urlpatterns = [
     path("club/", include("club.urls")),
     path("team/", include("team.urls")),
     #path("match/", include("match.urls")),
-    #path("sbo/", include("sbo.urls")),
+    path("sbo/", include("sbo.urls")),
+    path("api/", include("api.urls")),
+    path("jobs/", include("jobs.urls")),
     #path("venue/", include("venue.urls")),
     #path("news/", include("news.urls")),
     #path("payments/", include("payments.urls")),
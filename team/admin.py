@@ -1,5 +1,8 @@
+from django import forms
 from django.contrib import admin
-from .models import AgeGroup, Team, Penalty, AssignedPenalty, Team_Game_Plan_H4A, Team_Tabel_H4A, TrainingRSVP, Lineup
+
+from .forms import RosterFormMixin
+from .models import AgeGroup, Team, Penalty, AssignedPenalty, MemberBalance, Team_Game_Plan_H4A, Team_Tabel_H4A, TrainingRSVP, Lineup
 
 
 @admin.register(AgeGroup)
@@ -8,8 +11,15 @@ class AgeGroupAdmin(admin.ModelAdmin):
     ordering = ("order",)
 
 
+class TeamAdminForm(RosterFormMixin, forms.ModelForm):
+    class Meta:
+        model = Team
+        fields = "__all__"
+
+
 @admin.register(Team)
 class TeamAdmin(admin.ModelAdmin):
+    form = TeamAdminForm
     list_display = ("name", "club", "age_group", "sport", "slug")
     list_filter = ("club", "age_group", "sport")
     search_fields = ("name", "club__name", "slug")
@@ -25,6 +35,13 @@ class PenaltyAdmin(admin.ModelAdmin):
 class AssignedPenaltyAdmin(admin.ModelAdmin):
     list_display = ("user", "penalty", "team", "paid", "assigned_at")
 
+@admin.register(MemberBalance)
+class MemberBalanceAdmin(admin.ModelAdmin):
+    list_display = ("user", "team", "open_amount", "open_count", "paid_amount", "paid_count", "updated_at")
+    list_filter = ("team",)
+    # maintained by team.balances - see the rebuild_balances command
+    readonly_fields = ("team", "user", "open_amount", "paid_amount", "open_count", "paid_count", "updated_at")
+
 admin.site.register(Team_Tabel_H4A)
 admin.site.register(Team_Game_Plan_H4A)
 admin.site.register(TrainingRSVP)
@@ -0,0 +1,168 @@
+# teams/balances.py
+"""
+Strafenkonto pro Mitglied (MemberBalance).
+
+Jede vergebene Strafe zählt mit dem Betrag aus dem Katalog entweder als offen oder
+als bezahlt. Neue, geänderte und gelöschte Strafen schreiben das Konto über
+Signale fort (F-Ausdrücke, ein UPDATE pro betroffenem Mitglied). mark_paid()
+bezahlt viele Strafen auf einmal: die Beträge werden in der Datenbank pro
+Mitglied summiert, es wird nie über die ganze Strafen-Historie iteriert.
+Teamseiten lesen nur noch MemberBalance, also eine Zeile pro Mitglied.
+rebuild() baut die Konten zur Reparatur neu auf (Konten ohne Strafen bleiben mit
+0 stehen).
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from .models import AssignedPenalty, MemberBalance, Penalty
+
+ZERO = Decimal("0.00")
+
+
+def penalty_key(assigned):
+    """Alles, was den Beitrag einer Strafe zum Konto bestimmt."""
+    return (assigned.team_id, assigned.user_id, assigned.penalty_id, assigned.paid)
+
+
+def _apply(deltas):
+    """
+    deltas: {(team_id, user_id): {"open_amount": x, "paid_amount": y, "open_count": n, "paid_count": m}}
+    Legt fehlende Konten an und addiert die Deltas (ein UPDATE pro Mitglied).
+    Konten werden nur für Zugänge angelegt: reine Abgänge (gelöschte Strafen)
+    aktualisieren bestehende Zeilen - beim Löschen eines Mitglieds oder Teams
+    läuft das Signal mitten in der Kaskade, ein neues Konto würde dort auf
+    eine gerade gelöschte Zeile verweisen.
+    """
+    deltas = {key: values for key, values in deltas.items() if any(values.values())}
+    if not deltas:
+        return
+    gains = [key for key, values in deltas.items() if any(value > 0 for value in values.values())]
+    if gains:
+        MemberBalance.objects.bulk_create(
+            [MemberBalance(team_id=team_id, user_id=user_id) for team_id, user_id in gains], ignore_conflicts=True
+        )
+    now = timezone.now()
+    for (team_id, user_id), values in deltas.items():
+        MemberBalance.objects.filter(team_id=team_id, user_id=user_id).update(
+            updated_at=now, **{name: F(name) + value for name, value in values.items() if value}
+        )
+
+
+def _delta():
+    return {"open_amount": ZERO, "paid_amount": ZERO, "open_count": 0, "paid_count": 0}
+
+
+def penalty_changed(old_key, new_key, amounts=None):
+    """
+    Schreibt die Konten fort: alten Beitrag abziehen, neuen addieren.
+    amounts: {penalty_id: amount}, fehlende Beträge werden nachgeladen
+    """
+    if old_key == new_key:
+        return
+    keys = [(key, sign) for key, sign in ((old_key, -1), (new_key, +1)) if key]
+    amounts = dict(amounts or {})
+    missing = {key[2] for key, _ in keys} - set(amounts)
+    if missing:
+        amounts.update(Penalty.objects.filter(pk__in=missing).values_list("id", "amount"))
+
+    deltas = defaultdict(_delta)
+    for (team_id, user_id, penalty_id, paid), sign in keys:
+        row = deltas[(team_id, user_id)]
+        state = "paid" if paid else "open"
+        row[f"{state}_amount"] += sign * Decimal(str(amounts.get(penalty_id, ZERO)))
+        row[f"{state}_count"] += sign
+    with transaction.atomic():
+        _apply(deltas)
+
+
+def mark_paid(assigned):
+    """
+    Markiert alle offenen Strafen aus dem Queryset ``assigned`` als bezahlt und
+    bucht die Beträge pro Mitglied um - eine Aggregat-Abfrage, ein UPDATE der
+    Strafen, ein UPDATE pro Mitglied. returns Anzahl bezahlter Strafen
+    """
+    open_penalties = assigned.filter(paid=False)
+    with transaction.atomic():
+        # lock the open rows (FOR UPDATE is not allowed together with an aggregate);
+        # penalties assigned afterwards get higher ids and stay open
+        locked = open_penalties.select_for_update(of=("self",)).order_by().values_list("id", flat=True)
+        last_id = max(locked, default=None)
+        if last_id is None:
+            return 0
+        open_penalties = open_penalties.filter(id__lte=last_id)
+        deltas = defaultdict(_delta)
+        for row in open_penalties.values("team_id", "user_id").annotate(total=Sum("penalty__amount"), n=Count("id")):
+            values = deltas[(row["team_id"], row["user_id"])]
+            values["open_amount"] -= row["total"] or ZERO
+            values["paid_amount"] += row["total"] or ZERO
+            values["open_count"] -= row["n"]
+            values["paid_count"] += row["n"]
+        # queryset.update() skips the post_save signal, the balances are moved here
+        updated = open_penalties.update(paid=True)
+        _apply(deltas)
+    return updated
+
+
+def rebuild(team=None):
+    """
+    Baut die Konten (eines oder aller Teams) aus allen vergebenen Strafen neu auf.
+    Konten und Strafen werden vorher gesperrt; die Konten werden an Ort und Stelle
+    überschrieben (nicht gelöscht), damit ein parallel laufendes F-Update nach dem
+    Commit auf dem neuen Stand aufsetzt statt ins Leere zu laufen.
+    """
+    assigned = AssignedPenalty.objects.all()
+    balances = MemberBalance.objects.all()
+    if team is not None:
+        assigned = assigned.filter(team=team)
+        balances = balances.filter(team=team)
+
+    with transaction.atomic():
+        existing = {(b.team_id, b.user_id): b for b in balances.select_for_update().order_by("pk")}
+        # FOR UPDATE is not allowed together with an aggregate: lock first, then sum
+        list(assigned.select_for_update().order_by("pk").values_list("pk", flat=True))
+
+        totals = defaultdict(_delta)
+        for row in assigned.values("team_id", "user_id", "paid").annotate(total=Sum("penalty__amount"), n=Count("id")):
+            values = totals[(row["team_id"], row["user_id"])]
+            state = "paid" if row["paid"] else "open"
+            values[f"{state}_amount"] = row["total"] or ZERO
+            values[f"{state}_count"] = row["n"]
+
+        now = timezone.now()
+        for key, balance in existing.items():
+            for name, value in totals.get(key, _delta()).items():
+                setattr(balance, name, value)
+            balance.updated_at = now
+        MemberBalance.objects.bulk_update(existing.values(), [*_delta(), "updated_at"], batch_size=500)
+        MemberBalance.objects.bulk_create(
+            [
+                MemberBalance(team_id=team_id, user_id=user_id, **values)
+                for (team_id, user_id), values in totals.items()
+                if (team_id, user_id) not in existing
+            ],
+            batch_size=500,
+        )
+    return len(totals)
+
+
+class TeamSummary:
+    """Konten eines Teams plus Summen - eine Abfrage, eine Zeile pro Mitglied."""
+
+    def __init__(self, team):
+        self.balances = list(
+            MemberBalance.objects.filter(team=team)
+            .exclude(open_count=0, paid_count=0)
+            .select_related("user")
+            .order_by("-open_amount", "user__username")
+        )
+        self.open_amount = sum((b.open_amount for b in self.balances), ZERO)
+        self.paid_amount = sum((b.paid_amount for b in self.balances), ZERO)
+        self.open_count = sum(b.open_count for b in self.balances)
+        self.paid_count = sum(b.paid_count for b in self.balances)
+
+    def for_user(self, user):
+        return next((b for b in self.balances if b.user_id == user.pk), None)
@@ -0,0 +1,242 @@
+# teams/calendar.py
+"""
+iCalendar-Feeds (.ics) für ein Team oder alle Teams eines Users.
+
+Enthalten sind einzelne Trainings, Trainingsserien (als RRULE mit EXDATE für
+gelöschte Termine) und Spiele. Der Feed wird als Stream erzeugt; ETag und
+Last-Modified kommen aus Aggregat-Abfragen (max updated_at + Anzahl von Terminen,
+Serien, Spielen, Teams und Hallen), so dass ein unveränderter Feed mit 304
+beantwortet wird, ohne etwas zu rendern.
+
+Kalender-Apps können sich nicht anmelden: der Link enthält ein signiertes Token mit
+dem User und dessen calendar_key_version. Erhöht der User die Version, sind alle
+seine Links ungültig; ein Team-Feed liefert nur, solange der User im Team ist.
+"""
+import hashlib
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Count, F, Max, Prefetch, Q
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from match.models import Fixture, MATCH_DURATION
+from venue.models import Venue
+from .models import Team, TrainingEvent, TrainingSeries, TRAINING_DURATION
+
+FEED_SALT = "team.calendar"
+PAST_DAYS = 60
+PRODID = "-//SportMaster//Kalender//DE"
+# optional: links expire after N seconds (None = until revoked)
+TOKEN_MAX_AGE = getattr(settings, "CALENDAR_TOKEN_MAX_AGE", None)
+
+
+def feed_token(kind, pk, user):
+    """kind: "team" oder "user"; user: für wen der Link ist"""
+    return signing.dumps([kind, pk, user.pk, user.calendar_key_version], salt=FEED_SALT)
+
+
+def read_token(token):
+    """returns (kind, pk, user_id, key_version); raises signing.BadSignature"""
+    payload = signing.loads(token, salt=FEED_SALT, max_age=TOKEN_MAX_AGE)
+    if not isinstance(payload, list) or len(payload) != 4:
+        raise signing.BadSignature("Veraltetes Kalender-Token.")
+    return tuple(payload)
+
+
+def revoke_tokens(user):
+    """Macht alle Kalender-Links des Users ungültig."""
+    CustomUser.objects.filter(pk=user.pk).update(calendar_key_version=F("calendar_key_version") + 1)
+    user.refresh_from_db(fields=["calendar_key_version"])
+
+
+# ------------------------------------------------------------------
+# formatting
+# ------------------------------------------------------------------
+def _escape(text):
+    return (
+        str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def _fold(line):
+    """Zeilen nach RFC 5545 auf 75 Oktette umbrechen."""
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return line + "\r\n"
+    parts, chunk = [], b""
+    for char in line:
+        encoded = char.encode("utf-8")
+        if len(chunk) + len(encoded) > (75 if not parts else 74):
+            parts.append(chunk.decode("utf-8"))
+            chunk = b""
+        chunk += encoded
+    parts.append(chunk.decode("utf-8"))
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _when(name, value):
+    """DTSTART/DTEND/EXDATE in der Zeitzone des Projekts."""
+    if settings.TIME_ZONE == "UTC":
+        return f"{name}:{value.astimezone(dt_timezone.utc):%Y%m%dT%H%M%SZ}"
+    local = timezone.localtime(value)
+    return f"{name};TZID={settings.TIME_ZONE}:{local:%Y%m%dT%H%M%S}"
+
+
+def _offset(delta):
+    minutes = int(delta.total_seconds()) // 60
+    return f"{'-' if minutes < 0 else '+'}{abs(minutes) // 60:02d}{abs(minutes) % 60:02d}"
+
+
+def _nth_weekday(year, month, weekday, nth):
+    """nth: 1..4 oder -1 (letzter)"""
+    if nth > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (nth - 1))
+    last = (date(year + (month == 12), month % 12 + 1, 1)) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+@lru_cache(maxsize=4)
+def vtimezone(tzid, year):
+    """
+    VTIMEZONE für TZID-Angaben: Übergänge des Jahres ``year`` aus zoneinfo, als
+    jährliche Regel (n-ter/letzter Wochentag im Monat) ab 1970.
+    """
+    zone = ZoneInfo(tzid)
+    lines = ["BEGIN:VTIMEZONE", f"TZID:{tzid}"]
+    moment = datetime(year, 1, 1, tzinfo=dt_timezone.utc)
+    before = moment.astimezone(zone)
+    transitions = []
+    for _ in range(366 * 24):
+        moment += timedelta(hours=1)
+        after = moment.astimezone(zone)
+        if after.utcoffset() != before.utcoffset():
+            transitions.append((before, after))
+        before = after
+    if not transitions:
+        offset = _offset(before.utcoffset())
+        lines += ["BEGIN:STANDARD", f"TZOFFSETFROM:{offset}", f"TZOFFSETTO:{offset}",
+                  f"TZNAME:{before.tzname()}", "DTSTART:19700101T000000", "END:STANDARD"]
+    for old, new in transitions:
+        # wall clock time of the change, as seen before it
+        wall = (new - new.utcoffset() + old.utcoffset()).replace(tzinfo=None)
+        day = wall.date()
+        nth = -1 if (day + timedelta(days=7)).month != day.month else (day.day - 1) // 7 + 1
+        weekday = "MO TU WE TH FR SA SU".split()[day.weekday()]
+        start = datetime.combine(_nth_weekday(1970, day.month, day.weekday(), nth), wall.time())
+        component = "DAYLIGHT" if new.dst() else "STANDARD"
+        lines += [f"BEGIN:{component}", f"TZOFFSETFROM:{_offset(old.utcoffset())}",
+                  f"TZOFFSETTO:{_offset(new.utcoffset())}", f"TZNAME:{new.tzname()}",
+                  f"DTSTART:{start:%Y%m%dT%H%M%S}", f"RRULE:FREQ=YEARLY;BYMONTH={day.month};BYDAY={nth}{weekday}",
+                  f"END:{component}"]
+    lines.append("END:VTIMEZONE")
+    return lines
+
+
+def _event(uid, start, end, summary, location="", description="", extra=()):
+    lines = ["BEGIN:VEVENT", f"UID:{uid}", f"DTSTAMP:{timezone.now():%Y%m%dT%H%M%SZ}",
+             _when("DTSTART", start), _when("DTEND", end), f"SUMMARY:{_escape(summary)}"]
+    if location:
+        lines.append(f"LOCATION:{_escape(location)}")
+    if description:
+        lines.append(f"DESCRIPTION:{_escape(description)}")
+    lines.extend(extra)
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+
+# ------------------------------------------------------------------
+# feed
+# ------------------------------------------------------------------
+class CalendarFeed:
+    def __init__(self, teams, name):
+        self.team_ids = list(teams.values_list("id", flat=True)) if hasattr(teams, "values_list") else list(teams)
+        self.name = name
+        self.since = timezone.now() - timedelta(days=PAST_DAYS)
+        self._version = None
+
+    @classmethod
+    def for_token(cls, token):
+        """None, wenn der Link widerrufen ist oder der User nicht (mehr) im Team ist"""
+        kind, pk, user_id, key_version = read_token(token)
+        if not CustomUser.objects.filter(pk=user_id, is_active=True, calendar_key_version=key_version).exists():
+            return None
+        teams = Team.objects.filter(Q(players__id=user_id) | Q(trainers__id=user_id))
+        if kind == "team":
+            team = teams.filter(pk=pk).only("id", "name").first()
+            return cls([team.pk], team.name) if team else None
+        if kind == "user" and pk == user_id:
+            return cls(teams.distinct(), "Meine Teams")
+        return None
+
+    # -- querysets ---------------------------------------------------
+    def single_events(self):
+        return TrainingEvent.objects.filter(team_id__in=self.team_ids, series__isnull=True, start__gte=self.since)
+
+    def series(self):
+        return TrainingSeries.objects.filter(team_id__in=self.team_ids, end_date__gte=self.since.date())
+
+    def fixtures(self):
+        return Fixture.objects.filter(
+            Q(home_id__in=self.team_ids) | Q(away_id__in=self.team_ids), datetime__gte=self.since
+        )
+
+    # -- conditional GET --------------------------------------------
+    def version(self):
+        """returns (last_modified, etag) - fünf Aggregat-Abfragen, kein Rendern"""
+        if self._version is None:
+            stamps = []
+            for qs in (
+                TrainingEvent.objects.filter(team_id__in=self.team_ids, start__gte=self.since),
+                self.series(),
+                self.fixtures(),
+                # names shown in the feed: own and opposing teams, venues
+                Team.objects.filter(
+                    Q(pk__in=self.team_ids) | Q(home_fixtures__in=self.fixtures()) | Q(away_fixtures__in=self.fixtures())
+                ).distinct(),
+                Venue.objects.filter(fixture__in=self.fixtures()).distinct(),
+            ):
+                row = qs.aggregate(last=Max("updated_at"), n=Count("id"))
+                stamps.append(row)
+            last = max((row["last"] for row in stamps if row["last"]), default=None)
+            key = "|".join(f"{row['last'] and row['last'].isoformat()}:{row['n']}" for row in stamps)
+            key += f"|{','.join(map(str, sorted(self.team_ids)))}|{self.since.date()}|{self.name}"
+            self._version = (last, hashlib.md5(key.encode()).hexdigest())
+        return self._version
+
+    # -- rendering ---------------------------------------------------
+    def lines(self):
+        header = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN",
+                  f"X-WR-CALNAME:{_escape(self.name)}"]
+        if settings.TIME_ZONE != "UTC":
+            # every TZID used by _when() needs its definition in the calendar
+            header += vtimezone(settings.TIME_ZONE, timezone.now().year)
+        yield "".join(_fold(line) for line in header)
+
+        for ev in self.single_events().select_related("team").iterator(chunk_size=500):
+            yield _event(f"training-{ev.pk}@sportmaster", ev.start, ev.start + TRAINING_DURATION,
+                         f"Training {ev.team.name}", ev.location, ev.note)
+
+        series_events = Prefetch("events", queryset=TrainingEvent.objects.only("id", "series_id", "start"))
+        for series in self.series().select_related("team").prefetch_related(series_events):
+            targets = series.occurrence_datetimes()
+            if not targets:
+                continue
+            existing = {ev.start for ev in series.events.all()}
+            extra = [f"RRULE:FREQ=WEEKLY;UNTIL={targets[-1].astimezone(dt_timezone.utc):%Y%m%dT%H%M%SZ}"]
+            extra += [_when("EXDATE", start) for start in targets if start not in existing]
+            yield _event(f"series-{series.pk}@sportmaster", targets[0], targets[0] + TRAINING_DURATION,
+                         f"Training {series.team.name}", extra=extra)
+
+        for fixture in self.fixtures().select_related("home", "away", "venue").order_by("datetime").iterator(chunk_size=500):
+            summary = f"{fixture.home.name} – {fixture.away.name}"
+            if fixture.result_home is not None and fixture.result_away is not None:
+                summary += f" ({fixture.result_home}:{fixture.result_away})"
+            yield _event(f"fixture-{fixture.pk}@sportmaster", fixture.datetime, fixture.datetime + MATCH_DURATION,
+                         summary, fixture.venue.name if fixture.venue else "", fixture.competition)
+
+        yield "END:VCALENDAR\r\n"
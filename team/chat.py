@@ -0,0 +1,102 @@
+# teams/chat.py
+"""
+Keyset-Pagination für den Team-Chat.
+
+Ein Cursor ist ``<created_at in µs seit Epoch>_<id>`` und zeigt auf eine Nachricht;
+Abfragen laufen über den Index (team, -created_at, -id) ohne OFFSET und ohne COUNT(*).
+"""
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db.models import Q
+
+from .models import Message
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+PAGE_SIZE = 30
+POLL_LIMIT = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(message):
+    delta = message.created_at - EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return f"{micros}_{message.pk}"
+
+
+def decode_cursor(cursor):
+    try:
+        micros, pk = cursor.split("_", 1)
+        return EPOCH + timedelta(microseconds=int(micros)), int(pk)
+    except (AttributeError, ValueError, OverflowError):
+        raise InvalidCursor(cursor)
+
+
+def team_messages(team):
+    return Message.objects.filter(team=team).select_related("user").order_by("-created_at", "-id")
+
+
+def messages_before(team, cursor=None, limit=PAGE_SIZE):
+    """
+    Eine Seite Nachrichten (neueste zuerst), älter als ``cursor``.
+    returns (messages, next_cursor) - next_cursor ist None auf der letzten Seite
+    """
+    qs = team_messages(team)
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        qs = qs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    page = list(qs[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
+    return page, (encode_cursor(page[-1]) if has_more else None)
+
+
+def messages_since(team, cursor, limit=POLL_LIMIT):
+    """Nachrichten neuer als ``cursor``, älteste zuerst (für Polling)."""
+    created_at, pk = decode_cursor(cursor)
+    qs = (
+        Message.objects.filter(team=team)
+        .filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+        .select_related("user")
+        .order_by("created_at", "id")
+    )
+    return list(qs[:limit])
+
+
+def message_as_dict(message):
+    return {
+        "id": message.pk,
+        "user": message.user.get_full_name() or message.user.username,
+        "text": message.text,
+        "created_at": message.created_at.isoformat(),
+        "cursor": encode_cursor(message),
+    }
+
+
+# ------------------------------------------------------------------
+# WebSocket fan-out (siehe consumers.TeamChatConsumer)
+# ------------------------------------------------------------------
+def chat_group_name(team_id):
+    return f"team_chat_{team_id}"
+
+
+def broadcast_message(message):
+    """Schickt eine neue Nachricht an alle verbundenen Mitglieder des Teams."""
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    try:
+        async_to_sync(layer.group_send)(
+            chat_group_name(message.team_id),
+            {"type": "chat.message", "message": message_as_dict(message)},
+        )
+    except Exception:
+        # the message is stored either way; clients catch up via chat/since/<cursor>/
+        logger.warning("Chat-Broadcast für Team %s fehlgeschlagen", message.team_id, exc_info=True)
@@ -0,0 +1,56 @@
+# teams/consumers.py
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .chat import chat_group_name
+from .models import Team, Message
+from .roles import TeamRoles
+
+
+class TeamChatConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Team-Chat über WebSocket: eine Verbindung pro Mitglied, neue Nachrichten
+    kommen über die Channel-Layer-Gruppe des Teams (siehe chat.broadcast_message).
+    Authentifizierung über die Django-Session (AuthMiddlewareStack).
+    """
+
+    async def connect(self):
+        self.team = await self.get_team(self.scope["url_route"]["kwargs"]["slug"])
+        user = self.scope.get("user")
+        if self.team is None or user is None or not await self.is_member(user, self.team):
+            await self.close(code=4403)
+            return
+
+        self.group_name = chat_group_name(self.team.pk)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        if getattr(self, "group_name", None):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        # clients may send any JSON value; only {"text": "..."} is a message
+        if not isinstance(content, dict) or not isinstance(content.get("text"), str):
+            return
+        text = content["text"].strip()
+        if not text:
+            return
+        # saving triggers the fan-out to the whole group (post_save -> broadcast_message)
+        await self.save_message(text)
+
+    async def chat_message(self, event):
+        await self.send_json(event["message"])
+
+    # -- db helpers -----------------------------------------------------
+    @database_sync_to_async
+    def get_team(self, slug):
+        return Team.objects.filter(slug=slug).first()
+
+    @database_sync_to_async
+    def is_member(self, user, team):
+        return TeamRoles.resolve(user, team).is_member
+
+    @database_sync_to_async
+    def save_message(self, text):
+        return Message.objects.create(team=self.team, user=self.scope["user"], text=text)
@@ -0,0 +1,72 @@
+# teams/eligibility.py
+"""
+Spielberechtigung für den Kader eines Teams.
+
+Spieler im Kader müssen die Rolle "player" und einen gültigen Spielerpass haben
+(PlayerProfile, nicht abgelaufen - ohne Ablaufdatum gilt der Pass unbefristet).
+Geprüft wird der ganze Kader mit einer Abfrage, und zwar bevor er gespeichert
+wird; gemeldet werden alle nicht spielberechtigten Spieler auf einmal.
+
+Verwendet von TeamForm, dem Team-Admin und dem Spielerimport.
+"""
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models import CustomUser
+
+PLAYER_ROLE = "player"
+
+
+def ineligibility_reason(username, role, pass_number, expires_at, on):
+    """returns None, wenn der Spieler spielberechtigt ist, sonst die Begründung"""
+    if role != PLAYER_ROLE:
+        return f"{username} ist kein Spieler."
+    if pass_number is None:
+        return f"{username} hat keinen Spielerpass."
+    if expires_at is not None and expires_at < on:
+        return f"Der Spielerpass von {username} ist am {expires_at:%d.%m.%Y} abgelaufen."
+    return None
+
+
+class RosterError(ValidationError):
+    """Mindestens ein Spieler im Kader ist nicht spielberechtigt."""
+
+    def __init__(self, ineligible):
+        # ineligible: [(user_id, reason)]
+        self.ineligible = ineligible
+        super().__init__([reason for _, reason in ineligible])
+
+
+def ineligible_players(players, on=None):
+    """
+    players: Queryset, User-Objekte oder IDs
+    on: Stichtag für den Spielerpass (Standard: heute)
+    returns [(user_id, reason)] - eine Abfrage für den ganzen Kader
+    """
+    on = on or timezone.localdate()
+    if hasattr(players, "values"):
+        ids = players.values("pk")
+    else:
+        ids = [getattr(player, "pk", player) for player in players]
+        if not ids:
+            return []
+
+    rows = (
+        CustomUser.objects.filter(pk__in=ids)
+        .filter(
+            ~Q(role=PLAYER_ROLE)
+            | Q(player_profile__isnull=True)
+            | Q(player_profile__expires_at__lt=on)
+        )
+        .order_by("username")
+        .values_list("pk", "username", "role", "player_profile__pass_number", "player_profile__expires_at")
+    )
+    return [(pk, ineligibility_reason(username, role, number, expires, on)) for pk, username, role, number, expires in rows]
+
+
+def validate_roster(players, on=None):
+    """raises RosterError mit allen nicht spielberechtigten Spielern"""
+    ineligible = ineligible_players(players, on)
+    if ineligible:
+        raise RosterError(ineligible)
@@ -0,0 +1,159 @@
+# teams/exports.py
+"""
+Export vergebener Strafen (AssignedPenalty) als CSV oder XLSX - pro Team, Verein
+und optional eingeschränkt auf eine Saison.
+
+Die Zeilen kommen als Tupel (values_list) über .iterator(chunk_size=...) aus der
+Datenbank, es werden also nie alle Strafen gleichzeitig geladen:
+- CSV wird Zeile für Zeile in eine StreamingHttpResponse geschrieben,
+- XLSX wird mit XlsxWriter im constant_memory-Modus in eine temporäre Datei
+  geschrieben (jede Zeile wird sofort auf die Platte geleert) und dann als Datei
+  ausgeliefert.
+
+Texte aus Benutzereingaben (Namen, Strafen, Notizen) dürfen in Excel nicht als
+Formel ankommen: XLSX schreibt sie als Strings, CSV stellt Zellen mit einem
+Formelzeichen am Anfang ein ' voran.
+"""
+import csv
+import tempfile
+from datetime import date, datetime, time
+
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+
+from .models import AssignedPenalty
+
+CHUNK_SIZE = 2000
+# Saison 2024 = 01.07.2024 bis 30.06.2025
+SEASON_START_MONTH = 7
+
+HEADER = ("Datum", "Team", "Mitglied", "Benutzername", "Strafe", "Betrag", "Bezahlt", "Notiz", "Vergeben von")
+FIELDS = (
+    "assigned_at",
+    "team__name",
+    "user__first_name",
+    "user__last_name",
+    "user__username",
+    "penalty__title",
+    "penalty__amount",
+    "paid",
+    "note",
+    "assigned_by__username",
+)
+FORMATS = ("csv", "xlsx")
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# Excel/LibreOffice werten Zellen mit diesen Anfangszeichen als Formel aus
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def season_range(season):
+    """returns (start, end) als aware datetimes für die Saison, die im Jahr ``season`` beginnt"""
+    start = date(season, SEASON_START_MONTH, 1)
+    end = date(season + 1, SEASON_START_MONTH, 1)
+    tz = timezone.get_current_timezone()
+    return (timezone.make_aware(datetime.combine(start, time.min), tz),
+            timezone.make_aware(datetime.combine(end, time.min), tz))
+
+
+def penalties_for(team=None, club=None, season=None):
+    qs = AssignedPenalty.objects.all()
+    if team is not None:
+        qs = qs.filter(team=team)
+    if club is not None:
+        qs = qs.filter(team__club=club)
+    if season is not None:
+        start, end = season_range(season)
+        qs = qs.filter(assigned_at__gte=start, assigned_at__lt=end)
+    return qs
+
+
+def rows(queryset):
+    """Exportzeilen (ohne Kopfzeile) - gestreamt, ein Tupel pro Strafe."""
+    values = queryset.order_by("assigned_at", "id").values_list(*FIELDS)
+    for assigned_at, team, first, last, username, title, amount, paid, note, assigned_by in values.iterator(
+        chunk_size=CHUNK_SIZE
+    ):
+        yield (
+            timezone.localtime(assigned_at).replace(tzinfo=None),
+            team,
+            f"{first} {last}".strip() or username,
+            username,
+            title,
+            amount,
+            "ja" if paid else "nein",
+            note,
+            assigned_by or "",
+        )
+
+
+# ------------------------------------------------------------------
+# csv
+# ------------------------------------------------------------------
+class Echo:
+    """Pseudo-Datei für csv.writer: gibt die geschriebene Zeile direkt zurück."""
+
+    def write(self, value):
+        return value
+
+
+def text_cell(value):
+    """Text so maskieren, dass Tabellenprogramme ihn nicht als Formel ausführen."""
+    value = value or ""
+    return "'" + value if value.startswith(FORMULA_PREFIXES) else value
+
+
+def csv_lines(queryset):
+    writer = csv.writer(Echo(), delimiter=";")
+    # BOM, damit Excel die Datei als UTF-8 erkennt
+    yield "﻿" + writer.writerow(HEADER)
+    for when, team, name, username, title, amount, paid, note, assigned_by in rows(queryset):
+        yield writer.writerow([
+            f"{when:%d.%m.%Y %H:%M}", text_cell(team), text_cell(name), text_cell(username), text_cell(title),
+            f"{amount:.2f}".replace(".", ","), paid, text_cell(note), text_cell(assigned_by),
+        ])
+
+
+# ------------------------------------------------------------------
+# xlsx
+# ------------------------------------------------------------------
+def write_xlsx(queryset, fileobj):
+    import xlsxwriter
+
+    # user text stays text: no formulas, no auto-links
+    workbook = xlsxwriter.Workbook(
+        fileobj, {"constant_memory": True, "in_memory": False, "strings_to_formulas": False, "strings_to_urls": False}
+    )
+    sheet = workbook.add_worksheet("Strafen")
+    bold = workbook.add_format({"bold": True})
+    when_format = workbook.add_format({"num_format": "dd.mm.yyyy hh:mm"})
+    money = workbook.add_format({"num_format": "#,##0.00 €"})
+
+    # constant_memory: rows must be written strictly in order
+    sheet.write_row(0, 0, HEADER, bold)
+    sheet.set_column(0, 0, 16)
+    sheet.set_column(1, 4, 20)
+    sheet.set_column(7, 7, 40)
+    last = 0
+    for last, (when, team, name, username, title, amount, paid, note, assigned_by) in enumerate(rows(queryset), 1):
+        sheet.write_datetime(last, 0, when, when_format)
+        sheet.write_row(last, 1, (team, name, username, title))
+        sheet.write_number(last, 5, float(amount), money)
+        sheet.write_row(last, 6, (paid, note, assigned_by))
+    sheet.autofilter(0, 0, max(last, 1), len(HEADER) - 1)
+    workbook.close()
+
+
+# ------------------------------------------------------------------
+# responses
+# ------------------------------------------------------------------
+def export_response(queryset, fmt, filename):
+    """fmt: "csv" oder "xlsx"; filename ohne Endung"""
+    if fmt == "xlsx":
+        fileobj = tempfile.TemporaryFile()
+        write_xlsx(queryset, fileobj)
+        fileobj.seek(0)
+        return FileResponse(fileobj, as_attachment=True, filename=f"{filename}.xlsx", content_type=XLSX_CONTENT_TYPE)
+
+    response = StreamingHttpResponse(csv_lines(queryset), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+    return response
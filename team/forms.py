@@ -1,4 +1,5 @@
 from django import forms
+from .eligibility import validate_roster
 from .models import Team, Lineup, TrainingSeries, TrainingEvent, Message, Penalty
 
 class LineupForm(forms.ModelForm):
@@ -35,7 +36,17 @@ class MessageForm(forms.ModelForm):
         widgets = {"text": forms.Textarea(attrs={"rows": 3})}
 
 
-class TeamForm(forms.ModelForm):
+class RosterFormMixin:
+    """Prüft den Kader (players) vor dem Speichern - alle Fehler auf einmal, eine Abfrage."""
+
+    def clean_players(self):
+        players = self.cleaned_data.get("players")
+        if players:
+            validate_roster(players)
+        return players
+
+
+class TeamForm(RosterFormMixin, forms.ModelForm):
     class Meta:
         model = Team
         fields = [
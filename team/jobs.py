@@ -0,0 +1,43 @@
+# teams/jobs.py
+"""Hintergrund-Jobs des Team-Bereichs (siehe jobs.runner)."""
+import tempfile
+
+from jobs.runner import job, save_file
+from .exports import penalties_for, write_xlsx
+from .models import Team, TrainingSeries
+from .reminders import DEFAULT_HOURS, send_reminders
+
+
+@job("team.generate_series_events")
+def generate_series_events(series_id):
+    series = TrainingSeries.objects.select_related("team").filter(pk=series_id).first()
+    if series is None:
+        return {"created": 0}
+    return {"created": series.generate_events()}
+
+
+@job("team.sync_series_events")
+def sync_series_events(series_id):
+    series = TrainingSeries.objects.select_related("team").filter(pk=series_id).first()
+    if series is None:
+        return {"created": 0, "deleted": 0}
+    created, deleted = series.sync_events()
+    return {"created": created, "deleted": deleted}
+
+
+@job("team.export_penalties", bind=True)
+def export_penalties(entry, filename, team_id=None, club_id=None, season=None):
+    """XLSX-Export vergebener Strafen als Job-Datei (jobs.runner.save_file); returns {"file", "filename"}"""
+    from club.models import Club
+
+    team = Team.objects.get(pk=team_id) if team_id else None
+    club = Club.objects.get(pk=club_id) if club_id else None
+    with tempfile.TemporaryFile() as fileobj:
+        write_xlsx(penalties_for(team=team, club=club, season=season), fileobj)
+        fileobj.seek(0)
+        return save_file(entry, fileobj, f"{filename}.xlsx")
+
+
+@job("team.send_rsvp_reminders")
+def send_rsvp_reminders(hours=DEFAULT_HOURS):
+    return send_reminders(hours=hours)
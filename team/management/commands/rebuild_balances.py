@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from team import balances
+from team.models import Team
+
+
+class Command(BaseCommand):
+    help = "Baut die Strafenkonten (MemberBalance) aus allen vergebenen Strafen neu auf (Reparatur nach Importen oder queryset.update())."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--team", help="Slug: nur dieses Team neu aufbauen")
+
+    def handle(self, *args, **options):
+        team = None
+        if options["team"]:
+            team = Team.objects.filter(slug=options["team"]).first()
+            if team is None:
+                raise CommandError(f"Team {options['team']} nicht gefunden.")
+        rows = balances.rebuild(team)
+        self.stdout.write(self.style.SUCCESS(f"{rows} Konten neu aufgebaut."))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from team import rsvp_counts
+from team.models import Team, TrainingEvent
+
+
+class Command(BaseCommand):
+    help = "Gleicht die Zu-/Absage-Zähler der Trainings mit den TrainingRSVPs ab (Reparatur nach Importen, bulk_create oder queryset.update())."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--team", help="Slug: nur die Trainings dieses Teams prüfen")
+
+    def handle(self, *args, **options):
+        trainings = TrainingEvent.objects.all()
+        if options["team"]:
+            team = Team.objects.filter(slug=options["team"]).first()
+            if team is None:
+                raise CommandError(f"Team {options['team']} nicht gefunden.")
+            trainings = trainings.filter(team=team)
+        repaired = rsvp_counts.reconcile(trainings)
+        self.stdout.write(self.style.SUCCESS(f"{repaired} Trainings korrigiert."))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from team.jobs import send_rsvp_reminders
+from team.reminders import DEFAULT_HOURS, send_reminders
+
+
+class Command(BaseCommand):
+    help = "Erinnert Spieler per Web Push an fehlende Zu-/Absagen für Trainings in den nächsten Stunden (z.B. alle 15 Minuten per Cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=DEFAULT_HOURS, help="Trainings, die in den nächsten N Stunden beginnen")
+        parser.add_argument("--enqueue", action="store_true", help="als Hintergrund-Job an JOBS_BACKEND übergeben")
+
+    def handle(self, *args, **options):
+        if options["enqueue"]:
+            entry = send_rsvp_reminders.enqueue(label="RSVP-Erinnerungen", hours=options["hours"])
+            self.stdout.write(self.style.SUCCESS(f"Job {entry.pk} eingereiht."))
+            return
+        totals = send_reminders(hours=options["hours"])
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['events']} Trainings geprüft, {totals['reminded']} Spieler erinnert: "
+            f"{totals['sent']} gesendet, {totals['failed']} fehlgeschlagen, {totals['pruned']} erloschene Abos gelöscht."
+        ))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:09
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def remove_duplicate_events(apps, schema_editor):
+    # keep the oldest TrainingEvent per (team, start) so the constraint can be added
+    TrainingEvent = apps.get_model("team", "TrainingEvent")
+    duplicates = (
+        TrainingEvent.objects.values("team_id", "start")
+        .annotate(n=Count("id"), keep=Min("id"))
+        .filter(n__gt=1)
+    )
+    for row in duplicates:
+        TrainingEvent.objects.filter(team_id=row["team_id"], start=row["start"]).exclude(pk=row["keep"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0006_team_game_plan_h4a'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_events, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='trainingevent',
+            unique_together={('team', 'start')},
+        ),
+    ]
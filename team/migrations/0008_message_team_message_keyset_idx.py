@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0007_alter_trainingevent_unique_together'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['team', '-created_at', '-id'], name='team_message_keyset_idx'),
+        ),
+    ]
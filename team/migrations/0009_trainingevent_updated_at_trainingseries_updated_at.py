@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0008_message_team_message_keyset_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainingevent',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='trainingseries',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
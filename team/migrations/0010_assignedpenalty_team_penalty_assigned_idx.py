@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0009_trainingevent_updated_at_trainingseries_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignedpenalty',
+            index=models.Index(fields=['team', 'assigned_at'], name='team_penalty_assigned_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_balances(apps, schema_editor):
+    AssignedPenalty = apps.get_model("team", "AssignedPenalty")
+    MemberBalance = apps.get_model("team", "MemberBalance")
+    balances = {}
+    for row in AssignedPenalty.objects.values("team_id", "user_id", "paid").annotate(
+        total=Sum("penalty__amount"), n=Count("id")
+    ):
+        balance = balances.setdefault(
+            (row["team_id"], row["user_id"]), MemberBalance(team_id=row["team_id"], user_id=row["user_id"])
+        )
+        state = "paid" if row["paid"] else "open"
+        setattr(balance, f"{state}_amount", row["total"] or 0)
+        setattr(balance, f"{state}_count", row["n"])
+    MemberBalance.objects.bulk_create(balances.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0010_assignedpenalty_team_penalty_assigned_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('open_amount', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('paid_amount', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('open_count', models.IntegerField(default=0)),
+                ('paid_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balances', to='team.team')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='penalty_balances', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('team', 'user')},
+            },
+        ),
+        migrations.RunPython(fill_balances, migrations.RunPython.noop),
+    ]
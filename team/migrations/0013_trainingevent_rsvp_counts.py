@@ -0,0 +1,46 @@
+# Generated by Django 5.2.1 on 2026-10-18 15:05
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_counts(apps, schema_editor):
+    TrainingEvent = apps.get_model("team", "TrainingEvent")
+    TrainingRSVP = apps.get_model("team", "TrainingRSVP")
+    counts = {}
+    for row in TrainingRSVP.objects.values("training_id", "status").annotate(n=Count("id")).order_by():
+        if row["status"] in ("yes", "no", "maybe"):
+            counts.setdefault(row["training_id"], {})[f"{row['status']}_count"] = row["n"]
+    events = []
+    for training_id, fields in counts.items():
+        event = TrainingEvent(pk=training_id, yes_count=0, no_count=0, maybe_count=0)
+        for field, n in fields.items():
+            setattr(event, field, n)
+        events.append(event)
+    TrainingEvent.objects.bulk_update(events, ["yes_count", "no_count", "maybe_count"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0012_trainingreminder'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainingevent',
+            name='maybe_count',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='trainingevent',
+            name='no_count',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='trainingevent',
+            name='yes_count',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+    ]
@@ -1,13 +1,15 @@
 # teams/models.py (additions)
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta, date
-from django.core.exceptions import ValidationError
 from club.models import Sport
 
 User = settings.AUTH_USER_MODEL
 
+# how long a training occupies its venue / calendar slot
+TRAINING_DURATION = timedelta(minutes=getattr(settings, "TRAINING_DURATION_MINUTES", 90))
+
 class Lineup(models.Model):
     team = models.ForeignKey("Team", on_delete=models.CASCADE, related_name="lineups")
     name = models.CharField(max_length=200, blank=True)
@@ -29,29 +31,71 @@ class TrainingSeries(models.Model):
     end_date = models.DateField()
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.team.name} Serie {self.get_weekday_display()} {self.time}"
 
-    def generate_events(self):
+    def occurrence_datetimes(self):
         """
-        erzeugt TrainingEvent-Einträge von start_date bis end_date jeweils am angegebenen Wochentag
-        returns number created
+        alle Termine der Serie (aware datetimes) von start_date bis end_date, rein in Python berechnet
         """
-        from datetime import timedelta
-        created = 0
         current = self.start_date
         # move to first matching weekday
         days_ahead = (self.weekday - current.weekday()) % 7
         current = current + timedelta(days=days_ahead)
+        occurrences = []
         while current <= self.end_date:
-            start_dt = timezone.make_aware(timezone.datetime.combine(current, self.time))
-            # avoid duplicates
-            if not TrainingEvent.objects.filter(team=self.team, start=start_dt).exists():
-                TrainingEvent.objects.create(team=self.team, start=start_dt, created_by=self.created_by, series=self)
-                created += 1
+            occurrences.append(timezone.make_aware(timezone.datetime.combine(current, self.time)))
             current = current + timedelta(days=7)
-        return created
+        return occurrences
+
+    def generate_events(self):
+        """
+        erzeugt TrainingEvent-Einträge von start_date bis end_date jeweils am angegebenen Wochentag
+        (Serie sperren, eine Abfrage für vorhandene Termine, ein bulk INSERT für die fehlenden,
+        eine zum Nachzählen)
+        returns number created
+        """
+        targets = self.occurrence_datetimes()
+        if not targets:
+            return 0
+        with transaction.atomic():
+            # one call per series at a time, so the events of this series counted below are ours
+            TrainingSeries.objects.select_for_update().filter(pk=self.pk).values_list("pk", flat=True).first()
+            # avoid duplicates: one query for all existing starts of the team in the series' range
+            existing = set(
+                TrainingEvent.objects.filter(team=self.team, start__range=(targets[0], targets[-1]))
+                .values_list("start", flat=True)
+            )
+            missing = [start_dt for start_dt in targets if start_dt not in existing]
+            if not missing:
+                return 0
+            # unique (team, start) skips events another path created meanwhile; ignore_conflicts
+            # doesn't report skipped rows, so count this series' events among the missing starts
+            TrainingEvent.objects.bulk_create(
+                [TrainingEvent(team=self.team, start=start_dt, created_by=self.created_by, series=self) for start_dt in missing],
+                ignore_conflicts=True,
+            )
+            return TrainingEvent.objects.filter(series=self, start__in=missing).count()
+
+    def sync_events(self):
+        """
+        gleicht die Termine der Serie nach einer Änderung (z.B. end_date) ab:
+        löscht eigene Termine, die nicht mehr in der Serie liegen, und legt fehlende an
+        returns (created, deleted)
+        """
+        targets = set(self.occurrence_datetimes())
+        stale = [
+            pk for pk, start in self.events.values_list("pk", "start")
+            if start not in targets
+        ]
+        deleted = 0
+        if stale:
+            _, per_model = TrainingEvent.objects.filter(pk__in=stale).delete()
+            deleted = per_model.get(TrainingEvent._meta.label, 0)
+        created = self.generate_events()
+        return created, deleted
 
 class TrainingEvent(models.Model):
     team = models.ForeignKey("Team", on_delete=models.CASCADE, related_name="training_events")
@@ -60,7 +104,15 @@ class TrainingEvent(models.Model):
     note = models.TextField(blank=True)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
     series = models.ForeignKey(TrainingSeries, null=True, blank=True, on_delete=models.SET_NULL, related_name="events")
+    # RSVP counters, kept up to date by signals (see rsvp_counts.py)
+    yes_count = models.PositiveSmallIntegerField(default=0, editable=False)
+    no_count = models.PositiveSmallIntegerField(default=0, editable=False)
+    maybe_count = models.PositiveSmallIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("team", "start")
 
     def __str__(self):
         return f"{self.team.name} Training {self.start}"
@@ -76,6 +128,15 @@ class TrainingRSVP(models.Model):
     class Meta:
         unique_together = ("training", "user")
 
+class TrainingReminder(models.Model):
+    """RSVP-Erinnerung wurde verschickt (höchstens eine pro Training und Spieler, siehe reminders.py)."""
+    training = models.ForeignKey(TrainingEvent, on_delete=models.CASCADE, related_name="reminders")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("training", "user")
+
 class Message(models.Model):
     team = models.ForeignKey("Team", on_delete=models.CASCADE, related_name="messages")
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -84,6 +145,10 @@ class Message(models.Model):
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            # keyset pagination of the team chat: WHERE team = ? AND (created_at, id) < (?, ?)
+            models.Index(fields=["team", "-created_at", "-id"], name="team_message_keyset_idx"),
+        ]
 
 
 class AgeGroup(models.Model):
@@ -115,19 +180,11 @@ class Team(models.Model):
     def __str__(self):
         return f"{self.name} ({self.club.name})"
 
-    def clean(self):
-        """Players dürfen nur User mit Rolle 'player' UND gültigem PlayerPass sein."""
-        if self.pk:  # nur prüfen, wenn Team schon gespeichert ist
-            for p in self.players.all():
-                if p.role != "player":
-                    raise ValidationError(f"{p.username} ist kein Spieler.")
-                if not hasattr(p, "player_profile"):
-                    raise ValidationError(f"{p.username} hat keinen gültigen Spielerpass.")
-
-
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
+        # validate before the write; the roster (M2M) is checked where it is edited,
+        # see team.eligibility (TeamForm, admin, player import)
         self.full_clean()
+        super().save(*args, **kwargs)
 
 class Penalty(models.Model):
     team = models.ForeignKey("Team", on_delete=models.CASCADE, related_name="penalty_catalog")
@@ -148,9 +205,31 @@ class AssignedPenalty(models.Model):
     paid = models.BooleanField(default=False)
     assigned_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name="penalties_assigned")
 
+    class Meta:
+        indexes = [
+            # exports stream a team's penalties in assignment order
+            models.Index(fields=["team", "assigned_at"], name="team_penalty_assigned_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user} - {self.penalty.title} - {'paid' if self.paid else 'open'}"
 
+class MemberBalance(models.Model):
+    """Offene/bezahlte Strafen pro Mitglied, fortgeschrieben von team.balances."""
+    team = models.ForeignKey("Team", on_delete=models.CASCADE, related_name="balances")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="penalty_balances")
+    open_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    paid_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    open_count = models.IntegerField(default=0)
+    paid_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("team", "user")
+
+    def __str__(self):
+        return f"{self.user} - {self.team}: {self.open_amount} € offen"
+
 class Team_Tabel_H4A(models.Model):
     team = models.ForeignKey(Team, on_delete=models.CASCADE)
     eingebetteter_code = models.TextField(null=True, blank=True)  # Feld für eingebetteten Code
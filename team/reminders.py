@@ -0,0 +1,119 @@
+# teams/reminders.py
+"""
+Web-Push-Erinnerung an Spieler, die für ein bald beginnendes Training noch nicht
+zu- oder abgesagt haben.
+
+Die Trainings im Zeitfenster werden in Blöcken zu BATCH_SIZE verarbeitet. Pro
+Block, in einer kurzen Transaktion:
+- die Trainings des Blocks werden gesperrt (select_for_update, skip_locked) -
+  ein gleichzeitig laufender zweiter Lauf überspringt sie, statt dieselben
+  Spieler noch einmal zu erinnern,
+- eine Anti-Join-Abfrage liefert alle (Training, Spieler, Push-Abo) ohne
+  TrainingRSVP und ohne bereits verschickte Erinnerung,
+- ein bulk INSERT merkt die Erinnerungen vor (vor dem Versand: lieber eine
+  Erinnerung verlieren als doppelt schicken).
+Danach, außerhalb der Transaktion,
+- die Nachricht wird pro Training einmal gerendert und über accounts.push
+  (begrenzter Thread-Pool, Wiederholungen, erloschene Abos werden gelöscht)
+  verschickt.
+"""
+import json
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.push import RETRY_DELAY, send_all
+from .models import Team, TrainingEvent, TrainingReminder, TrainingRSVP
+
+DEFAULT_HOURS = 24
+BATCH_SIZE = 200
+
+
+def upcoming_events(hours=DEFAULT_HOURS, now=None):
+    now = now or timezone.now()
+    return TrainingEvent.objects.filter(start__gt=now, start__lte=now + timedelta(hours=hours))
+
+
+def missing_rsvps(event_ids):
+    """
+    returns [(event_id, user_id, subscription_id, endpoint, p256dh, auth)]
+    - Spieler der Teams ohne Zu-/Absage und ohne Erinnerung, mit Push-Abo; eine Abfrage
+    """
+    answered = TrainingRSVP.objects.filter(training=OuterRef("event_id"), user=OuterRef("customuser_id"))
+    reminded = TrainingReminder.objects.filter(training=OuterRef("event_id"), user=OuterRef("customuser_id"))
+    return list(
+        Team.players.through.objects.filter(
+            team__training_events__in=event_ids,
+            customuser__push_subscriptions__isnull=False,
+        )
+        .annotate(event_id=F("team__training_events"))
+        .filter(~Exists(answered), ~Exists(reminded))
+        .values_list(
+            "event_id",
+            "customuser_id",
+            "customuser__push_subscriptions__id",
+            "customuser__push_subscriptions__endpoint",
+            "customuser__push_subscriptions__p256dh",
+            "customuser__push_subscriptions__auth",
+        )
+    )
+
+
+def render_payload(event_id, start, team_name, team_slug):
+    start = timezone.localtime(start)
+    return json.dumps({
+        "title": f"Training {team_name}",
+        "body": f"Training am {start:%d.%m.} um {start:%H:%M} Uhr - bitte zu- oder absagen.",
+        "url": reverse("team_detail_members", kwargs={"slug": team_slug}),
+        "tag": f"rsvp-{event_id}",
+    })
+
+
+def _batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def send_reminders(hours=DEFAULT_HOURS, now=None, transport=None, batch_size=BATCH_SIZE, retry_delay=RETRY_DELAY):
+    """returns {"events", "reminded", "sent", "rejected", "failed", "pruned"}"""
+    totals = {"events": 0, "reminded": 0, "sent": 0, "rejected": 0, "failed": 0, "pruned": 0}
+    events = (
+        upcoming_events(hours, now)
+        .order_by("start", "id")
+        .values_list("id", "start", "team__name", "team__slug")
+    )
+    for batch in _batches(events.iterator(chunk_size=batch_size), batch_size):
+        totals["events"] += len(batch)
+        with transaction.atomic():
+            # events another run is working on are skipped; their reminders are that run's job
+            locked = list(
+                TrainingEvent.objects.select_for_update(skip_locked=True)
+                .filter(pk__in=[event[0] for event in batch])
+                .values_list("pk", flat=True)
+            )
+            rows = missing_rsvps(locked) if locked else []
+            pairs = {(event_id, user_id) for event_id, user_id, *_ in rows}
+            TrainingReminder.objects.bulk_create(
+                [TrainingReminder(training_id=event_id, user_id=user_id) for event_id, user_id in pairs]
+            )
+        if not rows:
+            continue
+        payloads = {event[0]: render_payload(*event) for event in batch}
+        messages = [
+            (subscription_id, {"endpoint": endpoint, "keys": {"p256dh": p256dh, "auth": auth}}, payloads[event_id])
+            for event_id, _, subscription_id, endpoint, p256dh, auth in rows
+        ]
+        counts = send_all(messages, transport=transport, retry_delay=retry_delay)
+        totals["reminded"] += len(pairs)
+        for key, value in counts.items():
+            totals[key] += value
+    return totals
@@ -0,0 +1,66 @@
+# teams/roles.py
+from django.db.models import Exists, OuterRef
+
+from .models import Team
+
+# Rollen, die jedes Team wie ein Trainer verwalten dürfen
+ADMIN_ROLES = ("club_admin", "global_admin", "federation_admin")
+
+
+class TeamRoles:
+    """
+    Rollen eines Users in einem Team (Trainer / Spieler / Kassenwart).
+    Wird einmal pro (Request, Team) mit einer einzigen Abfrage ermittelt, siehe team_roles().
+    """
+
+    def __init__(self, is_trainer=False, is_player=False, is_cashier=False):
+        self.is_trainer = is_trainer
+        self.is_player = is_player
+        self.is_cashier = is_cashier
+
+    @property
+    def is_member(self):
+        return self.is_player or self.is_trainer
+
+    @classmethod
+    def resolve(cls, user, team):
+        if not user.is_authenticated:
+            return cls()
+
+        membership = Team.objects.filter(pk=team.pk).annotate(
+            user_is_trainer=Exists(Team.trainers.through.objects.filter(team_id=OuterRef("pk"), customuser_id=user.pk)),
+            user_is_player=Exists(Team.players.through.objects.filter(team_id=OuterRef("pk"), customuser_id=user.pk)),
+        ).values_list("user_is_trainer", "user_is_player").first()
+        trainer, player = membership or (False, False)
+
+        return cls(
+            is_trainer=trainer or user.role in ADMIN_ROLES,
+            is_player=player,
+            # team.cashier is a FK to user on Team model
+            is_cashier=team.cashier_id is not None and team.cashier_id == user.pk,
+        )
+
+    def __repr__(self):
+        return f"<TeamRoles trainer={self.is_trainer} player={self.is_player} cashier={self.is_cashier}>"
+
+
+def team_roles(request, team):
+    """Memoized TeamRoles for request.user in team (cached on the request)."""
+    cache = getattr(request, "_team_roles", None)
+    if cache is None:
+        cache = request._team_roles = {}
+    if team.pk not in cache:
+        cache[team.pk] = TeamRoles.resolve(request.user, team)
+    return cache[team.pk]
+
+
+def member_teams(user):
+    """Teams, deren Mitgliederbereich der User sehen darf (Trainer/Spieler; Admin-Rollen: alle)."""
+    if not user.is_authenticated:
+        return Team.objects.none()
+    if user.role in ADMIN_ROLES:
+        return Team.objects.all()
+    return Team.objects.filter(
+        Exists(Team.trainers.through.objects.filter(team_id=OuterRef("pk"), customuser_id=user.pk))
+        | Exists(Team.players.through.objects.filter(team_id=OuterRef("pk"), customuser_id=user.pk))
+    )
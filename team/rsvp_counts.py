@@ -0,0 +1,66 @@
+# teams/rsvp_counts.py
+"""
+Zu-/Absagen pro Training als Zähler auf TrainingEvent (yes_count/no_count/maybe_count).
+
+Jede Änderung an einer TrainingRSVP verschiebt per UPDATE mit F-Ausdrücken
+höchstens zwei Zähler (alter Status -1, neuer Status +1) - ohne die RSVPs
+zu lesen und ohne Wettlauf zwischen gleichzeitigen Zusagen. Ausgelöst wird das
+über Signale (signals.py). bulk_create/queryset.update() laufen daran vorbei;
+reconcile() bzw. ``manage.py reconcile_rsvp_counts`` zählt neu.
+"""
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import TrainingEvent, TrainingRSVP
+
+COUNT_FIELDS = {"yes": "yes_count", "no": "no_count", "maybe": "maybe_count"}
+
+
+def rsvp_key(rsvp):
+    return (rsvp.training_id, rsvp.status)
+
+
+def rsvp_changed(old, new):
+    """old/new: rsvp_key() vor bzw. nach der Änderung (None = nicht vorhanden)"""
+    if old == new:
+        return
+    changes = {}
+    for key, step in ((old, -1), (new, 1)):
+        if key is None or key[1] not in COUNT_FIELDS:
+            continue
+        training_id, status = key
+        field = COUNT_FIELDS[status]
+        changes.setdefault(training_id, {})[field] = (
+            Greatest(F(field) - 1, Value(0)) if step < 0 else F(field) + 1
+        )
+    for training_id, fields in changes.items():
+        TrainingEvent.objects.filter(pk=training_id).update(**fields)
+
+
+def actual_counts():
+    """Subqueries je Zähler, korreliert mit dem äußeren TrainingEvent"""
+    return {
+        field: Coalesce(
+            Subquery(
+                TrainingRSVP.objects.filter(training=OuterRef("pk"), status=status)
+                .order_by()
+                .values("training")
+                .annotate(n=Count("id"))
+                .values("n"),
+                output_field=IntegerField(),
+            ),
+            0,
+        )
+        for status, field in COUNT_FIELDS.items()
+    }
+
+
+def reconcile(queryset=None):
+    """Zählt die Zähler neu, wo sie abweichen; returns Anzahl reparierter Trainings."""
+    queryset = TrainingEvent.objects.all() if queryset is None else queryset
+    actual = {f"actual_{field}": expression for field, expression in actual_counts().items()}
+    in_sync = Q(**{field: F(f"actual_{field}") for field in COUNT_FIELDS.values()})
+    drifted = list(queryset.annotate(**actual).exclude(in_sync).values_list("pk", flat=True))
+    if drifted:
+        TrainingEvent.objects.filter(pk__in=drifted).update(**actual_counts())
+    return len(drifted)
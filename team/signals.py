@@ -0,0 +1,96 @@
+# teams/signals.py
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from . import balances, rsvp_counts
+from .chat import broadcast_message
+from .models import AssignedPenalty, Message, Penalty, TrainingEvent, TrainingRSVP
+
+BALANCE_FIELDS = {"team_id", "user_id", "penalty_id", "paid"}
+
+
+@receiver(post_save, sender=Message)
+def fan_out_message(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        transaction.on_commit(lambda: broadcast_message(instance))
+
+
+# ------------------------------------------------------------------
+# Strafenkonten fortschreiben
+# ------------------------------------------------------------------
+@receiver(post_init, sender=AssignedPenalty)
+def remember_balance_key(sender, instance, **kwargs):
+    # state as loaded from the DB; skipped for .only()/.defer() instances
+    if instance.pk is None or BALANCE_FIELDS & instance.get_deferred_fields():
+        instance._balance_key = None
+    else:
+        instance._balance_key = balances.penalty_key(instance)
+
+
+def _known_amount(instance):
+    if AssignedPenalty.penalty.is_cached(instance) and instance.penalty is not None:
+        return {instance.penalty_id: instance.penalty.amount}
+    return None
+
+
+@receiver(post_save, sender=AssignedPenalty)
+def update_balance(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    new_key = balances.penalty_key(instance)
+    if created:
+        balances.penalty_changed(None, new_key, _known_amount(instance))
+    elif instance._balance_key is None:
+        balances.rebuild(instance.team_id)
+    else:
+        balances.penalty_changed(instance._balance_key, new_key, _known_amount(instance))
+    instance._balance_key = new_key
+
+
+@receiver(post_delete, sender=AssignedPenalty)
+def remove_from_balance(sender, instance, **kwargs):
+    balances.penalty_changed(balances.penalty_key(instance), None, _known_amount(instance))
+
+
+@receiver(post_init, sender=Penalty)
+def remember_amount(sender, instance, **kwargs):
+    instance._balance_amount = None if "amount" in instance.get_deferred_fields() else instance.amount
+
+
+@receiver(post_save, sender=Penalty)
+def reprice_balances(sender, instance, created, raw=False, **kwargs):
+    # a catalog price change affects every penalty of that kind
+    if not raw and not created and instance._balance_amount != instance.amount:
+        balances.rebuild(instance.team_id)
+    instance._balance_amount = instance.amount
+
+
+# ------------------------------------------------------------------
+# RSVP-Zähler auf TrainingEvent fortschreiben
+# ------------------------------------------------------------------
+@receiver(post_init, sender=TrainingRSVP)
+def remember_rsvp_key(sender, instance, **kwargs):
+    if instance.pk is None or {"training_id", "status"} & instance.get_deferred_fields():
+        instance._rsvp_key = None
+    else:
+        instance._rsvp_key = rsvp_counts.rsvp_key(instance)
+
+
+@receiver(post_save, sender=TrainingRSVP)
+def update_rsvp_counts(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    new_key = rsvp_counts.rsvp_key(instance)
+    if created:
+        rsvp_counts.rsvp_changed(None, new_key)
+    elif instance._rsvp_key is None:
+        rsvp_counts.reconcile(TrainingEvent.objects.filter(pk=instance.training_id))
+    else:
+        rsvp_counts.rsvp_changed(instance._rsvp_key, new_key)
+    instance._rsvp_key = new_key
+
+
+@receiver(post_delete, sender=TrainingRSVP)
+def remove_rsvp_count(sender, instance, **kwargs):
+    rsvp_counts.rsvp_changed(rsvp_counts.rsvp_key(instance), None)
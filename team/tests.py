@@ -1,3 +1,481 @@
-from django.test import TestCase
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.core import signing
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser, PlayerProfile, PushSubscription, Sport
+from accounts.push import RecordingTransport
+from club.models import Club
+from match.models import Fixture
+from venue.models import Venue
+from decimal import Decimal
+
+from . import balances, calendar, exports, reminders, rsvp_counts
+from .eligibility import ineligible_players
+from .forms import TeamForm
+from .models import AgeGroup, Team, Lineup, TrainingEvent, TrainingRSVP, TrainingReminder, Message, Penalty, AssignedPenalty, MemberBalance
+
+
+class MemberTeamViewQueryTests(TestCase):
+    """member_team_view must run a fixed number of queries, whatever the team's data volume."""
+
+    @classmethod
+    def setUpTestData(cls):
+        club = Club.objects.create(name="TV Test", slug="tv-test")
+        cls.team = Team.objects.create(
+            name="Herren 1",
+            club=club,
+            slug="herren-1",
+            sport=Sport.objects.create(name="Handball"),
+            age_group=AgeGroup.objects.create(name="Senioren"),
+        )
+        cls.player = CustomUser.objects.create_user(username="player", password="pw")
+        cls.trainer = CustomUser.objects.create_user(username="trainer", password="pw", role="coach")
+        cls.others = CustomUser.objects.bulk_create(
+            [CustomUser(username=f"p{i}", short_id=f"p{i}") for i in range(5)]
+        )
+        cls.team.players.add(cls.player, *cls.others)
+        cls.team.trainers.add(cls.trainer)
+
+    def seed(self, n):
+        now = timezone.now()
+        events = TrainingEvent.objects.bulk_create(
+            [TrainingEvent(team=self.team, start=now + timedelta(days=i + 1)) for i in range(n)]
+        )
+        TrainingRSVP.objects.bulk_create(
+            [TrainingRSVP(training=ev, user=u, status="yes") for ev in events for u in [self.player, *self.others]]
+        )
+        lineups = Lineup.objects.bulk_create(
+            [Lineup(team=self.team, name=f"Spiel {i}", date=now + timedelta(days=i + 1)) for i in range(n)]
+        )
+        Lineup.players.through.objects.bulk_create(
+            [Lineup.players.through(lineup=l, customuser=u) for l in lineups for u in self.others]
+        )
+        Message.objects.bulk_create(
+            [Message(team=self.team, user=self.player, text=f"msg {i}") for i in range(n)]
+        )
+        penalty = Penalty.objects.create(team=self.team, title="Zu spät", amount="5.00")
+        AssignedPenalty.objects.bulk_create(
+            [AssignedPenalty(team=self.team, user=u, penalty=penalty) for _ in range(n) for u in self.others]
+        )
+        balances.rebuild(self.team)
+
+    def assert_query_budget(self, n):
+        self.seed(n)
+        self.client.force_login(self.player)
+        url = reverse("team_detail_members", kwargs={"slug": self.team.slug})
+        with self.assertNumQueries(11):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_query_count_10_events(self):
+        self.assert_query_budget(10)
+
+    def test_query_count_500_events(self):
+        self.assert_query_budget(500)
+
+
+class RSVPCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.team = Team.objects.create(
+            name="Herren 2",
+            club=Club.objects.create(name="TV Zähler", slug="tv-zaehler"),
+            slug="herren-2",
+            sport=Sport.objects.create(name="Handball"),
+            age_group=AgeGroup.objects.create(name="Senioren"),
+        )
+        cls.player = CustomUser.objects.create_user(username="player", password="pw")
+        cls.team.players.add(cls.player)
+        cls.event = TrainingEvent.objects.create(team=cls.team, start=timezone.now() + timedelta(days=1))
+
+    def counts(self):
+        self.event.refresh_from_db()
+        return (self.event.yes_count, self.event.no_count, self.event.maybe_count)
+
+    def rsvp(self, status, **extra):
+        url = reverse("training_rsvp", kwargs={"slug": self.team.slug, "pk": self.event.pk})
+        self.client.post(url, {"status": status, **extra}, HTTP_HOST="localhost")
+
+    def test_rsvp_view_moves_counters(self):
+        self.client.force_login(self.player)
+        self.rsvp("yes")
+        self.assertEqual(self.counts(), (1, 0, 0))
+        self.rsvp("no", comment="krank")
+        self.assertEqual(self.counts(), (0, 1, 0))
+        self.rsvp("no")
+        self.assertEqual(self.counts(), (0, 1, 0))
+        self.assertEqual(TrainingRSVP.objects.get().comment, "krank")
+        TrainingRSVP.objects.get().delete()
+        self.assertEqual(self.counts(), (0, 0, 0))
+
+    def test_reconcile_repairs_drift(self):
+        others = CustomUser.objects.bulk_create([CustomUser(username=f"r{i}", short_id=f"r{i}") for i in range(3)])
+        TrainingRSVP.objects.bulk_create(
+            [TrainingRSVP(training=self.event, user=u, status=s) for u, s in zip(others, ("yes", "yes", "maybe"))]
+        )
+        self.assertEqual(self.counts(), (0, 0, 0))
+        self.assertEqual(rsvp_counts.reconcile(), 1)
+        self.assertEqual(self.counts(), (2, 0, 1))
+        self.assertEqual(rsvp_counts.reconcile(), 0)
+
+
+class TrainingEventCreateTests(TestCase):
+    def test_duplicate_start_is_a_form_error(self):
+        team = Team.objects.create(
+            name="Herren 4",
+            club=Club.objects.create(name="TV Termin", slug="tv-termin"),
+            slug="herren-4",
+            sport=Sport.objects.create(name="Handball"),
+            age_group=AgeGroup.objects.create(name="Senioren"),
+        )
+        trainer = CustomUser.objects.create_user(username="trainer", password="pw", role="coach")
+        team.trainers.add(trainer)
+        self.client.force_login(trainer)
+        url = reverse("training_event_create", kwargs={"slug": team.slug})
+        data = {"start": "2026-11-02T19:00", "location": "Halle", "note": ""}
+
+        self.assertEqual(self.client.post(url, data, HTTP_HOST="localhost").status_code, 302)
+        response = self.client.post(url, data, HTTP_HOST="localhost")
+        self.assertContains(response, "Zu diesem Zeitpunkt gibt es bereits ein Training.")
+        self.assertEqual(TrainingEvent.objects.filter(team=team).count(), 1)
+
+
+class CalendarFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        club = Club.objects.create(name="TV Kalender", slug="tv-kalender")
+        sport = Sport.objects.create(name="Handball")
+        age_group = AgeGroup.objects.create(name="Senioren")
+        cls.team, cls.opponent = [
+            Team.objects.create(name=name, club=club, slug=slug, sport=sport, age_group=age_group)
+            for name, slug in (("Herren 5", "herren-5"), ("Gäste", "gaeste"))
+        ]
+        cls.player = CustomUser.objects.create_user(username="abo", password="pw")
+        cls.team.players.add(cls.player)
+        cls.venue = Venue.objects.create(name="Halle Nord", slug="halle-nord")
+        Fixture.objects.create(home=cls.team, away=cls.opponent, venue=cls.venue, slug="kalender-spiel",
+                               datetime=timezone.now() + timedelta(days=3))
+
+    def get(self, token, **headers):
+        return self.client.get(reverse("calendar_feed", args=[token]), HTTP_HOST="localhost", **headers)
+
+    @override_settings(TIME_ZONE="Europe/Berlin")
+    def test_feed_defines_its_timezone(self):
+        body = b"".join(self.get(calendar.feed_token("team", self.team.pk, self.player)).streaming_content).decode()
+        self.assertIn("DTSTART;TZID=Europe/Berlin:", body)
+        self.assertIn("BEGIN:VTIMEZONE\r\nTZID:Europe/Berlin\r\n", body)
+        self.assertIn("RRULE:FREQ=YEARLY;BYMONTH=10;BYDAY=-1SU", body)
+
+    def test_links_are_revoked_and_follow_membership(self):
+        team_token = calendar.feed_token("team", self.team.pk, self.player)
+        user_token = calendar.feed_token("user", self.player.pk, self.player)
+        self.assertEqual(self.get(team_token).status_code, 200)
+        self.assertEqual(self.get(signing.dumps(["team", self.team.pk], salt=calendar.FEED_SALT)).status_code, 404)
+        self.assertEqual(self.get(calendar.feed_token("user", self.opponent.pk, self.player)).status_code, 404)
+
+        self.client.force_login(self.player)
+        self.client.post(reverse("calendar_revoke", args=[self.team.slug]), HTTP_HOST="localhost")
+        self.client.logout()
+        self.player.refresh_from_db()
+        self.assertEqual(self.get(team_token).status_code, 404)
+        self.assertEqual(self.get(user_token).status_code, 404)
+        team_token = calendar.feed_token("team", self.team.pk, self.player)
+        self.assertEqual(self.get(team_token).status_code, 200)
+
+        self.team.players.remove(self.player)
+        self.assertEqual(self.get(team_token).status_code, 404)
+
+    def test_etag_follows_team_and_venue_names(self):
+        token = calendar.feed_token("team", self.team.pk, self.player)
+        etags = [self.get(token)["ETag"]]
+        for obj, name in ((self.venue, "Halle Süd"), (self.opponent, "Gäste II")):
+            # renames must change the timestamp even within the same second
+            obj.name = name
+            obj.save()
+            type(obj).objects.filter(pk=obj.pk).update(updated_at=timezone.now() + timedelta(minutes=1 + len(etags)))
+            etags.append(self.get(token)["ETag"])
+            self.assertEqual(self.get(token, HTTP_IF_NONE_MATCH=etags[-1]).status_code, 304)
+        self.assertEqual(len(set(etags)), 3)
+
+
+class MemberBalanceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        club = Club.objects.create(name="TV Kasse", slug="tv-kasse")
+        cls.cashier = CustomUser.objects.create_user(username="kasse", password="pw")
+        cls.team = Team.objects.create(
+            name="Herren 2",
+            club=club,
+            slug="herren-2",
+            sport=Sport.objects.create(name="Handball"),
+            age_group=AgeGroup.objects.create(name="Senioren"),
+            cashier=cls.cashier,
+        )
+        cls.players = CustomUser.objects.bulk_create(
+            [CustomUser(username=f"k{i}", short_id=f"k{i}") for i in range(3)]
+        )
+        cls.late = Penalty.objects.create(team=cls.team, title="Zu spät", amount="2.50")
+        cls.shirt = Penalty.objects.create(team=cls.team, title="Trikot vergessen", amount="10.00")
+
+    def balance(self, user):
+        return MemberBalance.objects.get(team=self.team, user=user)
+
+    def assert_matches_rebuild(self):
+        ledger = set(MemberBalance.objects.values_list("user_id", "open_amount", "paid_amount", "open_count", "paid_count"))
+        balances.rebuild(self.team)
+        rebuilt = set(MemberBalance.objects.values_list("user_id", "open_amount", "paid_amount", "open_count", "paid_count"))
+        self.assertEqual(ledger, rebuilt)
+
+    def test_assign_and_mark_paid_views_update_balance(self):
+        self.client.force_login(self.cashier)
+        player = self.players[0]
+        for penalty in (self.late, self.shirt, self.late):
+            self.client.post(
+                reverse("penalty_assign", kwargs={"slug": self.team.slug}),
+                {"penalty_id": penalty.pk, "user_id": player.pk},
+            )
+        self.assertEqual(self.balance(player).open_amount, Decimal("15.00"))
+
+        assigned = AssignedPenalty.objects.filter(penalty=self.shirt).get()
+        url = reverse("penalty_mark_paid", kwargs={"slug": self.team.slug, "assigned_id": assigned.pk})
+        self.client.post(url)
+        self.client.post(url)  # already paid: no double booking
+        balance = self.balance(player)
+        self.assertEqual((balance.open_amount, balance.paid_amount), (Decimal("5.00"), Decimal("10.00")))
+        self.assertEqual((balance.open_count, balance.paid_count), (2, 1))
+        self.assert_matches_rebuild()
+
+    def test_mark_all_paid_and_reprice(self):
+        AssignedPenalty.objects.bulk_create(
+            [AssignedPenalty(team=self.team, user=u, penalty=self.late) for u in self.players for _ in range(4)]
+        )
+        balances.rebuild(self.team)
+
+        self.client.force_login(self.cashier)
+        url = reverse("penalties_mark_all_paid", kwargs={"slug": self.team.slug})
+        self.client.post(url, {"user_id": self.players[0].pk})
+        self.assertEqual(self.balance(self.players[0]).paid_amount, Decimal("10.00"))
+        self.assertEqual(self.balance(self.players[1]).paid_amount, Decimal("0.00"))
+        stranger = CustomUser.objects.create_user(username="fremd")
+        self.assertEqual(self.client.post(url, {"user_id": "abc"}).status_code, 400)
+        self.assertEqual(self.client.post(url, {"user_id": stranger.pk}).status_code, 404)
+
+        # savepoint, lock, aggregate, update, insert balances, one update per remaining member, release
+        with self.assertNumQueries(8):
+            self.assertEqual(balances.mark_paid(AssignedPenalty.objects.filter(team=self.team)), 8)
+        self.assertFalse(MemberBalance.objects.exclude(open_count=0).exists())
+
+        self.late.amount = Decimal("3.00")
+        self.late.save()
+        self.assertEqual(self.balance(self.players[2]).paid_amount, Decimal("12.00"))
+
+        AssignedPenalty.objects.filter(user=self.players[2]).first().delete()
+        self.assertEqual(self.balance(self.players[2]).paid_count, 3)
+        self.assert_matches_rebuild()
+
+    def test_deleting_member_or_team_with_penalties(self):
+        AssignedPenalty.objects.bulk_create(
+            [AssignedPenalty(team=self.team, user=u, penalty=p) for u in self.players for p in (self.late, self.shirt)]
+        )
+        AssignedPenalty.objects.filter(user=self.players[0], penalty=self.late).update(paid=True)
+        balances.rebuild(self.team)
+
+        self.players[0].delete()
+        connection.check_constraints()
+        self.assertFalse(MemberBalance.objects.filter(user_id=self.players[0].pk).exists())
+        self.assertEqual(self.balance(self.players[1]).open_amount, Decimal("12.50"))
+        self.assert_matches_rebuild()
+
+        self.team.delete()
+        connection.check_constraints()
+        self.assertFalse(MemberBalance.objects.exists())
+
+class PenaltyExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.team = Team.objects.create(
+            name="Herren 3",
+            club=Club.objects.create(name="TV Export", slug="tv-export"),
+            slug="herren-3",
+            sport=Sport.objects.create(name="Handball"),
+            age_group=AgeGroup.objects.create(name="Senioren"),
+        )
+        user = CustomUser.objects.create_user(username="@evil", first_name="=cmd|' /C calc'!A0")
+        penalty = Penalty.objects.create(team=cls.team, title="+Zu spät", amount="2.50")
+        AssignedPenalty.objects.create(team=cls.team, user=user, penalty=penalty, note='=HYPERLINK("http://x","klick")')
+
+    def test_user_text_never_becomes_a_formula(self):
+        line = list(exports.csv_lines(AssignedPenalty.objects.all()))[1]
+        self.assertIn(";'=cmd", line)
+        self.assertIn(";'@evil;'+Zu spät;", line)
+        self.assertIn('\'=HYPERLINK(""http://x""', line)
+
+        import openpyxl
+
+        with tempfile.TemporaryFile() as fileobj:
+            exports.write_xlsx(AssignedPenalty.objects.all(), fileobj)
+            fileobj.seek(0)
+            row = next(openpyxl.load_workbook(fileobj).active.iter_rows(min_row=2))
+        self.assertEqual(row[7].value, '=HYPERLINK("http://x","klick")')
+        self.assertEqual({row[i].data_type for i in (2, 3, 4, 7)}, {"s"})
+
+
+class RosterEligibilityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.club = Club.objects.create(name="TV Pass", slug="tv-pass")
+        cls.sport = Sport.objects.create(name="Handball")
+        cls.age_group = AgeGroup.objects.create(name="Jugend")
+        today = timezone.localdate()
+        cls.valid = CustomUser.objects.create(username="valid", short_id="valid")
+        cls.unlimited = CustomUser.objects.create(username="unlimited", short_id="unlimited")
+        cls.expired = CustomUser.objects.create(username="expired", short_id="expired")
+        cls.no_pass = CustomUser.objects.create(username="nopass", short_id="nopass")
+        cls.coach = CustomUser.objects.create(username="coach", short_id="coach", role="coach")
+        PlayerProfile.objects.bulk_create([
+            PlayerProfile(user=cls.valid, pass_number="P1", expires_at=today + timedelta(days=30)),
+            PlayerProfile(user=cls.unlimited, pass_number="P2"),
+            PlayerProfile(user=cls.expired, pass_number="P3", expires_at=today - timedelta(days=1)),
+        ])
+
+    def test_whole_roster_in_one_query(self):
+        roster = CustomUser.objects.all()
+        with self.assertNumQueries(1):
+            ineligible = ineligible_players(roster)
+        self.assertEqual([pk for pk, _ in ineligible], [self.coach.pk, self.expired.pk, self.no_pass.pk])
+
+    def test_team_form_reports_every_ineligible_player_before_saving(self):
+        data = {
+            "name": "A-Jugend",
+            "club": self.club.pk,
+            "age_group": self.age_group.pk,
+            "sport": self.sport.pk,
+            "players": [u.pk for u in (self.valid, self.unlimited, self.expired, self.no_pass, self.coach)],
+        }
+        form = TeamForm(data)
+        self.assertFalse(form.is_valid())
+        self.assertEqual(len(form.errors["players"]), 3)
+        self.assertFalse(Team.objects.filter(name="A-Jugend").exists())
+
+        data["players"] = [self.valid.pk, self.unlimited.pk]
+        form = TeamForm(data)
+        self.assertTrue(form.is_valid(), form.errors)
+
+
+@override_settings(PUSH_TRANSPORT="accounts.push.RecordingTransport")
+class RSVPReminderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.team = Team.objects.create(
+            name="Damen 1",
+            club=Club.objects.create(name="TV Push", slug="tv-push"),
+            slug="damen-1",
+            sport=Sport.objects.create(name="Handball"),
+            age_group=AgeGroup.objects.create(name="Senioren"),
+        )
+        cls.players = CustomUser.objects.bulk_create(
+            [CustomUser(username=f"s{i}", short_id=f"s{i}") for i in range(30)]
+        )
+        cls.team.players.add(*cls.players)
+        PushSubscription.objects.bulk_create(
+            [PushSubscription(user=u, endpoint=f"https://push.example/{u.username}", p256dh="k", auth="a") for u in cls.players]
+        )
+        now = timezone.now()
+        cls.soon = TrainingEvent.objects.create(team=cls.team, start=now + timedelta(hours=3))
+        cls.tomorrow = TrainingEvent.objects.create(team=cls.team, start=now + timedelta(hours=20))
+        TrainingEvent.objects.create(team=cls.team, start=now + timedelta(days=3))
+        # s0 has answered the first training
+        TrainingRSVP.objects.create(training=cls.soon, user=cls.players[0], status="yes")
+
+    def setUp(self):
+        RecordingTransport.reset()
+
+    def test_reminds_missing_rsvps_once_with_retries_and_pruning(self):
+        RecordingTransport.gone = {"https://push.example/s1"}
+        RecordingTransport.flaky = {"https://push.example/s2": 1}
+        # events, lock, anti-join, reminder insert (+ savepoint/release), pruning
+        # - whatever the number of players
+        with self.assertNumQueries(7):
+            totals = reminders.send_reminders(retry_delay=0)
+
+        self.assertEqual(totals["events"], 2)
+        self.assertEqual(totals["reminded"], 59)
+        self.assertEqual(totals["sent"], 57)
+        self.assertEqual(totals["pruned"], 1)
+        self.assertFalse(PushSubscription.objects.filter(user=self.players[1]).exists())
+        endpoints = [endpoint for endpoint, _ in RecordingTransport.sent]
+        self.assertEqual(endpoints.count("https://push.example/s0"), 1)
+        self.assertEqual(endpoints.count("https://push.example/s2"), 2)
+        payload = next(p for e, p in RecordingTransport.sent if p["tag"] == f"rsvp-{self.soon.pk}")
+        self.assertEqual(payload["url"], reverse("team_detail_members", kwargs={"slug": self.team.slug}))
+        self.assertEqual(TrainingReminder.objects.count(), 59)
+
+        RecordingTransport.reset()
+        totals = reminders.send_reminders(retry_delay=0)
+        self.assertEqual((totals["reminded"], RecordingTransport.sent), (0, []))
+
+    def test_events_locked_by_another_run_are_skipped(self):
+        # a concurrent run holds the batch's rows (skip_locked then returns none of them)
+        with mock.patch.object(reminders.TrainingEvent.objects, "select_for_update") as locked:
+            locked.return_value.filter.return_value.values_list.return_value = []
+            totals = reminders.send_reminders(retry_delay=0)
+        self.assertEqual((totals["events"], totals["reminded"], RecordingTransport.sent), (2, 0, []))
+        self.assertFalse(TrainingReminder.objects.exists())
+
+
+@override_settings(CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}})
+class TeamChatConsumerTests(TransactionTestCase):
+    def setUp(self):
+        club = Club.objects.create(name="TV Chat", slug="tv-chat")
+        self.team = Team.objects.create(
+            name="Damen 1",
+            club=club,
+            slug="damen-1",
+            sport=Sport.objects.create(name="Volleyball"),
+            age_group=AgeGroup.objects.create(name="Damen"),
+        )
+        self.player = CustomUser.objects.create_user(username="chatter", password="pw")
+        self.outsider = CustomUser.objects.create_user(username="outsider", password="pw")
+        self.team.players.add(self.player)
+
+    def communicator(self, user):
+        from sportmaster.asgi import application
+
+        self.client.force_login(user)
+        cookie = f"{settings.SESSION_COOKIE_NAME}={self.client.cookies[settings.SESSION_COOKIE_NAME].value}"
+        return WebsocketCommunicator(
+            application,
+            f"/ws/team/{self.team.slug}/chat/",
+            headers=[(b"cookie", cookie.encode()), (b"origin", b"http://localhost"), (b"host", b"localhost")],
+        )
+
+    async def test_message_is_fanned_out_to_team_group(self):
+        first = await sync_to_async(self.communicator)(self.player)
+        second = await sync_to_async(self.communicator)(self.player)
+        self.assertTrue((await first.connect())[0])
+        self.assertTrue((await second.connect())[0])
+
+        # malformed payloads are ignored without closing the connection
+        for junk in (["Hallo"], "Hallo", {"text": 42}):
+            await first.send_json_to(junk)
+        await first.send_json_to({"text": "Hallo Team"})
+        for ws in (first, second):
+            self.assertEqual((await ws.receive_json_from())["text"], "Hallo Team")
+        self.assertEqual(await Message.objects.filter(team=self.team).acount(), 1)
+
+        await first.disconnect()
+        await second.disconnect()
+
+    async def test_non_members_are_rejected(self):
+        ws = await sync_to_async(self.communicator)(self.outsider)
+        connected, _ = await ws.connect()
+        self.assertFalse(connected)
@@ -4,6 +4,8 @@ from . import views
 urlpatterns = [
     path("", views.team_list, name="team_list"),
     path("create/", views.team_create, name="team_create"),
+    path("calendar/<str:token>.ics", views.calendar_feed, name="calendar_feed"),
+    path("<slug:slug>/calendar/revoke/", views.calendar_revoke, name="calendar_revoke"),
     path("<slug:slug>/", views.team_detail, name="team_detail"),
     path("<slug:slug>/public/", views.public_team_view, name="team_public"),
     path("<slug:slug>/members/", views.member_team_view, name="team_detail_members"),
@@ -17,9 +19,11 @@ urlpatterns = [
 
     # chat
     path("<slug:slug>/chat/post/", views.chat_post, name="chat_post"),
+    path("<slug:slug>/chat/since/<str:cursor>/", views.chat_since, name="chat_since"),
 
     # training
     path("<slug:slug>/training/series/create/", views.training_series_create, name="training_series_create"),
+    path("<slug:slug>/training/series/<int:pk>/edit/", views.training_series_edit, name="training_series_edit"),
     path("<slug:slug>/training/create/", views.training_event_create, name="training_event_create"),
     path("<slug:slug>/training/<int:pk>/delete/", views.training_event_delete, name="training_event_delete"),
     path("<slug:slug>/training/<int:pk>/rsvp/", views.training_rsvp, name="training_rsvp"),
@@ -30,5 +34,7 @@ urlpatterns = [
     path("<slug:slug>/penalties/assign/", views.penalty_assign, name="penalty_assign"),
     path("<slug:slug>/penalties/assign/<int:penalty_id>/<int:user_id>/", views.penalty_assign, name="penalty_assign_quick"),
     path("<slug:slug>/penalties/mark_paid/<int:assigned_id>/", views.penalty_mark_paid, name="penalty_mark_paid"),
+    path("<slug:slug>/penalties/mark_all_paid/", views.penalties_mark_all_paid, name="penalties_mark_all_paid"),
+    path("<slug:slug>/penalties/export.<str:fmt>", views.penalties_export, name="penalties_export"),
     
 ]
@@ -4,34 +4,31 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils.text import slugify
 from django.urls import reverse
-from django.http import JsonResponse, HttpResponseForbidden, HttpResponseRedirect
+from django.http import JsonResponse, HttpResponseForbidden, HttpResponseRedirect, HttpResponseBadRequest, StreamingHttpResponse, Http404
+from django.core import signing
+from django.views.decorators.http import condition, require_GET, require_POST
 from django.utils import timezone
-from django.core.paginator import Paginator
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch, Q
 from accounts.models import Sport, CustomUser
-from .models import Team, Lineup, TrainingSeries, TrainingEvent, TrainingRSVP, Message, AgeGroup, Penalty, AssignedPenalty, Team_Game_Plan_H4A, Team_Tabel_H4A
+from .models import Team, Lineup, TrainingSeries, TrainingEvent, TrainingRSVP, AgeGroup, Penalty, AssignedPenalty, Team_Game_Plan_H4A, Team_Tabel_H4A
 from .forms import TeamForm, LineupForm, TrainingSeriesForm, TrainingEventForm, MessageForm, PenaltyForm
-
-
-# ------------------------------------------------------------------
-# Helper permission checks
-# ------------------------------------------------------------------
-def is_trainer(user, team):
-    if not user.is_authenticated:
-        return False
-    return team.trainers.filter(pk=user.pk).exists() or user.role in ("club_admin", "global_admin", "federation_admin")
-
-def is_player(user, team):
-    if not user.is_authenticated:
-        return False
-    return team.players.filter(pk=user.pk).exists()
-
-def is_cashier(user, team):
-    """Kassenwart (cashier) kann Strafen erstellen/zuweisen/bezahlen."""
-    if not user.is_authenticated:
-        return False
-    # team.cashier should be a FK to user on Team model
-    return getattr(team, "cashier", None) and team.cashier_id == user.id
+from .roles import team_roles
+from match.standings import current_competition, table as standings_table
+from .calendar import CalendarFeed, feed_token, revoke_tokens
+from .balances import TeamSummary, mark_paid
+from .exports import FORMATS as EXPORT_FORMATS, export_response, penalties_for
+from .jobs import export_penalties, generate_series_events, sync_series_events
+from jobs.views import redirect_to_job
+from .chat import messages_before, messages_since, message_as_dict, encode_cursor, InvalidCursor
+
+
+# number of upcoming trainings shown on the member dashboard
+MEMBER_VIEW_TRAININGS = 6
+# upcoming trainings listed on the trainer overview
+TRAINER_VIEW_TRAININGS = 50
+# latest assigned penalties listed on penalties_list (full history: export)
+PENALTY_HISTORY = 50
 
 # ------------------------------------------------------------------
 # Team list / detail / create / edit (unchanged except contexts)
@@ -97,9 +94,13 @@ def public_team_view(request, slug):
     gameplan_obj = Team_Game_Plan_H4A.objects.filter(team=team).first()
     gameplan_html = gameplan_obj.eingebetteter_code if gameplan_obj else ""
 
-    # Table embed (H4A Tabelle)
-    table_obj = Team_Tabel_H4A.objects.filter(team=team).first()
-    table_html = table_obj.eingebetteter_code if table_obj else ""
+    # Tabelle aus match.Standing; H4A-Einbettung nur, wenn es (noch) keine eigene gibt
+    competition = current_competition(team)
+    standings = list(standings_table(competition)) if competition else []
+    table_html = ""
+    if not standings:
+        table_obj = Team_Tabel_H4A.objects.filter(team=team).first()
+        table_html = table_obj.eingebetteter_code if table_obj else ""
 
     penalties = Penalty.objects.filter(team=team) if hasattr(Penalty, "__name__") else []
 
@@ -109,6 +110,8 @@ def public_team_view(request, slug):
         "public_lineups": public_lineups,
         "gameplan_html": gameplan_html,
         "table_html": table_html,
+        "competition": competition,
+        "standings": standings,
         "penalties": penalties,
         "now": now,
     }
@@ -120,66 +123,118 @@ def public_team_view(request, slug):
 # ------------------------------------------------------------------
 @login_required
 def member_team_view(request, slug):
-    team = get_object_or_404(Team, slug=slug)
-    if not (is_player(request.user, team) or is_trainer(request.user, team)):
+    # trainers are read several times by the template (sidebar + edit links)
+    team = get_object_or_404(
+        Team.objects.select_related("club").prefetch_related("trainers"), slug=slug
+    )
+    roles = team_roles(request, team)
+    if not roles.is_member:
         return HttpResponseForbidden("Du bist kein Mitglied dieses Teams.")
 
     now = timezone.now()
-    # only upcoming lineups (for upcoming games)
-    lineups = Lineup.objects.filter(team=team, date__gte=now).order_by("date")
-
-    # trainings: next events only (we will slice to 6 in template, but fetch ordered)
-    trainings = TrainingEvent.objects.filter(team=team, start__gte=now).order_by("start")
-
-    # Chat messages (latest first) - paginate
-    messages_qs = Message.objects.filter(team=team).order_by("-created_at")
-    paginator = Paginator(messages_qs, 30)
-    page = request.GET.get("page", 1)
-    messages_page = paginator.get_page(page)
-
-    # RSVP mapping for quick access: training.id -> RSVP instance
-    rsvps = {}
-    # prefetch rsvps for the user in one go
-    user_rsvps = TrainingRSVP.objects.filter(training__in=trainings, user=request.user)
-    for r in user_rsvps:
-        rsvps[r.training_id] = r
-
-    # penalties and assigned penalties for members view (show who owes/paid)
-    penalties = Penalty.objects.filter(team=team).order_by("title") if hasattr(Penalty, '__name__') else []
-    assigned_penalties = AssignedPenalty.objects.filter(team=team).select_related("user", "penalty").order_by("-assigned_at") if hasattr(AssignedPenalty, '__name__') else []
+    # only upcoming lineups (for upcoming games), players in one prefetch query
+    lineups = (
+        Lineup.objects.filter(team=team, date__gte=now)
+        .order_by("date")
+        .prefetch_related(Prefetch("players", queryset=CustomUser.objects.only("id", "username", "first_name", "last_name")))
+    )
+
+    # trainings: next events only, with their yes/no/maybe counters
+    trainings = list(TrainingEvent.objects.filter(team=team, start__gte=now).order_by("start")[:MEMBER_VIEW_TRAININGS])
+
+    # Chat messages (latest first) - keyset pagination via ?before=<cursor>
+    try:
+        chat_messages, chat_older_cursor = messages_before(team, request.GET.get("before"))
+    except InvalidCursor:
+        return HttpResponseBadRequest("Ungültiger Cursor.")
+    # newest message on the first page is the starting point for polling
+    chat_poll_cursor = None
+    if not request.GET.get("before"):
+        chat_poll_cursor = encode_cursor(chat_messages[0]) if chat_messages else "0_0"
+
+    # own RSVPs for the listed trainings: training.id -> RSVP instance
+    rsvps = {
+        r.training_id: r
+        for r in TrainingRSVP.objects.filter(user=request.user, training__in=[t.pk for t in trainings])
+    }
+    for t in trainings:
+        t.my_rsvp = rsvps.get(t.pk)
+
+    # who owes/paid: one MemberBalance row per member instead of the penalty history
+    balances = TeamSummary(team)
 
     context = {
         "team": team,
+        "roles": roles,
         "lineups": lineups,
         "trainings": trainings,
-        "messages": messages_page,
+        "messages": chat_messages,
+        "chat_older_cursor": chat_older_cursor,
+        "chat_poll_cursor": chat_poll_cursor,
         "rsvps": rsvps,
-        "penalties": penalties,
-        "assigned_penalties": assigned_penalties,
+        "balances": balances,
+        "my_balance": balances.for_user(request.user),
+        "team_calendar_token": feed_token("team", team.pk, request.user),
+        "my_calendar_token": feed_token("user", request.user.pk, request.user),
         "now": now,
     }
     return render(request, "teams/member_team.html", context)
 
+# ------------------------------------------------------------------
+# Kalender-Feeds (.ics)
+# ------------------------------------------------------------------
+def _calendar_feed(request, token):
+    # shared by the condition() callbacks and the view: versions are aggregated only once
+    if not hasattr(request, "_calendar_feed"):
+        try:
+            request._calendar_feed = CalendarFeed.for_token(token)
+        except signing.BadSignature:
+            request._calendar_feed = None
+    if request._calendar_feed is None:
+        raise Http404("Unbekannter Kalender.")
+    return request._calendar_feed
+
+
+@require_GET
+@condition(
+    etag_func=lambda request, token: _calendar_feed(request, token).version()[1],
+    last_modified_func=lambda request, token: _calendar_feed(request, token).version()[0],
+)
+def calendar_feed(request, token):
+    """iCalendar-Abo für ein Team bzw. alle Teams eines Users (Link mit signiertem Token)."""
+    feed = _calendar_feed(request, token)
+    response = StreamingHttpResponse(feed.lines(), content_type="text/calendar; charset=utf-8")
+    response["Content-Disposition"] = 'inline; filename="sportmaster.ics"'
+    return response
+
+
+@login_required
+@require_POST
+def calendar_revoke(request, slug):
+    """Alle Kalender-Links des Users ungültig machen (z.B. wenn ein Link weitergegeben wurde)."""
+    revoke_tokens(request.user)
+    messages.success(request, "Deine Kalender-Links wurden erneuert - bitte neu abonnieren.")
+    return redirect("team_detail_members", slug=slug)
+
 # ------------------------------------------------------------------
 # Trainer view
 # ------------------------------------------------------------------
 @login_required
 def trainer_team_view(request, slug):
     team = get_object_or_404(Team, slug=slug)
-    if not is_trainer(request.user, team):
+    if not team_roles(request, team).is_trainer:
         return HttpResponseForbidden("Nur Trainer dürfen hierhin.")
 
     now = timezone.now()
     # lineups (upcoming + recent)
     lineups = Lineup.objects.filter(team=team).order_by("-date")
 
-    # trainings (show all future trainings - template may slice)
-    trainings = TrainingEvent.objects.filter(team=team).order_by("start")
+    # upcoming trainings with their yes/no/maybe counters - one query
+    trainings = TrainingEvent.objects.filter(team=team, start__gte=now).order_by("start")[:TRAINER_VIEW_TRAININGS]
 
     series = TrainingSeries.objects.filter(team=team).order_by("-created_at")
 
     penalties = Penalty.objects.filter(team=team).order_by("title") if hasattr(Penalty, '__name__') else []
-    assigned_penalties = AssignedPenalty.objects.filter(team=team).select_related("user", "penalty").order_by("-assigned_at") if hasattr(AssignedPenalty, '__name__') else []
 
     context = {
         "team": team,
@@ -187,7 +242,8 @@ def trainer_team_view(request, slug):
         "trainings": trainings,
         "series": series,
         "penalties": penalties,
-        "assigned_penalties": assigned_penalties,
+        "balances": TeamSummary(team),
+        "roles": team_roles(request, team),
         "now": now,
     }
     return render(request, "teams/trainer_team.html", context)
@@ -198,7 +254,7 @@ def trainer_team_view(request, slug):
 @login_required
 def lineup_create(request, slug):
     team = get_object_or_404(Team, slug=slug)
-    if not is_trainer(request.user, team):
+    if not team_roles(request, team).is_trainer:
         return HttpResponseForbidden("Nur Trainer können Aufstellungen erstellen.")
 
     if request.method == "POST":
@@ -221,7 +277,7 @@ def lineup_create(request, slug):
 def lineup_edit(request, slug, pk):
     team = get_object_or_404(Team, slug=slug)
     lineup = get_object_or_404(Lineup, pk=pk, team=team)
-    if not is_trainer(request.user, team):
+    if not team_roles(request, team).is_trainer:
         return HttpResponseForbidden("Nur Trainer können Aufstellungen bearbeiten.")
 
     if request.method == "POST":
@@ -240,7 +296,7 @@ def lineup_edit(request, slug, pk):
 def lineup_delete(request, slug, pk):
     team = get_object_or_404(Team, slug=slug)
     lineup = get_object_or_404(Lineup, pk=pk, team=team)
-    if not is_trainer(request.user, team):
+    if not team_roles(request, team).is_trainer:
         return HttpResponseForbidden("Nur Trainer können Aufstellungen löschen.")
 
     if request.method == "POST":
@@ -256,7 +312,8 @@ def lineup_delete(request, slug, pk):
 @login_required
 def chat_post(request, slug):
     team = get_object_or_404(Team, slug=slug)
-    if not (is_player(request.user, team) or is_trainer(request.user, team)):
+    roles = team_roles(request, team)
+    if not roles.is_member:
         return HttpResponseForbidden("Nur Teammitglieder dürfen chatten.")
 
     if request.method == "POST":
@@ -270,13 +327,28 @@ def chat_post(request, slug):
             return redirect(request.META.get("HTTP_REFERER", reverse("team_detail_members", kwargs={"slug": slug})))
     return redirect("team_detail_members", slug=slug)
 
+@login_required
+def chat_since(request, slug, cursor):
+    """JSON: nur Nachrichten, die neuer als der Cursor sind (für Polling)."""
+    team = get_object_or_404(Team, slug=slug)
+    if not team_roles(request, team).is_member:
+        return HttpResponseForbidden("Nur Teammitglieder dürfen chatten.")
+    try:
+        new_messages = messages_since(team, cursor)
+    except InvalidCursor:
+        return JsonResponse({"error": "invalid cursor"}, status=400)
+    return JsonResponse({
+        "messages": [message_as_dict(m) for m in new_messages],
+        "cursor": encode_cursor(new_messages[-1]) if new_messages else cursor,
+    })
+
 # ------------------------------------------------------------------
 # Trainings: series + events
 # ------------------------------------------------------------------
 @login_required
 def training_series_create(request, slug):
     team = get_object_or_404(Team, slug=slug)
-    if not is_trainer(request.user, team):
+    if not team_roles(request, team).is_trainer:
         return HttpResponseForbidden("Nur Trainer können Trainingsserien erstellen.")
 
     if request.method == "POST":
@@ -286,17 +358,39 @@ def training_series_create(request, slug):
             series.team = team
             series.created_by = request.user
             series.save()
-            created_count = series.generate_events()
-            messages.success(request, f"Trainingsserie erstellt ({created_count} Termine angelegt).")
-            return redirect("team_detail_trainer", slug=team.slug)
+            entry = generate_series_events.enqueue(
+                user=request.user, label=f"Termine für {series} anlegen", series_id=series.pk
+            )
+            messages.success(request, "Trainingsserie erstellt - die Termine werden im Hintergrund angelegt.")
+            return redirect_to_job(entry, reverse("team_detail_trainer", args=[team.slug]))
     else:
         form = TrainingSeriesForm()
     return render(request, "teams/training_series_form.html", {"form": form, "team": team, "title": "Trainingsserie erstellen"})
 
+@login_required
+def training_series_edit(request, slug, pk):
+    team = get_object_or_404(Team, slug=slug)
+    series = get_object_or_404(TrainingSeries, pk=pk, team=team)
+    if not team_roles(request, team).is_trainer:
+        return HttpResponseForbidden("Nur Trainer können Trainingsserien bearbeiten.")
+
+    if request.method == "POST":
+        form = TrainingSeriesForm(request.POST, instance=series)
+        if form.is_valid():
+            series = form.save()
+            entry = sync_series_events.enqueue(
+                user=request.user, label=f"Termine für {series} abgleichen", series_id=series.pk
+            )
+            messages.success(request, "Trainingsserie aktualisiert - die Termine werden im Hintergrund abgeglichen.")
+            return redirect_to_job(entry, reverse("team_detail_trainer", args=[team.slug]))
+    else:
+        form = TrainingSeriesForm(instance=series)
+    return render(request, "teams/training_series_form.html", {"form": form, "team": team, "title": "Trainingsserie bearbeiten"})
+
 @login_required
 def training_event_create(request, slug):
     team = get_object_or_404(Team, slug=slug)
-    if not is_trainer(request.user, team):
+    if not team_roles(request, team).is_trainer:
         return HttpResponseForbidden("Nur Trainer können Trainings erstellen.")
 
     if request.method == "POST":
@@ -305,9 +399,15 @@ def training_event_create(request, slug):
             ev = form.save(commit=False)
             ev.team = team
             ev.created_by = request.user
-            ev.save()
-            messages.success(request, "Training erstellt.")
-            return redirect("team_detail_trainer", slug=team.slug)
+            try:
+                # unique (team, start); the savepoint keeps a request transaction usable
+                with transaction.atomic():
+                    ev.save()
+            except IntegrityError:
+                form.add_error("start", "Zu diesem Zeitpunkt gibt es bereits ein Training.")
+            else:
+                messages.success(request, "Training erstellt.")
+                return redirect("team_detail_trainer", slug=team.slug)
     else:
         form = TrainingEventForm()
     return render(request, "teams/training_event_form.html", {"form": form, "team": team, "title": "Training erstellen"})
@@ -316,7 +416,7 @@ def training_event_create(request, slug):
 def training_event_delete(request, slug, pk):
     team = get_object_or_404(Team, slug=slug)
     ev = get_object_or_404(TrainingEvent, pk=pk, team=team)
-    if not is_trainer(request.user, team):
+    if not team_roles(request, team).is_trainer:
         return HttpResponseForbidden("Nur Trainer können Trainings löschen.")
 
     if request.method == "POST":
@@ -333,7 +433,8 @@ def training_rsvp(request, slug, pk):
     team = get_object_or_404(Team, slug=slug)
     ev = get_object_or_404(TrainingEvent, pk=pk, team=team)
 
-    if not (is_player(request.user, team) or is_trainer(request.user, team)):
+    roles = team_roles(request, team)
+    if not roles.is_member:
         return HttpResponseForbidden("Nur Teammitglieder können zusagen/absagen.")
 
     if request.method == "POST":
@@ -343,13 +444,13 @@ def training_rsvp(request, slug, pk):
             return redirect(request.META.get("HTTP_REFERER", reverse("team_detail_members", kwargs={"slug": slug})))
 
         comment = request.POST.get("comment", "").strip() or None
-        rsvp, created = TrainingRSVP.objects.get_or_create(training=ev, user=request.user)
-        rsvp.status = status
-        if status == "no" and comment:
-            rsvp.comment = comment
-        elif status != "no":
-            rsvp.comment = None  # clear previous comment if changed
-        rsvp.save()
+        defaults = {"status": status}
+        if status != "no":
+            defaults["comment"] = None  # clear previous comment if changed
+        elif comment:
+            defaults["comment"] = comment
+        # one row lock + one save; the yes/no/maybe counters follow via signals (rsvp_counts.py)
+        TrainingRSVP.objects.update_or_create(training=ev, user=request.user, defaults=defaults)
         messages.success(request, "Dein Status wurde gespeichert.")
         return redirect(request.META.get("HTTP_REFERER", reverse("team_detail_members", kwargs={"slug": slug})))
 
@@ -361,21 +462,27 @@ def training_rsvp(request, slug, pk):
 @login_required
 def penalties_list(request, slug):
     team = get_object_or_404(Team, slug=slug)
-    if not (is_player(request.user, team) or is_trainer(request.user, team) or is_cashier(request.user, team)):
+    roles = team_roles(request, team)
+    if not (roles.is_member or roles.is_cashier):
         return HttpResponseForbidden("Keine Rechte für diese Ansicht.")
 
     penalties = Penalty.objects.filter(team=team).order_by("title")
-    assigned_penalties = AssignedPenalty.objects.filter(team=team).select_related("user", "penalty").order_by("-assigned_at")
+    assigned_penalties = (
+        AssignedPenalty.objects.filter(team=team).select_related("user", "penalty").order_by("-assigned_at")[:PENALTY_HISTORY]
+    )
     return render(request, "teams/penalties_list.html", {
         "team": team,
+        "roles": roles,
         "penalties": penalties,
         "assigned_penalties": assigned_penalties,
+        "balances": TeamSummary(team),
+        "history_limit": PENALTY_HISTORY,
     })
 
 @login_required
 def penalty_create(request, slug):
     team = get_object_or_404(Team, slug=slug)
-    if not is_cashier(request.user, team):
+    if not team_roles(request, team).is_cashier:
         return HttpResponseForbidden("Nur Kassenwart kann Strafen-Katalog bearbeiten.")
 
     if request.method == "POST":
@@ -398,7 +505,7 @@ def penalty_assign(request, slug, penalty_id=None, user_id=None):
     - Wenn POST mit user_id & penalty_id: erstelle AssignedPenalty
     """
     team = get_object_or_404(Team, slug=slug)
-    if not is_cashier(request.user, team):
+    if not team_roles(request, team).is_cashier:
         return HttpResponseForbidden("Nur Kassenwart kann Strafen zuweisen.")
 
     if request.method == "POST":
@@ -406,13 +513,15 @@ def penalty_assign(request, slug, penalty_id=None, user_id=None):
         u_id = request.POST.get("user_id")
         note = request.POST.get("note", "")
         penalty = get_object_or_404(Penalty, pk=p_id, team=team)
-        assigned = AssignedPenalty.objects.create(
-            team=team,
-            user_id=u_id,
-            penalty=penalty,
-            note=note,
-            assigned_by=request.user
-        )
+        # the post_save signal books the amount on the member's balance
+        with transaction.atomic():
+            AssignedPenalty.objects.create(
+                team=team,
+                user_id=u_id,
+                penalty=penalty,
+                note=note,
+                assigned_by=request.user
+            )
         messages.success(request, f"Strafe '{penalty.title}' zugewiesen.")
         return redirect("penalties_list", slug=team.slug)
 
@@ -428,17 +537,68 @@ def penalty_assign(request, slug, penalty_id=None, user_id=None):
 @login_required
 def penalty_mark_paid(request, slug, assigned_id):
     team = get_object_or_404(Team, slug=slug)
-    if not is_cashier(request.user, team):
+    if not team_roles(request, team).is_cashier:
         return HttpResponseForbidden("Nur Kassenwart kann Zahlungen bestätigen.")
 
     assigned = get_object_or_404(AssignedPenalty, pk=assigned_id, team=team)
     if request.method == "POST":
-        assigned.paid = True
-        assigned.save()
+        mark_paid(AssignedPenalty.objects.filter(pk=assigned.pk))
         messages.success(request, "Als bezahlt markiert.")
         return redirect("penalties_list", slug=team.slug)
     return render(request, "teams/confirm_delete.html", {"object": assigned, "team": team, "title": "Als bezahlt markieren?"})
 
+@login_required
+def penalties_mark_all_paid(request, slug):
+    """Alle offenen Strafen des Teams (oder eines Mitglieds: user_id) als bezahlt markieren."""
+    team = get_object_or_404(Team, slug=slug)
+    if not team_roles(request, team).is_cashier:
+        return HttpResponseForbidden("Nur Kassenwart kann Zahlungen bestätigen.")
+
+    user_id = request.POST.get("user_id") or request.GET.get("user_id")
+    assigned = AssignedPenalty.objects.filter(team=team)
+    member = None
+    if user_id:
+        if not str(user_id).isdigit():
+            return HttpResponseBadRequest("Ungültiges Mitglied.")
+        # members of the team, plus former members who still have penalties here
+        members = CustomUser.objects.filter(
+            Q(teams=team) | Q(coached_teams=team) | Q(assignedpenalty__team=team)
+        ).distinct()
+        member = get_object_or_404(members, pk=user_id)
+        assigned = assigned.filter(user=member)
+
+    if request.method == "POST":
+        count = mark_paid(assigned)
+        messages.success(request, f"{count} Strafen als bezahlt markiert.")
+        return redirect("penalties_list", slug=team.slug)
+    title = f"Alle offenen Strafen von {member.get_full_name() or member.username} als bezahlt markieren?" if member \
+        else "Alle offenen Strafen des Teams als bezahlt markieren?"
+    return render(request, "teams/confirm_delete.html", {"object": member or team, "team": team, "title": title})
+
+@login_required
+@require_GET
+def penalties_export(request, slug, fmt):
+    """Vergebene Strafen als CSV/XLSX (?season=2024 für 01.07.2024-30.06.2025)."""
+    team = get_object_or_404(Team, slug=slug)
+    roles = team_roles(request, team)
+    if not (roles.is_cashier or roles.is_trainer):
+        return HttpResponseForbidden("Nur Kassenwart oder Trainer können Strafen exportieren.")
+    if fmt not in EXPORT_FORMATS:
+        raise Http404
+    try:
+        season = int(request.GET["season"]) if request.GET.get("season") else None
+    except ValueError:
+        return HttpResponseBadRequest("Ungültige Saison.")
+
+    filename = f"strafen-{team.slug}" + (f"-{season}" if season else "")
+    if fmt == "xlsx":
+        # XLSX can't be streamed; build the file in the background
+        entry = export_penalties.enqueue(
+            user=request.user, label=f"Strafen-Export {team.name}", filename=filename, team_id=team.pk, season=season
+        )
+        return redirect_to_job(entry, reverse("penalties_list", args=[team.slug]))
+    return export_response(penalties_for(team=team, season=season), fmt, filename)
+
 def members_list(request, slug):
     team = get_object_or_404(Team, slug=slug)
 
@@ -446,6 +606,7 @@ def members_list(request, slug):
 
     context = {
         "team": team,
+        "roles": team_roles(request, team),
         "members": members,
     }
     return render(request, "teams/members_list.html", context)
\ No newline at end of file
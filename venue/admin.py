@@ -1,3 +1,22 @@
 from django.contrib import admin
+from .models import Venue, VenueSlot, VenueBooking
 
-# Register your models here.
+
+class VenueSlotInline(admin.TabularInline):
+    model = VenueSlot
+    extra = 1
+
+
+@admin.register(Venue)
+class VenueAdmin(admin.ModelAdmin):
+    list_display = ("name", "capacity", "slug")
+    search_fields = ("name", "address", "slug")
+    inlines = [VenueSlotInline]
+
+
+@admin.register(VenueBooking)
+class VenueBookingAdmin(admin.ModelAdmin):
+    list_display = ("venue", "start", "end", "title", "training")
+    list_filter = ("venue",)
+    date_hierarchy = "start"
+    raw_id_fields = ("training",)
@@ -0,0 +1,135 @@
+# venue/availability.py
+"""
+Hallenbelegung als Intervalle.
+
+Eine Halle ist belegt durch VenueBooking (start-end) und durch Spiele (Fixture.venue,
+datetime bis datetime + MATCH_DURATION). Alle Prüfungen sind Bereichsabfragen auf
+den Indizes (venue, start, end) bzw. (venue, datetime); Konflikte für viele Spiele
+oder Buchungen auf einmal werden mit einer einzigen Exists-Abfrage ermittelt.
+"""
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import DateTimeField, Exists, ExpressionWrapper, OuterRef, Value
+from django.utils import timezone
+
+from match.models import Fixture, MATCH_DURATION
+from team.models import TRAINING_DURATION
+from .models import Venue, VenueSlot, VenueBooking
+
+
+class VenueConflict(ValidationError):
+    """Mindestens eine Buchung überschneidet sich mit einer bestehenden Belegung."""
+
+    def __init__(self, bookings):
+        self.bookings = bookings
+        super().__init__([f"Halle belegt: {booking}" for booking in bookings])
+
+
+def _shift(expression, delta):
+    return ExpressionWrapper(expression + Value(delta), output_field=DateTimeField())
+
+
+# ------------------------------------------------------------------
+# single range
+# ------------------------------------------------------------------
+def bookings_between(start, end, venue=None):
+    qs = VenueBooking.objects.filter(start__lt=end, end__gt=start)
+    return qs.filter(venue=venue) if venue is not None else qs
+
+
+def fixtures_between(start, end, venue=None):
+    qs = Fixture.objects.filter(venue__isnull=False, datetime__lt=end, datetime__gt=start - MATCH_DURATION)
+    return qs.filter(venue=venue) if venue is not None else qs
+
+
+def is_free(venue, start, end):
+    return not bookings_between(start, end, venue).exists() and not fixtures_between(start, end, venue).exists()
+
+
+def free_venues(start, end):
+    """
+    Hallen, die im Zeitraum (am selben Tag) eine passende Hallenzeit haben und
+    weder gebucht noch durch ein Spiel belegt sind - eine Abfrage.
+    """
+    start_local, end_local = timezone.localtime(start), timezone.localtime(end)
+    slot = VenueSlot.objects.filter(
+        venue=OuterRef("pk"),
+        weekday=start_local.weekday(),
+        start_time__lte=start_local.time(),
+        end_time__gte=end_local.time(),
+    )
+    booked = bookings_between(start, end).filter(venue=OuterRef("pk"))
+    played = fixtures_between(start, end).filter(venue=OuterRef("pk"))
+    return Venue.objects.filter(Exists(slot)).exclude(Exists(booked)).exclude(Exists(played)).order_by("name")
+
+
+# ------------------------------------------------------------------
+# set-based conflict checks
+# ------------------------------------------------------------------
+def fixture_conflicts(fixtures):
+    """
+    Spiele aus ``fixtures``, deren Halle zur selben Zeit durch ein anderes Spiel oder
+    eine Buchung belegt ist (eine Abfrage, z.B. für eine ganze Saison).
+    """
+    other_fixture = Fixture.objects.filter(
+        venue=OuterRef("venue"),
+        datetime__gt=_shift(OuterRef("datetime"), -MATCH_DURATION),
+        datetime__lt=_shift(OuterRef("datetime"), MATCH_DURATION),
+    ).exclude(pk=OuterRef("pk"))
+    booking = VenueBooking.objects.filter(
+        venue=OuterRef("venue"),
+        start__lt=_shift(OuterRef("datetime"), MATCH_DURATION),
+        end__gt=OuterRef("datetime"),
+    )
+    return fixtures.filter(venue__isnull=False).filter(Exists(other_fixture) | Exists(booking))
+
+
+def booking_conflicts(bookings):
+    """Buchungen aus ``bookings``, die sich mit einer anderen Buchung oder einem Spiel überschneiden."""
+    other_booking = VenueBooking.objects.filter(
+        venue=OuterRef("venue"), start__lt=OuterRef("end"), end__gt=OuterRef("start")
+    ).exclude(pk=OuterRef("pk"))
+    fixture = Fixture.objects.filter(
+        venue=OuterRef("venue"),
+        datetime__lt=OuterRef("end"),
+        datetime__gt=_shift(OuterRef("start"), -MATCH_DURATION),
+    )
+    return bookings.filter(Exists(other_booking) | Exists(fixture))
+
+
+# ------------------------------------------------------------------
+# bulk booking
+# ------------------------------------------------------------------
+def book(bookings):
+    """
+    Legt viele Buchungen auf einmal an (ein INSERT, eine Konfliktabfrage).
+    Überschneidet sich eine davon mit einer Belegung, wird nichts gespeichert.
+    Die betroffenen Hallen sind bis zum Commit gesperrt, damit zwei gleichzeitige
+    Buchungen nicht beide an der (noch nicht sichtbaren) anderen vorbeiprüfen.
+    raises VenueConflict
+    """
+    for booking in bookings:
+        booking.clean()
+    with transaction.atomic():
+        # fixed order, so two requests for overlapping venue sets can't deadlock
+        list(
+            Venue.objects.select_for_update()
+            .filter(pk__in={booking.venue_id for booking in bookings})
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        created = VenueBooking.objects.bulk_create(bookings, batch_size=500)
+        clashes = list(
+            booking_conflicts(VenueBooking.objects.filter(pk__in=[b.pk for b in created])).select_related("venue")
+        )
+        if clashes:
+            raise VenueConflict(clashes)
+    return created
+
+
+def book_trainings(events, venue, duration=TRAINING_DURATION):
+    """Bucht die Halle für Trainingstermine (start bis start + duration)."""
+    return book([
+        VenueBooking(venue=venue, training=event, start=event.start, end=event.start + duration, title=str(event))
+        for event in events
+    ])
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:35
+
+import django.db.models.deletion
+from datetime import time
+
+from django.db import migrations, models
+
+WEEKDAYS = {
+    "mo": 0, "mon": 0, "montag": 0, "monday": 0,
+    "di": 1, "tue": 1, "dienstag": 1, "tuesday": 1,
+    "mi": 2, "wed": 2, "mittwoch": 2, "wednesday": 2,
+    "do": 3, "thu": 3, "donnerstag": 3, "thursday": 3,
+    "fr": 4, "fri": 4, "freitag": 4, "friday": 4,
+    "sa": 5, "sat": 5, "samstag": 5, "saturday": 5,
+    "so": 6, "sun": 6, "sonntag": 6, "sunday": 6,
+}
+
+
+def _weekday(value):
+    if isinstance(value, int) and 0 <= value <= 6:
+        return value
+    return WEEKDAYS.get(str(value).strip().lower())
+
+
+def _time(value):
+    try:
+        return time.fromisoformat(str(value).strip())
+    except ValueError:
+        return None
+
+
+def normalize_available_slots(apps, schema_editor):
+    """available_slots: [{"weekday": 5, "start": "14:00", "end": "18:00"}, ...] -> VenueSlot
+    (auch "day"/"from"/"to" und Wochentagsnamen); unlesbare Einträge bleiben nur im JSON."""
+    Venue = apps.get_model("venue", "Venue")
+    VenueSlot = apps.get_model("venue", "VenueSlot")
+    slots = []
+    for venue_id, raw in Venue.objects.exclude(available_slots=[]).values_list("id", "available_slots"):
+        for entry in raw if isinstance(raw, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            weekday = _weekday(entry.get("weekday", entry.get("day")))
+            start = _time(entry.get("start", entry.get("from")))
+            end = _time(entry.get("end", entry.get("to")))
+            if weekday is not None and start and end and start < end:
+                slots.append(VenueSlot(venue_id=venue_id, weekday=weekday, start_time=start, end_time=end))
+    VenueSlot.objects.bulk_create(slots, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0008_message_team_message_keyset_idx'),
+        ('venue', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueBooking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('training', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='venue_booking', to='team.trainingevent')),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='venue.venue')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['venue', 'start', 'end'], name='venue_booking_range_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='VenueSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Mo'), (1, 'Di'), (2, 'Mi'), (3, 'Do'), (4, 'Fr'), (5, 'Sa'), (6, 'So')])),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slots', to='venue.venue')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['weekday', 'start_time', 'end_time'], name='venue_slot_window_idx')],
+            },
+        ),
+        migrations.RunPython(normalize_available_slots, migrations.RunPython.noop),
+    ]
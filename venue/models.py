@@ -1,3 +1,4 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 
 # Create your models here.
@@ -6,11 +7,55 @@ class Venue(models.Model):
     address = models.TextField(blank=True)
     capacity = models.IntegerField(null=True,blank=True)
     contact = models.CharField(max_length=200, blank=True)
-    available_slots = models.JSONField(default=list, blank=True)  # optionale Struktur
+    # legacy free-form slots; normalized into VenueSlot (see migration 0002)
+    available_slots = models.JSONField(default=list, blank=True)
     slug = models.SlugField(unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     additional_info = models.TextField(null=True, blank=True)
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+
+class VenueSlot(models.Model):
+    """Wöchentlich wiederkehrende Hallenzeit, in der die Halle gebucht werden kann."""
+    venue = models.ForeignKey(Venue, related_name="slots", on_delete=models.CASCADE)
+    # weekday: 0=Mon ... 6=Sun
+    weekday = models.PositiveSmallIntegerField(choices=[(i, d) for i, d in enumerate(['Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So'])])
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["weekday", "start_time", "end_time"], name="venue_slot_window_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.venue.name} {self.get_weekday_display()} {self.start_time}-{self.end_time}"
+
+
+class VenueBooking(models.Model):
+    """
+    Belegung einer Halle von start bis end (Training, Turnier, Sperrzeit ...).
+    Spiele (match.Fixture) belegen ihre Halle direkt über venue/datetime.
+    """
+    venue = models.ForeignKey(Venue, related_name="bookings", on_delete=models.CASCADE)
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    training = models.OneToOneField("team.TrainingEvent", null=True, blank=True, on_delete=models.CASCADE, related_name="venue_booking")
+    title = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # overlap: WHERE venue = ? AND start < ? AND end > ?
+            models.Index(fields=["venue", "start", "end"], name="venue_booking_range_idx"),
+        ]
+
+    def clean(self):
+        if self.start and self.end and self.end <= self.start:
+            raise ValidationError({"end": "Das Ende muss nach dem Beginn liegen."})
+
+    def __str__(self):
+        return f"{self.venue.name} {self.start:%d.%m.%Y %H:%M}-{self.end:%H:%M}"
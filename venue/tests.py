@@ -1,3 +1,103 @@
+from datetime import datetime, time, timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import Sport
+from club.models import Club
+from match.models import Fixture, MATCH_DURATION
+from team.models import AgeGroup, Team, TrainingEvent, TRAINING_DURATION
+from .availability import VenueConflict, book, book_trainings, booking_conflicts, fixture_conflicts, free_venues, is_free
+from .models import Venue, VenueBooking, VenueSlot
+
+
+def at(hour, minute=0):
+    # Monday 2026-09-07
+    return timezone.make_aware(datetime(2026, 9, 7, hour, minute))
+
+
+class AvailabilityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        club = Club.objects.create(name="TV Halle", slug="tv-halle")
+        sport = Sport.objects.create(name="Handball")
+        age_group = AgeGroup.objects.create(name="Senioren")
+        cls.home, cls.away = [
+            Team.objects.create(name=name, club=club, slug=name.lower(), sport=sport, age_group=age_group)
+            for name in ("Heim", "Gast")
+        ]
+        cls.nord, cls.sued = [Venue.objects.create(name=name, slug=name.lower()) for name in ("Nord", "Süd")]
+        for venue in (cls.nord, cls.sued):
+            VenueSlot.objects.create(venue=venue, weekday=0, start_time=time(8), end_time=time(22))
+        # 18:00 - 20:00 in Nord
+        cls.fixture = Fixture.objects.create(home=cls.home, away=cls.away, venue=cls.nord, datetime=at(18), slug="spiel")
+        VenueBooking.objects.create(venue=cls.sued, start=at(10), end=at(12), title="Turnier")
+
+    def booking(self, venue, start, end):
+        return VenueBooking(venue=venue, start=start, end=end)
+
+    def test_touching_intervals_do_not_conflict(self):
+        self.assertEqual(MATCH_DURATION, timedelta(hours=2))
+        touching = [
+            self.booking(self.sued, at(8), at(10)),   # ends when the booking starts
+            self.booking(self.sued, at(12), at(13)),  # starts when the booking ends
+            self.booking(self.nord, at(16), at(18)),  # ends at kick-off
+            self.booking(self.nord, at(20), at(21)),  # starts when the game is over
+        ]
+        created = book(touching)
+        self.assertEqual(len(created), 4)
+        self.assertFalse(booking_conflicts(VenueBooking.objects.all()).exists())
+        self.assertTrue(is_free(self.nord, at(21), at(22)))
+        self.assertFalse(is_free(self.nord, at(19, 59), at(20)))
+
+    def test_overlaps_with_bookings_and_fixtures(self):
+        for venue, start, end in (
+            (self.sued, at(11, 59), at(13)),    # one minute into the booking
+            (self.sued, at(9), at(13)),         # encloses the booking
+            (self.nord, at(17), at(18, 1)),     # one minute into the game
+            (self.nord, at(19, 59), at(21)),    # last minute of the game
+        ):
+            with self.subTest(venue=venue.name, start=start):
+                with self.assertRaises(VenueConflict) as caught:
+                    book([self.booking(venue, start, end)])
+                self.assertEqual(len(caught.exception.bookings), 1)
+        self.assertEqual(VenueBooking.objects.count(), 1)  # nothing was kept
+
+        # one clash rolls back the whole batch
+        with self.assertRaises(VenueConflict):
+            book([self.booking(self.nord, at(8), at(9)), self.booking(self.nord, at(19), at(21))])
+        self.assertEqual(VenueBooking.objects.count(), 1)
+
+    def test_trainings_are_linked_and_conflict_like_bookings(self):
+        first = TrainingEvent.objects.create(team=self.home, start=at(14))
+        second = TrainingEvent.objects.create(team=self.away, start=at(15))
+        (booking,) = book_trainings([first], self.nord)
+        self.assertEqual((booking.training, booking.end), (first, at(14) + TRAINING_DURATION))
+        self.assertEqual(first.venue_booking, booking)
+
+        with self.assertRaises(VenueConflict):
+            book_trainings([second], self.nord)
+        self.assertFalse(VenueBooking.objects.filter(training=second).exists())
+        book_trainings([second], self.sued)
+
+        first.delete()
+        self.assertFalse(VenueBooking.objects.filter(venue=self.nord).exists())
+        book_trainings([TrainingEvent.objects.create(team=self.away, start=at(14, 30))], self.nord)
+
+    def test_free_venues(self):
+        self.assertEqual(list(free_venues(at(14), at(16))), [self.nord, self.sued])
+        self.assertEqual(list(free_venues(at(11), at(12))), [self.nord])        # Süd is booked
+        self.assertEqual(list(free_venues(at(19), at(21))), [self.sued])        # Nord has the game
+        self.assertEqual(list(free_venues(at(20), at(21))), [self.nord, self.sued])
+        self.assertEqual(list(free_venues(at(21), at(23))), [])                 # outside the slots
+        self.assertEqual(list(free_venues(at(14) + timedelta(days=1), at(16) + timedelta(days=1))), [])
 
-# Create your tests here.
+    def test_fixture_conflicts(self):
+        late = Fixture.objects.create(home=self.away, away=self.home, venue=self.nord, datetime=at(19, 30), slug="spaet")
+        other = Fixture.objects.create(home=self.away, away=self.home, venue=self.nord, datetime=at(20), slug="danach")
+        in_sued = Fixture.objects.create(home=self.away, away=self.home, venue=self.sued, datetime=at(11), slug="sued")
+        self.assertEqual(
+            set(fixture_conflicts(Fixture.objects.all())), {self.fixture, late, other, in_sued}
+        )
+        late.delete()
+        self.assertEqual(set(fixture_conflicts(Fixture.objects.all())), {in_sued})